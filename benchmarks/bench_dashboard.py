@@ -0,0 +1,515 @@
+"""
+Benchmark process_data, filter data dan setiap fungsi plot_* di dashboard/plot.py
+pada data sintetis berbentuk PRSA dengan ukuran 1×, 10× dan 100× dataset asli.
+
+Contoh:
+    python benchmarks/bench_dashboard.py --scales 1 10
+    python benchmarks/bench_dashboard.py --compare benchmarks/results/a.json benchmarks/results/b.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+
+# Backend headless: gambar dirender ke buffer tanpa jendela
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'dashboard'))
+# Cache dataset benchmark dipisahkan dari cache dashboard
+os.environ.setdefault('AIR_QUALITY_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'air_quality_bench_cache'))
+
+import plot  # noqa: E402
+from aqi import get_rolling_aqi  # noqa: E402
+from data_loader import clear_dataset_cache  # noqa: E402
+from export import EXPORT_FORMATS, export_to_file  # noqa: E402
+from figure_cache import figure_cache  # noqa: E402
+from figures import FIGURE_BUILDERS  # noqa: E402
+from filter_engine import FilterSelection, get_filter_index  # noqa: E402
+from range_index import get_range_index  # noqa: E402
+from render import RenderPool  # noqa: E402
+from schema import POLLUTANT_COLUMNS, SEASON_BY_MONTH, WIND_DIRECTIONS  # noqa: E402
+from seasonal import run_seasonal_analysis  # noqa: E402
+from timeseries import get_resample_cache  # noqa: E402
+from windrose import get_wind_rose  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Ukuran dataset asli: 2 stasiun × 35.064 jam (2013-03-01 s.d. 2017-02-28)
+BASE_STATIONS = 2
+BASE_START = '2013-03-01'
+BASE_HOURS = 35064
+
+
+class StreamlitStub:
+    """
+    Pengganti modul streamlit agar fungsi di plot.py dapat dijalankan tanpa server.
+
+    Widget mengembalikan nilai default-nya, elemen tampilan tidak melakukan apa pun,
+    dan st.stop() melempar exception seperti aslinya.
+    """
+
+    class StopException(Exception):
+        pass
+
+    def __init__(self):
+        self.calls = {}
+
+    def _record(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def __getattr__(self, name):
+        def noop(*args, **kwargs):
+            self._record(name)
+            return self
+        return noop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def stop(self):
+        raise self.StopException()
+
+    def multiselect(self, label, options, default=None, **kwargs):
+        self._record('multiselect')
+        return list(default if default is not None else [])
+
+    def slider(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        self._record('slider')
+        return value
+
+    def selectbox(self, label, options, index=0, **kwargs):
+        self._record('selectbox')
+        return list(options)[index]
+
+    def number_input(self, label, min_value=None, max_value=None, value=None, **kwargs):
+        self._record('number_input')
+        return value
+
+    def radio(self, label, options, index=0, **kwargs):
+        self._record('radio')
+        return list(options)[index]
+
+    def button(self, label, **kwargs):
+        self._record('button')
+        return False
+
+    def columns(self, spec, **kwargs):
+        self._record('columns')
+        return [self] * (spec if isinstance(spec, int) else len(spec))
+
+
+def make_synthetic(scale, seed=0):
+    """
+    Membuat dataset sintetis berbentuk combined_data.csv.
+
+    Jumlah stasiun dikalikan `scale` pada rentang waktu yang sama, sehingga
+    jumlah baris kira-kira `scale` × 70.128 baris.
+
+    Parameters:
+    - scale (int): Faktor pengali ukuran dataset.
+    - seed (int): Seed generator acak.
+
+    Returns:
+    - pd.DataFrame: Dataset sintetis terurut berdasarkan datetime.
+    """
+    rng = np.random.default_rng(seed)
+    stations = [f'Station{i:03d}' for i in range(BASE_STATIONS * scale)]
+    times = pd.date_range(BASE_START, periods=BASE_HOURS, freq='h')
+    n = len(times) * len(stations)
+
+    datetime = np.tile(times.to_numpy(), len(stations))
+    month = np.tile(times.month.to_numpy(), len(stations))
+    hour = np.tile(times.hour.to_numpy(), len(stations))
+    # Pola musiman dan harian sederhana ditambah noise
+    winter = np.cos((month - 1) / 12 * 2 * np.pi)
+    daily = np.sin(hour / 24 * 2 * np.pi)
+    station_level = np.repeat(rng.uniform(0.7, 1.3, len(stations)), len(times))
+
+    pm25 = np.clip(80 * station_level * (1 + 0.5 * winter) + rng.gamma(2, 20, n), 2, None)
+    df = pd.DataFrame({
+        'datetime': datetime,
+        'year': np.tile(times.year.to_numpy(), len(stations)),
+        'month': month,
+        'day': np.tile(times.day.to_numpy(), len(stations)),
+        'hour': hour,
+        'PM2.5': pm25,
+        'PM10': pm25 * rng.uniform(1.1, 1.6, n),
+        'SO2': np.clip(15 * (1 + winter) + rng.normal(0, 5, n), 1, None),
+        'NO2': np.clip(50 * station_level + rng.normal(0, 15, n), 2, None),
+        'CO': np.clip(1200 * (1 + 0.6 * winter) + rng.normal(0, 300, n), 100, None),
+        'O3': np.clip(60 * (1 - 0.6 * winter) * (1 + 0.5 * daily) + rng.normal(0, 15, n), 1, None),
+        'TEMP': 13 - 15 * winter + 4 * daily + rng.normal(0, 3, n),
+        'PRES': 1012 + 10 * winter + rng.normal(0, 4, n),
+        'DEWP': 2 - 15 * winter + rng.normal(0, 4, n),
+        'RAIN': np.where(rng.random(n) < 0.04, rng.exponential(2, n), 0.0),
+        'wd': rng.choice(WIND_DIRECTIONS, n),
+        'WSPM': rng.gamma(2, 0.9, n),
+        'station': np.repeat(stations, len(times)),
+        'season': pd.Series(month).map(SEASON_BY_MONTH).to_numpy(),
+    })
+    return df.sort_values('datetime', kind='stable').reset_index(drop=True)
+
+
+class Recorder:
+    """
+    Mengumpulkan hasil pengukuran: waktu total, waktu render, dan puncak memori per langkah.
+
+    Waktu diukur tanpa tracemalloc karena tracemalloc memperlambat kode yang banyak
+    melakukan alokasi kecil (misalnya matplotlib). Puncak memori diukur pada
+    pengulangan terpisah setelah `setup` dijalankan ulang.
+    """
+
+    def __init__(self, scale, stations, track_memory=True):
+        self.meta = {'scale': scale, 'rows': None, 'stations': stations}
+        self.track_memory = track_memory
+        self.records = []
+        self.render_s = 0.0
+
+    def measure(self, step, func, setup=None):
+        """
+        Mengukur satu langkah.
+
+        Parameters:
+        - step (str): Nama langkah.
+        - func (callable): Fungsi tanpa argumen yang diukur.
+        - setup (callable): Fungsi tanpa argumen untuk menyiapkan kondisi awal
+          (misalnya mengosongkan cache). Tidak ikut diukur.
+
+        Returns:
+        - object: Hasil func pada pengukuran waktu.
+        """
+        if setup is not None:
+            setup()
+        figure_cache.clear()
+        self.render_s = 0.0
+        start = time.perf_counter()
+        result = func()
+        total = time.perf_counter() - start
+        render = self.render_s
+
+        peak = None
+        if self.track_memory:
+            if setup is not None:
+                setup()
+            figure_cache.clear()
+            tracemalloc.start()
+            try:
+                func()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        record = {
+            **self.meta,
+            'step': step,
+            'total_s': round(total, 6),
+            'compute_s': round(total - render, 6),
+            'render_s': round(render, 6),
+            'peak_mb': round(peak / 2 ** 20, 3) if peak is not None else None,
+        }
+        self.records.append(record)
+        print(f"  {step:<48} total {total:8.3f} s  render {render:7.3f} s"
+              + (f"  peak {record['peak_mb']:9.1f} MB" if peak is not None else ''))
+        return result
+
+
+def bench_scale(scale, work_dir, track_memory=True):
+    """
+    Menjalankan semua benchmark untuk satu ukuran dataset.
+
+    Returns:
+    - list: Hasil pengukuran per langkah.
+    """
+    df = make_synthetic(scale)
+    csv_path = os.path.join(work_dir, f'synthetic_x{scale}.csv')
+    df.to_csv(csv_path, index=False)
+    stations = df['station'].nunique()
+    print(f'Skala {scale}×: {len(df)} baris, {stations} stasiun')
+    del df
+
+    recorder = Recorder(scale, stations, track_memory)
+    style, palette = 'darkgrid', 'viridis'
+    state = {}
+
+    def load():
+        state['dataset'] = plot.process_data(csv_path, live_store='')
+        state['df'] = state['dataset'].frame
+        return state['dataset']
+
+    def remove_columns():
+        # File kolom memory-map dihapus agar process_data membaca snapshot Parquet
+        clear_dataset_cache()
+        shutil.rmtree(os.path.join(os.environ['AIR_QUALITY_CACHE_DIR'], 'columns'), ignore_errors=True)
+
+    def remove_snapshots():
+        # Snapshot lama dihapus agar process_data benar-benar membaca CSV
+        remove_columns()
+        cache_dir = os.environ['AIR_QUALITY_CACHE_DIR']
+        for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+            if os.path.isfile(os.path.join(cache_dir, name)):
+                os.remove(os.path.join(cache_dir, name))
+
+    def reload_from_snapshot():
+        # Struktur turunan (kubus, indeks, statistik korelasi) ikut terhapus
+        clear_dataset_cache()
+        load()
+
+    # Rendering dipisahkan dari komputasi dengan mengukur pemanggilan pool render
+    original_render = plot.render_pool.render
+
+    def timed_render(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_render(*args, **kwargs)
+        finally:
+            recorder.render_s += time.perf_counter() - start
+
+    plot.render_pool.render = timed_render
+    try:
+        recorder.measure('process_data.cold_csv', load, remove_snapshots)
+        recorder.measure('process_data.parquet_snapshot', load, remove_columns)
+        recorder.measure('process_data.mapped_columns', load, clear_dataset_cache)
+        recorder.measure('process_data.memory_cache', load)
+        recorder.meta['rows'] = len(state['df'])
+        for record in recorder.records:
+            record['rows'] = len(state['df'])
+
+        recorder.measure('filter.build_index', lambda: get_filter_index(state['df']), reload_from_snapshot)
+        index = get_filter_index(state['df'])
+        stations = index.values('station')
+        years = index.values('year')
+        start = pd.Timestamp(index.datetimes[0])
+        selections = {
+            'all': FilterSelection((), (), (), None, None),
+            'one_station': FilterSelection(tuple(stations[:1]), (), (), None, None),
+            'station_year_season': FilterSelection(tuple(stations[:2]), tuple(years[1:2]), ('Winter',), None, None),
+            'time_range_30d': FilterSelection((), (), (), start, start + pd.Timedelta(days=30)),
+        }
+        for name, selection in selections.items():
+            recorder.measure(f'filter.query.{name}', lambda s=selection: index.query(s).page(0, 100))
+        recorder.measure('display_filtered_dataframe', lambda: plot.display_filtered_dataframe(state['dataset']))
+
+        # Ekspor seluruh data; puncak memori seharusnya sebesar satu potongan, bukan seluruh hasil
+        everything = selections['all']
+        for fmt in EXPORT_FORMATS:
+            recorder.measure(f'export.{fmt}', lambda f=fmt: export_to_file(
+                index.query(everything), everything, f, work_dir),
+                lambda: shutil.rmtree(os.path.join(work_dir, 'exports'), ignore_errors=True))
+
+        recorder.measure('range_index.build', lambda: get_range_index(state['df']), reload_from_snapshot)
+        range_index = get_range_index(state['df'])
+        window = selections['time_range_30d']
+        recorder.measure('range_index.query.all', lambda: range_index.extremes('TEMP'))
+        recorder.measure('range_index.query.time_range_30d',
+                         lambda: range_index.extremes('TEMP', window.start, window.end))
+
+        recorder.measure('resample.hourly_window', lambda: get_resample_cache(state['df']).window(
+            stations[0], 'PM2.5', 'hourly', window.start, window.end), reload_from_snapshot)
+        recorder.measure('resample.hourly_full_lttb', lambda: get_resample_cache(state['df']).window(
+            stations[0], 'PM2.5', 'hourly'))
+        recorder.measure('resample.daily', lambda: get_resample_cache(state['df']).window(
+            stations[0], 'PM2.5', 'daily'))
+
+        recorder.measure('rolling_aqi.build', lambda: get_rolling_aqi(state['df']), reload_from_snapshot)
+        engine = get_rolling_aqi(state['df'])
+        recorder.measure('rolling_aqi.exceedances', lambda: engine.exceedances('PM2.5', 75))
+        selection = selections['station_year_season']
+
+        recorder.measure('wind_rose.build', lambda: get_wind_rose(state['df']), reload_from_snapshot)
+        rose = get_wind_rose(state['df'])
+        # Hasil agregasi disimpan per filter, jadi simpanannya dikosongkan sebelum diukur
+        recorder.measure('wind_rose.aggregate', lambda: rose.aggregate('PM2.5', selection), rose._results.clear)
+
+        # Analisis musiman di proses ini dan di pool proses; deret harian dihitung ulang
+        # dari snapshot setiap kali, dan waktu pool termasuk memulai worker 'spawn'
+        for workers in sorted({0, os.cpu_count() or 1}):
+            recorder.measure(f'seasonal.workers_{workers}',
+                             lambda n=workers: run_seasonal_analysis(state['df'], workers=n), reload_from_snapshot)
+
+        plot_calls = {
+            'plot_pm_variation_combined': lambda: plot.plot_pm_variation_combined(
+                state['dataset'], style, palette),
+            'plot_weather_pollution_correlation.auto': lambda: plot.plot_weather_pollution_correlation(
+                state['dataset'], style, palette, 'auto', selection=selection),
+            'plot_weather_pollution_correlation.sample': lambda: plot.plot_weather_pollution_correlation(
+                state['dataset'], style, palette, 'sample', selection=selection),
+            'plot_pollutant_correlation': lambda: plot.plot_pollutant_correlation(
+                state['dataset'], style, palette, selection),
+            'plot_station_pollutant_avg': lambda: plot.plot_station_pollutant_avg(
+                state['dataset'], POLLUTANT_COLUMNS, style, palette),
+            'plot_pollutant_trends.monthly': lambda: plot.plot_pollutant_trends(
+                state['dataset'], POLLUTANT_COLUMNS, style, palette, 'monthly'),
+            'plot_pollutant_trends.hourly': lambda: plot.plot_pollutant_trends(
+                state['dataset'], POLLUTANT_COLUMNS, style, palette, 'hourly'),
+            'plot_station_temperature_stats': lambda: plot.plot_station_temperature_stats(
+                state['dataset'], style, palette),
+            'plot_highest_rainfall_station': lambda: plot.plot_highest_rainfall_station(
+                state['dataset'], style, palette),
+            'plot_station_temperature_stats.time_range_30d': lambda: plot.plot_station_temperature_stats(
+                state['dataset'], style, palette, window),
+            'plot_aqi_overview': lambda: plot.plot_aqi_overview(state['dataset'], style, palette),
+            'plot_wind_rose': lambda: plot.plot_wind_rose(state['dataset'], 'PM2.5', style, palette, selection),
+            'plot_seasonal_analysis': lambda: plot.plot_seasonal_analysis(
+                state['dataset'], POLLUTANT_COLUMNS, style, palette),
+        }
+        # 'cold' termasuk membangun struktur turunan (kubus, statistik korelasi),
+        # 'warm' hanya membuat dan merender gambar
+        for name, call in plot_calls.items():
+            recorder.measure(f'{name}.cold', call, reload_from_snapshot)
+            recorder.measure(f'{name}.warm', call)
+    finally:
+        plot.render_pool.render = original_render
+        os.remove(csv_path)
+    return recorder.records
+
+
+def bench_render_throughput(sessions, workers_options, rounds=2):
+    """
+    Mengukur throughput render saat beberapa sesi meminta gambar bersamaan.
+
+    Setiap sesi (thread) merender gambar-gambar dashboard dengan kunci unik sehingga
+    tidak ada yang digabung atau diambil dari cache. Data agregat disiapkan sekali
+    dari dataset sintetis 1×.
+
+    Returns:
+    - list: Hasil per jumlah worker (gambar per detik).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from density import pair_histograms
+    from rollup import RollupCube
+    from timeseries import ResampleCache
+
+    df = make_synthetic(1)
+    cube = RollupCube.from_frame(df)
+    columns = ['TEMP', 'PRES', 'WSPM', 'PM2.5', 'PM10']
+    temp = cube.min(['station'], ['TEMP']).rename(columns={'TEMP': 'min'})
+    temp['max'] = cube.max(['station'], ['TEMP'])['TEMP']
+    resampled = ResampleCache(df)
+    trends = pd.concat([
+        resampled.window(station, pol, 'daily').rename(columns={pol: 'value'}).assign(station=station, pollutant=pol)
+        for pol in POLLUTANT_COLUMNS for station in resampled.stations], ignore_index=True)
+    jobs = [
+        ('pm_variation', cube.mean(['station', 'month_year'], ['PM2.5', 'PM10']), {}),
+        ('correlation_heatmap', df[columns].corr(), {'title': 'Korelasi', 'figsize': (8, 6)}),
+        ('pair_density', pair_histograms(df, columns, 'station'), {'columns': columns}),
+        ('station_pollutant_avg', cube.mean(['station'], POLLUTANT_COLUMNS), {'pollutants': POLLUTANT_COLUMNS}),
+        ('pollutant_trends', trends, {'pollutants': POLLUTANT_COLUMNS, 'title': 'Tren'}),
+        ('temperature_stats', temp.melt(id_vars='station', value_vars=['min', 'max'],
+                                        var_name='Temperature_Type', value_name='Temperature'), {}),
+        ('rainfall', cube.max(['station'], ['RAIN']), {}),
+    ]
+    assert {kind for kind, _, _ in jobs} <= set(FIGURE_BUILDERS)
+
+    results = []
+    for workers in workers_options:
+        pool = RenderPool(workers)
+        # Pemanasan: worker dijalankan dan modul diimpor sebelum pengukuran
+        pool.render(('warmup',), 'rainfall', jobs[-1][1], 'darkgrid', 'deep', 'notebook')
+
+        def session(number):
+            for round_number in range(rounds):
+                for kind, data, params in jobs:
+                    pool.render((number, round_number, kind), kind, data, 'darkgrid', 'deep', 'notebook', params)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            list(executor.map(session, range(sessions)))
+        elapsed = time.perf_counter() - start
+        pool.shutdown()
+        figures = sessions * rounds * len(jobs)
+        results.append({'scale': 1, 'step': f'render_throughput.workers_{workers}', 'sessions': sessions,
+                        'figures': figures, 'total_s': round(elapsed, 6),
+                        'figures_per_s': round(figures / elapsed, 3)})
+        print(f"  render {sessions} sesi, {workers} worker: {figures} gambar dalam {elapsed:.2f} s "
+              f"({figures / elapsed:.2f} gambar/detik)")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path, new_path):
+    """
+    Membandingkan dua file hasil benchmark per skala dan langkah.
+    """
+    frames = []
+    for label, path in (('lama', old_path), ('baru', new_path)):
+        with open(path, encoding='utf-8') as f:
+            frames.append(pd.DataFrame(json.load(f)['results'])
+                          .set_index(['scale', 'step'])[['total_s', 'peak_mb']]
+                          .add_suffix(f'_{label}'))
+    table = frames[0].join(frames[1], how='outer')
+    table['rasio_waktu'] = table['total_s_baru'] / table['total_s_lama']
+    with pd.option_context('display.width', 160, 'display.max_rows', None, 'display.max_columns', None,
+                           'display.float_format', '{:.3f}'.format):
+        print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fungsi-fungsi di dashboard/plot.py.')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='Faktor ukuran dataset (default: 1 10 100)')
+    parser.add_argument('--output', help='File JSON hasil (default: benchmarks/results/<waktu>.json)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Jangan ukur puncak memori (tracemalloc menambah overhead waktu)')
+    parser.add_argument('--render-sessions', type=int, default=8,
+                        help='Jumlah sesi bersamaan untuk benchmark throughput render (0 untuk melewati)')
+    parser.add_argument('--compare', nargs=2, metavar=('LAMA', 'BARU'),
+                        help='Bandingkan dua file hasil alih-alih menjalankan benchmark')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    plot.st = StreamlitStub()
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in args.scales:
+            results.extend(bench_scale(scale, work_dir, track_memory=not args.no_memory))
+    if args.render_sessions:
+        print(f'Throughput render dengan {args.render_sessions} sesi bersamaan')
+        results.extend(bench_render_throughput(
+            args.render_sessions, sorted({0, 1, max(1, (os.cpu_count() or 1) // 2), os.cpu_count() or 1})))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'versions': {'pandas': pd.__version__, 'numpy': np.__version__,
+                         'matplotlib': matplotlib.__version__},
+            'memory_tracked': not args.no_memory,
+            'results': results,
+        }, f, indent=2)
+    print(f'Hasil disimpan di {output}')
+
+
+if __name__ == '__main__':
+    main()
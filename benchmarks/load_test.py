@@ -0,0 +1,189 @@
+"""
+Uji beban dashboard/api.py: latensi dan request per detik dengan banyak koneksi bersamaan.
+
+Setiap klien membuka satu koneksi HTTP/1.1 keep-alive dan mengirim request
+berurutan dari daftar path. Dengan --vary, rentang waktu setiap request diacak
+sehingga sebagian besar request tidak terjawab dari cache respons.
+
+Contoh:
+    python dashboard/api.py combined_data.csv &
+    python benchmarks/load_test.py --concurrency 32 --requests 5000
+    python benchmarks/load_test.py --vary --duration 20 --output benchmarks/results/api.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+# Campuran request default: satu path per endpoint agregat
+DEFAULT_PATHS = [
+    '/averages?columns=PM2.5,PM10,TEMP',
+    '/averages?by=station,month&seasons=Winter&columns=PM2.5',
+    '/series?columns=PM2.5&frequency=daily&start=2016-01-01&end=2016-12-31',
+    '/correlation?columns=TEMP,PRES,WSPM,PM2.5,PM10',
+    '/extremes?column=TEMP&start=2015-01-01&end=2015-12-31',
+    '/wind?column=PM2.5&years=2016',
+]
+
+# Rentang data PRSA, dipakai untuk mengacak rentang waktu pada --vary
+VARY_START = pd.Timestamp('2013-03-01')
+VARY_DAYS = 1400
+
+
+def vary_path(path, rng):
+    """
+    Menambahkan rentang waktu acak ke path sehingga kunci cache-nya unik.
+    """
+    start = VARY_START + pd.Timedelta(days=int(rng.integers(0, VARY_DAYS - 31)), hours=int(rng.integers(0, 24)))
+    end = start + pd.Timedelta(days=int(rng.integers(7, 365)))
+    parts = urlsplit(path)
+    query = [(name, value) for name, value in parse_qsl(parts.query) if name not in ('start', 'end')]
+    query += [('start', f'{start:%Y-%m-%dT%H:%M}'), ('end', f'{end:%Y-%m-%dT%H:%M}')]
+    return f'{parts.path}?{urlencode(query)}'
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+async def client(host, port, paths, deadline, budget, records, seed, vary):
+    """
+    Satu klien: mengirim request berurutan lewat satu koneksi sampai waktu atau jatah habis.
+    """
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        i = seed
+        while time.perf_counter() < deadline and budget['left'] > 0:
+            budget['left'] -= 1
+            path = paths[i % len(paths)]
+            i += 1
+            if vary:
+                path = vary_path(path, rng)
+            request = f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: keep-alive\r\n\r\n'
+            start = time.perf_counter()
+            writer.write(request.encode('latin-1'))
+            await writer.drain()
+            status, headers, body = await _read_response(reader)
+            records.append({
+                'endpoint': path.split('?', 1)[0],
+                'status': status,
+                'cache': headers.get('x-cache', ''),
+                'latency_ms': (time.perf_counter() - start) * 1000,
+                'bytes': len(body),
+            })
+    finally:
+        writer.close()
+
+
+async def run_load(url, paths, concurrency, requests, duration, vary, seed=0):
+    """
+    Menjalankan uji beban.
+
+    Parameters:
+    - url (str): Alamat dasar API, misalnya 'http://127.0.0.1:8502'.
+    - paths (list): Path beserta query string yang diminta bergiliran.
+    - concurrency (int): Jumlah koneksi bersamaan.
+    - requests (int): Jumlah request maksimum. None berarti dibatasi durasi saja.
+    - duration (float): Durasi maksimum dalam detik.
+    - vary (bool): Acak rentang waktu setiap request.
+    - seed (int): Seed generator acak.
+
+    Returns:
+    - tuple: (pd.DataFrame satu baris per request, waktu total dalam detik)
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname or '127.0.0.1', parts.port or 80
+    records = []
+    budget = {'left': requests if requests else float('inf')}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(host, port, paths, deadline, budget, records, seed + i, vary)
+                           for i in range(concurrency)))
+    return pd.DataFrame(records), time.perf_counter() - start
+
+
+def summarize(records, elapsed):
+    """
+    Meringkas latensi per endpoint dan keseluruhan.
+
+    Returns:
+    - pd.DataFrame: Jumlah request, request per detik, persentil latensi (ms) dan
+      jumlah per status cache.
+    """
+    def stats(frame):
+        latency = frame['latency_ms'].to_numpy()
+        return pd.Series({
+            'requests': len(frame),
+            'rps': len(frame) / elapsed,
+            'errors': int((frame['status'] != 200).sum()),
+            'mean_ms': latency.mean(),
+            'p50_ms': np.percentile(latency, 50),
+            'p95_ms': np.percentile(latency, 95),
+            'p99_ms': np.percentile(latency, 99),
+            'max_ms': latency.max(),
+            'hit': int((frame['cache'] == 'hit').sum()),
+            'miss': int((frame['cache'] == 'miss').sum()),
+            'coalesced': int((frame['cache'] == 'coalesced').sum()),
+        })
+
+    table = {endpoint: stats(frame) for endpoint, frame in records.groupby('endpoint', sort=True)}
+    table['total'] = stats(records)
+    counts = ['requests', 'errors', 'hit', 'miss', 'coalesced']
+    return pd.DataFrame(table).T.astype({col: 'int64' for col in counts})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Uji beban layanan HTTP dashboard/api.py.')
+    parser.add_argument('--url', default='http://127.0.0.1:8502', help='Alamat dasar API')
+    parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='Path yang diminta bergiliran')
+    parser.add_argument('--concurrency', type=int, default=16, help='Jumlah koneksi bersamaan')
+    parser.add_argument('--requests', type=int, default=2000, help='Jumlah request, 0 untuk tanpa batas')
+    parser.add_argument('--duration', type=float, default=30.0, help='Durasi maksimum dalam detik')
+    parser.add_argument('--vary', action='store_true',
+                        help='Acak rentang waktu setiap request agar tidak terjawab dari cache')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Simpan ringkasan sebagai JSON')
+    args = parser.parse_args()
+
+    records, elapsed = asyncio.run(run_load(
+        args.url, args.paths, args.concurrency, args.requests or None, args.duration, args.vary, args.seed))
+    if records.empty:
+        print('Tidak ada request yang selesai.')
+        return
+    summary = summarize(records, elapsed)
+    with pd.option_context('display.width', 160, 'display.max_columns', None, 'display.float_format', '{:.2f}'.format):
+        print(summary)
+    total = summary.loc['total']
+    print(f"\n{int(total['requests'])} request dalam {elapsed:.2f} detik: {total['rps']:,.1f} request/detik, "
+          f"p50 {total['p50_ms']:.2f} ms, p99 {total['p99_ms']:.2f} ms")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'url': args.url, 'concurrency': args.concurrency, 'vary': args.vary,
+                'elapsed_s': elapsed,
+                'results': summary.reset_index(names='endpoint').to_dict(orient='records'),
+            }, f, indent=2)
+        print(f'Hasil disimpan di {args.output}')
+
+
+if __name__ == '__main__':
+    main()
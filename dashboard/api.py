@@ -0,0 +1,639 @@
+"""
+Layanan HTTP JSON lokal untuk agregat dashboard, tanpa Streamlit.
+
+Semua endpoint memakai dataset dan struktur turunan yang sama dengan dashboard
+(kubus agregat, statistik korelasi, indeks nilai ekstrem, cache resample), dan
+hanya menerima GET dengan parameter query string.
+
+Contoh:
+    python dashboard/api.py combined_data.csv --port 8502
+    curl 'http://127.0.0.1:8502/averages?stations=Changping&start=2016-01-01&columns=PM2.5,PM10'
+    curl 'http://127.0.0.1:8502/series?stations=Changping&columns=PM2.5&frequency=daily&start=2016-01-01'
+    curl -o changping.parquet 'http://127.0.0.1:8502/export?stations=Changping&years=2016&format=parquet'
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from corr_stats import get_correlation_stats
+from data_loader import DEFAULT_CACHE_DIR, DEFAULT_DATA_URL, load_combined_data
+from dataset import get_dataset
+from export import EXPORT_FORMATS, iter_export, open_export
+from filter_engine import FilterSelection, get_filter_index
+from live_store import DEFAULT_LIVE_STORE, sync_live_data
+from range_index import EXTREMA_COLUMNS, get_range_index
+from rollup import get_rollup
+from schema import MEASUREMENT_COLUMNS, POLLUTANT_COLUMNS
+from seasonal import get_seasonal_analysis
+from timeseries import FREQUENCIES, get_resample_cache
+from windrose import get_wind_rose
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+
+# Alamat layanan ini seperti yang dapat dibuka browser, dipakai dashboard untuk tautan unduhan
+DEFAULT_API_URL = os.environ.get('AIR_QUALITY_API_URL', f'http://{DEFAULT_HOST}:{DEFAULT_PORT}')
+
+# Jumlah respons yang disimpan; kunci cache memuat fingerprint dataset
+MAX_CACHED_RESPONSES = 512
+
+# Selang waktu (detik) pengecekan data live baru
+DEFAULT_REFRESH_SECONDS = 30
+
+# Dimensi pengelompokan /averages; station, hour dan season juga dimensi kubus agregat
+AVERAGE_GROUPS = ['station', 'year', 'month', 'hour', 'season']
+CUBE_GROUPS = {'station', 'hour', 'season'}
+
+# Batas ukuran baris request dan header
+MAX_HEADER_BYTES = 16 * 1024
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+ENDPOINTS = {}
+
+# Endpoint ekspor dikirim bertahap dan tidak melewati cache respons
+EXPORT_PATH = '/export'
+
+
+class ApiError(ValueError):
+    """
+    Permintaan tidak valid; pesan dikirim ke klien dengan status 400.
+    """
+
+
+def endpoint(path):
+    """
+    Dekorator untuk mendaftarkan fungsi query sebagai endpoint.
+
+    Fungsi query menerima (dataset, params) dengan params berupa dict hasil
+    parse_params, dan mengembalikan objek yang dapat di-encode ke JSON
+    (DataFrame diubah menjadi daftar record).
+    """
+    def register(func):
+        ENDPOINTS[path] = func
+        return func
+    return register
+
+
+def _split(values):
+    # Parameter daftar boleh diulang (?stations=A&stations=B) atau dipisah koma
+    return [item.strip() for value in values for item in value.split(',') if item.strip()]
+
+
+def _timestamp(value, name):
+    try:
+        return pd.Timestamp(value)
+    except ValueError as e:
+        raise ApiError(f"Parameter '{name}' bukan tanggal yang valid: {value}") from e
+
+
+def _columns(values, allowed, default):
+    columns = _split(values) or list(default)
+    unknown = [col for col in columns if col not in allowed]
+    if unknown:
+        raise ApiError(f"Kolom tidak dikenal: {unknown}. Pilih dari {list(allowed)}.")
+    return tuple(dict.fromkeys(columns))
+
+
+def parse_params(query):
+    """
+    Menerjemahkan query string menjadi parameter ternormalisasi.
+
+    Daftar stasiun, tahun dan musim diurutkan sehingga query yang setara
+    memakai kunci cache yang sama. Urutan kolom dipertahankan karena menentukan
+    urutan hasil.
+
+    Parameters:
+    - query (str): Query string tanpa '?'.
+
+    Returns:
+    - dict: Parameter dengan nilai hashable.
+
+    Raises:
+    - ApiError: Jika ada parameter yang tidak valid.
+    """
+    raw = parse_qs(query, keep_blank_values=False)
+    try:
+        years = tuple(sorted({int(year) for year in _split(raw.get('years', []))}))
+    except ValueError as e:
+        raise ApiError("Parameter 'years' harus berupa bilangan bulat.") from e
+    params = {
+        'stations': tuple(sorted(set(_split(raw.get('stations', []))))),
+        'years': years,
+        'seasons': tuple(sorted(set(_split(raw.get('seasons', []))))),
+        'start': _timestamp(raw['start'][-1], 'start') if 'start' in raw else None,
+        'end': _timestamp(raw['end'][-1], 'end') if 'end' in raw else None,
+        'columns': tuple(_split(raw.get('columns', []))),
+        'by': tuple(_split(raw.get('by', []))),
+        'frequency': raw.get('frequency', ['monthly'])[-1],
+        'column': raw.get('column', [None])[-1],
+        'format': raw.get('format', ['csv'])[-1],
+    }
+    try:
+        params['max_points'] = int(raw.get('max_points', ['0'])[-1])
+    except ValueError as e:
+        raise ApiError("Parameter 'max_points' harus berupa bilangan bulat.") from e
+    if params['start'] is not None and params['end'] is not None and params['start'] > params['end']:
+        raise ApiError("Parameter 'start' harus sebelum 'end'.")
+    return params
+
+
+def _selection(params):
+    return FilterSelection(stations=params['stations'], years=params['years'], seasons=params['seasons'],
+                           start=params['start'], end=params['end'])
+
+
+def export_url(selection, fmt, base_url=DEFAULT_API_URL):
+    """
+    URL endpoint /export untuk filter dan format tertentu, misalnya untuk tautan unduhan di dashboard.
+
+    Parameters:
+    - selection (FilterSelection): Pilihan filter.
+    - fmt (str): 'csv' atau 'parquet'.
+    - base_url (str): Alamat layanan.
+
+    Returns:
+    - str: URL yang menghasilkan data yang sama dengan selection.
+    """
+    query = {}
+    for name in ('stations', 'years', 'seasons'):
+        values = getattr(selection, name)
+        if values:
+            query[name] = ','.join(map(str, values))
+    for name in ('start', 'end'):
+        value = getattr(selection, name)
+        if value is not None:
+            query[name] = pd.Timestamp(value).isoformat()
+    query['format'] = fmt
+    return f"{base_url.rstrip('/')}{EXPORT_PATH}?{urlencode(query)}"
+
+
+def _is_filtered(selection):
+    return bool(selection.stations or selection.years or selection.seasons
+                or selection.start is not None or selection.end is not None)
+
+
+@endpoint('/health')
+def query_health(dataset, params):
+    """
+    Ringkasan dataset yang sedang dilayani: jumlah baris, stasiun, rentang waktu dan kolom.
+    """
+    datetimes = dataset.frame['datetime']
+    return {
+        'rows': len(dataset),
+        'stations': get_filter_index(dataset.frame).values('station'),
+        'start': datetimes.iloc[0] if len(dataset) else None,
+        'end': datetimes.iloc[-1] if len(dataset) else None,
+        'columns': MEASUREMENT_COLUMNS,
+        'frequencies': FREQUENCIES,
+    }
+
+
+@endpoint('/averages')
+def query_averages(dataset, params):
+    """
+    Rata-rata dan jumlah nilai valid per kelompok untuk data yang lolos filter.
+
+    Parameter: stations, years, seasons, start, end, columns, by (subset dari
+    AVERAGE_GROUPS, default 'station'). Tanpa filter dan dengan pengelompokan
+    yang tersedia di kubus agregat, hasil diambil dari kubus tanpa memindai
+    data per jam.
+    """
+    columns = _columns(params['columns'], MEASUREMENT_COLUMNS, MEASUREMENT_COLUMNS)
+    by = list(params['by'] or ('station',))
+    unknown = [key for key in by if key not in AVERAGE_GROUPS]
+    if unknown:
+        raise ApiError(f"Pengelompokan tidak dikenal: {unknown}. Pilih dari {AVERAGE_GROUPS}.")
+
+    selection = _selection(params)
+    if not _is_filtered(selection) and set(by) <= CUBE_GROUPS:
+        cube = get_rollup(dataset.frame, dataset.month_year)
+        means = cube.mean(by, list(columns))
+        counts = cube.count(by, list(columns))
+    else:
+        rows = get_filter_index(dataset.frame).query(selection).rows
+        # Dijumlahkan dalam float64 seperti kubus agregat, bukan float32 kolom aslinya
+        frame = dataset.frame[by + list(columns)].iloc[rows].astype({col: 'float64' for col in columns})
+        grouped = frame.groupby(by, observed=True, sort=True)
+        means = grouped.mean().reset_index()
+        counts = grouped.count().reset_index()
+    counts = counts.rename(columns={col: f'{col}_count' for col in columns})
+    return means.merge(counts, on=by)
+
+
+@endpoint('/series')
+def query_series(dataset, params):
+    """
+    Deret waktu rata-rata per stasiun dan kolom pada resolusi 'frequency'.
+
+    Parameter: stations, columns, frequency (salah satu FREQUENCIES), start,
+    end, max_points (0 berarti tanpa downsampling LTTB). Rentang waktu
+    diterapkan pada awal setiap periode.
+    """
+    columns = _columns(params['columns'], MEASUREMENT_COLUMNS, POLLUTANT_COLUMNS)
+    frequency = params['frequency']
+    if frequency not in FREQUENCIES:
+        raise ApiError(f"Resolusi '{frequency}' tidak dikenal. Pilih dari {FREQUENCIES}.")
+
+    cache = get_resample_cache(dataset.frame)
+    stations = [station for station in cache.stations
+                if not params['stations'] or station in params['stations']]
+    frames = []
+    for station in stations:
+        for col in columns:
+            window = cache.window(station, col, frequency, params['start'], params['end'],
+                                  params['max_points'])
+            frames.append(pd.DataFrame({'station': station, 'column': col,
+                                        'datetime': window['datetime'], 'value': window[col]}))
+    if not frames:
+        return pd.DataFrame(columns=['station', 'column', 'datetime', 'value'])
+    return pd.concat(frames, ignore_index=True)
+
+
+@endpoint('/correlation')
+def query_correlation(dataset, params):
+    """
+    Matriks korelasi Pearson antar kolom untuk data yang lolos filter.
+
+    Parameter: stations, years, seasons, start, end, columns.
+    """
+    stats = get_correlation_stats(dataset.frame)
+    columns = _columns(params['columns'], stats.columns, stats.columns)
+    selection = _selection(params)
+    matrix = stats.correlation(selection if _is_filtered(selection) else None, list(columns))
+    return {'columns': list(columns), 'matrix': matrix.to_numpy()}
+
+
+@endpoint('/extremes')
+def query_extremes(dataset, params):
+    """
+    Nilai minimum dan maksimum per stasiun beserta waktunya.
+
+    Parameter: column (salah satu EXTREMA_COLUMNS, default 'TEMP'), stations, start, end.
+    """
+    column = params['column'] or 'TEMP'
+    if column not in EXTREMA_COLUMNS:
+        raise ApiError(f"Kolom '{column}' tidak memiliki indeks nilai ekstrem. Pilih dari {EXTREMA_COLUMNS}.")
+    return get_range_index(dataset.frame).extremes(column, params['start'], params['end'], params['stations'])
+
+
+@endpoint('/wind')
+def query_wind(dataset, params):
+    """
+    Jumlah jam dan rata-rata polutan per stasiun, arah angin dan kelas kecepatan.
+
+    Parameter: column (polutan, default 'PM2.5'), stations, years, seasons, start, end.
+    """
+    column = params['column'] or 'PM2.5'
+    if column not in MEASUREMENT_COLUMNS:
+        raise ApiError(f"Kolom '{column}' tidak dikenal. Pilih dari {MEASUREMENT_COLUMNS}.")
+    selection = _selection(params)
+    return get_wind_rose(dataset.frame).aggregate(column, selection if _is_filtered(selection) else None)
+
+
+@endpoint('/seasonal')
+def query_seasonal(dataset, params):
+    """
+    Ringkasan dekomposisi musiman dan episode polusi per stasiun × polutan.
+
+    Parameter: stations, columns (polutan, default semua POLLUTANT_COLUMNS).
+    """
+    columns = _columns(params['columns'], POLLUTANT_COLUMNS, POLLUTANT_COLUMNS)
+    analysis = get_seasonal_analysis(dataset.frame)
+
+    def keep(frame):
+        mask = frame['pollutant'].isin(columns)
+        if params['stations']:
+            mask &= frame['station'].isin(params['stations'])
+        return frame[mask]
+
+    return {'summary': keep(analysis.summary), 'episodes': keep(analysis.episodes)}
+
+
+def _json_default(value):
+    if isinstance(value, pd.DataFrame):
+        # to_json mengubah NaN menjadi null dan Timestamp menjadi ISO 8601
+        return json.loads(value.to_json(orient='records', date_format='iso', date_unit='s'))
+    if isinstance(value, np.ndarray):
+        return np.where(np.isnan(value), None, value).tolist()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Objek bertipe {type(value).__name__} tidak dapat di-encode ke JSON.")
+
+
+def encode(payload):
+    """
+    Meng-encode hasil query menjadi body JSON (bytes, UTF-8).
+    """
+    return json.dumps(payload, default=_json_default, ensure_ascii=False, allow_nan=False).encode('utf-8')
+
+
+class QueryService:
+    """
+    Menjalankan query endpoint dengan cache respons dan penggabungan request.
+
+    Query identik (endpoint, parameter ternormalisasi, fingerprint dataset) yang
+    datang bersamaan hanya dihitung sekali: request berikutnya menunggu future
+    yang sama. Body JSON hasilnya disimpan di cache LRU sehingga request
+    berikutnya dijawab tanpa menghitung atau meng-encode ulang. Perhitungan
+    dijalankan di thread pool agar event loop tetap melayani koneksi lain.
+    """
+
+    def __init__(self, source=DEFAULT_DATA_URL, cache_dir=DEFAULT_CACHE_DIR, live_store=DEFAULT_LIVE_STORE,
+                 workers=None, max_cached=MAX_CACHED_RESPONSES):
+        self.source = source
+        self.cache_dir = cache_dir
+        self.live_store = live_store
+        self.max_cached = max_cached
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-query')
+        self.base = None
+        self.dataset = None
+        self._responses = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+
+    def load(self):
+        """
+        Memuat dataset dan menambahkan data live yang belum dilihat.
+
+        Returns:
+        - AirQualityDataset: Dataset yang dilayani mulai request berikutnya.
+        """
+        if self.base is None:
+            self.base = load_combined_data(self.source, self.cache_dir).frame
+        frame = sync_live_data(self.base, self.live_store)
+        if self.dataset is None or self.dataset.frame is not frame:
+            self.dataset = get_dataset(frame)
+        return self.dataset
+
+    async def refresh_forever(self, interval):
+        """
+        Mengecek data live secara berkala. Respons lama tidak perlu dihapus karena
+        fingerprint dataset baru menghasilkan kunci cache yang berbeda.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await loop.run_in_executor(self.executor, self.load)
+            except (OSError, ValueError) as e:
+                print(f"Data live tidak dapat dimuat: {e}")
+
+    def _cached(self, key):
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+            return body
+
+    def _store(self, key, body):
+        with self._lock:
+            self._responses[key] = body
+            while len(self._responses) > self.max_cached:
+                self._responses.popitem(last=False)
+
+    def _compute(self, key, query, dataset, params):
+        body = self._cached(key)
+        if body is None:
+            body = encode({'fingerprint': key[0], 'data': query(dataset, params)})
+            self._store(key, body)
+        return body
+
+    async def handle(self, path, query_string):
+        """
+        Menjawab satu request GET.
+
+        Parameters:
+        - path (str): Path URL, misalnya '/averages'.
+        - query_string (str): Query string tanpa '?'.
+
+        Returns:
+        - tuple: (status HTTP, body JSON, status cache: 'hit', 'miss', 'coalesced' atau '')
+        """
+        path = path.rstrip('/') or '/'
+        query = ENDPOINTS.get(path)
+        if query is None:
+            return 404, encode({'error': f"Endpoint '{path}' tidak ada.",
+                                'endpoints': sorted([*ENDPOINTS, EXPORT_PATH])}), ''
+        try:
+            params = parse_params(query_string)
+        except ApiError as e:
+            self.stats['errors'] += 1
+            return 400, encode({'error': str(e)}), ''
+
+        dataset = self.dataset
+        key = (dataset.fingerprint, path, tuple(sorted(params.items())))
+        body = self._cached(key)
+        if body is not None:
+            self.stats['hits'] += 1
+            return 200, body, 'hit'
+
+        future = self._inflight.get(key)
+        state = 'coalesced'
+        if future is None:
+            state = 'miss'
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, self._compute, key, query, dataset, params)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        self.stats['misses' if state == 'miss' else 'coalesced'] += 1
+
+        try:
+            # shield: request yang dibatalkan tidak membatalkan perhitungan milik request lain
+            body = await asyncio.shield(future)
+        except (ApiError, KeyError) as e:
+            self.stats['errors'] += 1
+            return 400, encode({'error': str(e)}), state
+        except Exception as e:
+            self.stats['errors'] += 1
+            return 500, encode({'error': f"{type(e).__name__}: {e}"}), state
+        return 200, body, state
+
+    async def serve_connection(self, reader, writer):
+        """
+        Melayani satu koneksi HTTP/1.1 dengan keep-alive sampai klien menutupnya.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 400, encode({'error': 'Header terlalu besar.'}), '', False)
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                parts = lines[0].split(' ')
+                if len(parts) != 3:
+                    await self._respond(writer, 400, encode({'error': 'Baris request tidak valid.'}), '', False)
+                    break
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                length = int(headers.get('content-length') or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                start = time.perf_counter()
+                if method not in ('GET', 'HEAD'):
+                    status, body, state = 405, encode({'error': 'Hanya GET yang didukung.'}), ''
+                else:
+                    url = urlsplit(target)
+                    if method == 'GET' and url.path.rstrip('/') == EXPORT_PATH:
+                        if not await self.stream_export(writer, url.query, keep_alive, version == 'HTTP/1.1'):
+                            break
+                        continue
+                    status, body, state = await self.handle(url.path, url.query)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                await self._respond(writer, status, b'' if method == 'HEAD' else body, state, keep_alive,
+                                    elapsed_ms, len(body))
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def stream_export(self, writer, query_string, keep_alive, chunked):
+        """
+        Mengirim data per jam yang lolos filter sebagai CSV atau Parquet, sepotong demi sepotong.
+
+        Parameter: stations, years, seasons, start, end, format ('csv' atau 'parquet').
+        File yang sudah disiapkan untuk dataset, filter dan format yang sama (lihat
+        export.export_to_file) dibaca dari disk; selain itu baris dibaca dari indeks
+        filter dan dikodekan langsung. Potongan berikutnya baru dibaca setelah potongan
+        sebelumnya terkirim ke klien, sehingga memori yang dipakai sebesar satu potongan
+        berapa pun ukuran hasilnya. Klien HTTP/1.0 menerima body tanpa chunked encoding dan koneksinya
+        ditutup di akhir.
+
+        Returns:
+        - bool: True jika koneksi tetap dibuka untuk request berikutnya.
+        """
+        try:
+            params = parse_params(query_string)
+            if params['format'] not in EXPORT_FORMATS:
+                raise ApiError(f"Format '{params['format']}' tidak dikenal. Pilih dari {list(EXPORT_FORMATS)}.")
+        except ApiError as e:
+            self.stats['errors'] += 1
+            await self._respond(writer, 400, encode({'error': str(e)}), '', keep_alive)
+            return keep_alive
+
+        loop = asyncio.get_running_loop()
+        dataset = self.dataset
+        selection = _selection(params)
+        result = await loop.run_in_executor(
+            self.executor, lambda: get_filter_index(dataset.frame).query(selection))
+        # File yang sudah disiapkan dashboard (export_to_file) dikirim apa adanya
+        chunks = open_export(result, selection, params['format'], self.cache_dir)
+        if chunks is None:
+            chunks = iter_export(result, params['format'])
+        keep_alive = keep_alive and chunked
+        headers = [
+            'HTTP/1.1 200 OK',
+            f"Content-Type: {EXPORT_FORMATS[params['format']]}",
+            f"Content-Disposition: attachment; filename=\"air_quality.{params['format']}\"",
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+            f'X-Rows: {len(result)}',
+        ]
+        if chunked:
+            headers.append('Transfer-Encoding: chunked')
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1'))
+
+        while True:
+            item = await loop.run_in_executor(self.executor, next, chunks, None)
+            if item is None:
+                break
+            data = item[0]
+            if data:
+                writer.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n' if chunked else data)
+                await writer.drain()
+        if chunked:
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        return keep_alive
+
+    async def _respond(self, writer, status, body, state, keep_alive, elapsed_ms=0.0, length=None):
+        headers = [
+            f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}',
+            'Content-Type: application/json; charset=utf-8',
+            f'Content-Length: {len(body) if length is None else length}',
+            f'Connection: {"keep-alive" if keep_alive else "close"}',
+            f'Server-Timing: query;dur={elapsed_ms:.3f}',
+        ]
+        if state:
+            headers.append(f'X-Cache: {state}')
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, refresh_seconds=DEFAULT_REFRESH_SECONDS):
+    """
+    Memuat dataset lalu melayani request sampai proses dihentikan.
+
+    Parameters:
+    - service (QueryService): Layanan query.
+    - host (str): Alamat yang didengarkan.
+    - port (int): Port yang didengarkan.
+    - refresh_seconds (float): Selang pengecekan data live. 0 berarti tidak pernah.
+    """
+    loop = asyncio.get_running_loop()
+    dataset = await loop.run_in_executor(service.executor, service.load)
+    server = await asyncio.start_server(service.serve_connection, host, port, limit=MAX_HEADER_BYTES)
+    print(f"{len(dataset)} baris dimuat. Melayani http://{host}:{port} "
+          f"(endpoint: {', '.join(sorted([*ENDPOINTS, EXPORT_PATH]))})")
+    refresher = None
+    if refresh_seconds and service.live_store:
+        refresher = asyncio.create_task(service.refresh_forever(refresh_seconds))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if refresher is not None:
+            refresher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Layanan HTTP JSON untuk agregat dashboard kualitas udara.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DATA_URL,
+                        help='URL atau path file CSV, atau direktori dataset Parquet (default: dataset dashboard)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache', default=DEFAULT_CACHE_DIR, help='Direktori cache dataset')
+    parser.add_argument('--live-store', default=DEFAULT_LIVE_STORE, help='Direktori LiveStore (opsional)')
+    parser.add_argument('--refresh', type=float, default=DEFAULT_REFRESH_SECONDS,
+                        help='Selang pengecekan data live dalam detik, 0 untuk mematikan')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah thread untuk menghitung query')
+    parser.add_argument('--max-cached', type=int, default=MAX_CACHED_RESPONSES,
+                        help='Jumlah respons yang disimpan di cache')
+    args = parser.parse_args()
+
+    service = QueryService(args.source, args.cache, args.live_store, args.workers, args.max_cached)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.refresh))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False, cancel_futures=True)
+        print(f"Statistik cache: {service.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived
+
+# Panjang jendela rata-rata bergerak (jam) per polutan sesuai HJ 633-2012:
+# rata-rata 24 jam untuk PM2.5, PM10, SO2, NO2, CO dan rata-rata 8 jam untuk O3
+ROLLING_WINDOWS = {'PM2.5': 24, 'PM10': 24, 'SO2': 24, 'NO2': 24, 'CO': 24, 'O3': 8}
+
+# Jumlah minimum data per jam yang valid agar rata-rata bergerak dihitung
+MIN_PERIODS = {24: 20, 8: 6}
+
+# Batas sub-indeks (IAQI) dan konsentrasi padanannya (µg/m³; CO dalam dataset juga µg/m³)
+IAQI_LEVELS = [0, 50, 100, 150, 200, 300, 400, 500]
+IAQI_BREAKPOINTS = {
+    'PM2.5': [0, 35, 75, 115, 150, 250, 350, 500],
+    'PM10': [0, 50, 150, 250, 350, 420, 500, 600],
+    'SO2': [0, 50, 150, 475, 800, 1600, 2100, 2620],
+    'NO2': [0, 40, 80, 180, 280, 565, 750, 940],
+    'CO': [0, 2000, 4000, 14000, 24000, 36000, 48000, 60000],
+    'O3': [0, 100, 160, 215, 265, 800],
+}
+# Rata-rata 8 jam O3 di atas 800 µg/m³ memakai sub-indeks konsentrasi O3 per jam
+O3_HOURLY_BREAKPOINTS = [0, 160, 200, 300, 400, 800, 1000, 1200]
+
+# Kategori AQI dan batas atasnya
+AQI_CATEGORIES = ['Sangat Baik', 'Baik', 'Tercemar Ringan',
+                  'Tercemar Sedang', 'Tercemar Berat', 'Tercemar Parah']
+AQI_CATEGORY_BOUNDS = [50, 100, 150, 200, 300]
+AQI_COLORS = ['#00e400', '#ffff00', '#ff7e00', '#ff0000', '#99004c', '#7e0023']
+
+# Ambang batas baku mutu harian (GB 3095-2012 kelas II) untuk rata-rata bergerak
+EXCEEDANCE_LIMITS = {'PM2.5': 75, 'PM10': 150, 'SO2': 150, 'NO2': 80, 'CO': 4000, 'O3': 160}
+
+# Jarak kode stasiun pada kunci (stasiun, jam) agar jendela tidak melewati batas stasiun
+_STATION_STRIDE = np.int64(1) << 40
+
+
+def rolling_mean(values, starts, min_periods):
+    """
+    Rata-rata bergerak dengan jumlah kumulatif.
+
+    Parameters:
+    - values (np.ndarray): Nilai per baris, NaN untuk data hilang.
+    - starts (np.ndarray): Posisi baris pertama jendela untuk setiap baris.
+    - min_periods (int): Jumlah minimum nilai valid dalam jendela.
+
+    Returns:
+    - np.ndarray: Rata-rata jendela yang berakhir di setiap baris (NaN jika data kurang).
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    ends = np.arange(1, len(values) + 1)
+    total = sums[ends] - sums[starts]
+    count = counts[ends] - counts[starts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count >= min_periods, total / count, np.nan)
+
+
+def rolling_max(values, starts, window):
+    """
+    Nilai maksimum bergerak untuk jendela yang panjangnya paling banyak `window` baris.
+
+    Tabel maksimum untuk panjang 1, 2, 4, ... dibangun dengan operasi array
+    (doubling), lalu setiap jendela dijawab dari dua blok yang saling tumpang
+    tindih. Biayanya O(n log window) tanpa perulangan Python per baris.
+
+    Parameters:
+    - values (np.ndarray): Nilai per baris, NaN untuk data hilang.
+    - starts (np.ndarray): Posisi baris pertama jendela untuk setiap baris.
+    - window (int): Panjang jendela maksimum dalam baris.
+
+    Returns:
+    - np.ndarray: Maksimum jendela yang berakhir di setiap baris (NaN jika kosong).
+    """
+    n = len(values)
+    ends = np.arange(n)
+    lengths = ends - starts + 1
+    # Baris dengan waktu ganda dapat membuat jendela lebih panjang dari `window`
+    longest = max(window, int(lengths.max()) if n else 1)
+    levels = [np.where(np.isnan(values), -np.inf, values)]
+    while (1 << len(levels)) <= longest:
+        width = 1 << (len(levels) - 1)
+        previous = levels[-1]
+        level = previous.copy()
+        level[:n - width] = np.maximum(previous[:n - width], previous[width:])
+        levels.append(level)
+
+    k = np.floor(np.log2(lengths)).astype(np.int64)
+    table = np.stack(levels)
+    result = np.maximum(table[k, starts], table[k, ends - (1 << k) + 1])
+    return np.where(np.isinf(result), np.nan, result)
+
+
+def iaqi(concentration, breakpoints, levels=IAQI_LEVELS):
+    """
+    Menghitung sub-indeks kualitas udara (IAQI) dengan interpolasi linear antar batas.
+
+    Parameters:
+    - concentration (np.ndarray): Konsentrasi polutan.
+    - breakpoints (list): Batas konsentrasi yang bersesuaian dengan levels.
+    - levels (list): Batas nilai IAQI.
+
+    Returns:
+    - np.ndarray: IAQI, dibatasi pada nilai tertinggi levels. NaN tetap NaN.
+    """
+    breakpoints = np.asarray(breakpoints, dtype=np.float64)
+    levels = np.asarray(levels[:len(breakpoints)], dtype=np.float64)
+    segment = np.clip(np.searchsorted(breakpoints, concentration, side='left') - 1, 0, len(breakpoints) - 2)
+    lo, hi = breakpoints[segment], breakpoints[segment + 1]
+    value = levels[segment] + (levels[segment + 1] - levels[segment]) * (concentration - lo) / (hi - lo)
+    return np.clip(value, levels[0], levels[-1])
+
+
+class RollingAQI:
+    """
+    Rata-rata dan maksimum bergerak, AQI dan kategori AQI per jam untuk semua
+    stasiun dan polutan.
+
+    Baris diurutkan sekali berdasarkan (stasiun, waktu) sehingga setiap stasiun
+    menjadi potongan array yang berurutan. Awal jendela setiap baris dicari
+    dengan satu binary search pada kunci (stasiun, jam), jadi jendela mengikuti
+    waktu (jam yang hilang tidak menggeser jendela) dan tidak pernah melewati
+    batas stasiun. Semua polutan dan stasiun dihitung dalam satu lintasan array.
+    """
+
+    def __init__(self, df, pollutants=None):
+        if pollutants is None:
+            pollutants = [pol for pol in ROLLING_WINDOWS if pol in df.columns]
+        self.pollutants = list(pollutants)
+
+        station = df['station']
+        if not isinstance(station.dtype, pd.CategoricalDtype):
+            station = station.astype('category')
+        codes = station.array.codes.astype(np.int64)
+        # Data sudah terurut berdasarkan waktu; sort stabil per stasiun menjaga urutan itu
+        self.order = np.argsort(codes, kind='stable')
+        codes = codes[self.order]
+        self.stations = list(station.cat.categories)
+        self.bounds = np.searchsorted(codes, np.arange(len(self.stations) + 1))
+        self.datetimes = df['datetime'].to_numpy()[self.order]
+
+        hours = self.datetimes.astype('datetime64[h]').astype(np.int64)
+        key = codes * _STATION_STRIDE + (hours - (hours.min() if len(hours) else 0))
+        starts = {window: np.searchsorted(key, key - (window - 1), side='left')
+                  for window in set(ROLLING_WINDOWS[pol] for pol in self.pollutants)}
+
+        self.values, self.means, self.maxima, self.sub_indices = {}, {}, {}, {}
+        for pol in self.pollutants:
+            window = ROLLING_WINDOWS[pol]
+            values = df[pol].to_numpy(dtype=np.float64, na_value=np.nan)[self.order]
+            self.means[pol] = rolling_mean(values, starts[window], MIN_PERIODS[window]).astype(np.float32)
+            self.maxima[pol] = rolling_max(values, starts[window], window).astype(np.float32)
+            # Nilai per jam terurut per stasiun, untuk nilai tertinggi di dalam rentang yang dipilih
+            self.values[pol] = values.astype(np.float32)
+            sub_index = iaqi(self.means[pol].astype(np.float64), IAQI_BREAKPOINTS[pol])
+            if pol == 'O3':
+                hourly = iaqi(values, O3_HOURLY_BREAKPOINTS)
+                sub_index = np.where(self.means[pol] > IAQI_BREAKPOINTS['O3'][-1], hourly, sub_index)
+            self.sub_indices[pol] = sub_index.astype(np.float32)
+
+        stacked = np.stack([self.sub_indices[pol] for pol in self.pollutants])
+        missing = np.isnan(stacked).all(axis=0)
+        filled = np.where(np.isnan(stacked), -1, stacked)
+        self.aqi = np.where(missing, np.nan, np.ceil(filled.max(axis=0))).astype(np.float32)
+        # Polutan utama: sub-indeks terbesar (-1 jika tidak ada data)
+        self.primary = np.where(missing, -1, filled.argmax(axis=0)).astype(np.int8)
+        self.category = np.where(
+            missing, -1, np.searchsorted(AQI_CATEGORY_BOUNDS, self.aqi, side='left')).astype(np.int8)
+
+    def _ranges(self, start=None, end=None, stations=None):
+        # Potongan array per stasiun untuk rentang waktu yang dipilih
+        selected = set(stations) if stations else None
+        for number, station in enumerate(self.stations):
+            if selected is not None and station not in selected:
+                continue
+            lo, hi = self.bounds[number], self.bounds[number + 1]
+            datetimes = self.datetimes[lo:hi]
+            if start is not None:
+                lo += int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(start)), side='left'))
+            if end is not None:
+                hi = self.bounds[number] + int(
+                    np.searchsorted(datetimes, np.datetime64(pd.Timestamp(end)), side='right'))
+            yield station, slice(lo, max(lo, hi))
+
+    def category_hours(self, start=None, end=None, stations=None):
+        """
+        Jumlah jam per kategori AQI untuk setiap stasiun.
+
+        Parameters:
+        - start, end (datetime): Rentang waktu (inklusif). None berarti tanpa batas.
+        - stations (iterable): Stasiun yang dihitung. Kosong atau None berarti semua.
+
+        Returns:
+        - pd.DataFrame: Index stasiun, satu kolom per kategori AQI.
+        """
+        rows = {}
+        for station, rows_slice in self._ranges(start, end, stations):
+            category = self.category[rows_slice]
+            rows[station] = np.bincount(category[category >= 0], minlength=len(AQI_CATEGORIES))
+        return pd.DataFrame.from_dict(rows, orient='index', columns=AQI_CATEGORIES)
+
+    def primary_hours(self, start=None, end=None, stations=None):
+        """
+        Jumlah jam setiap polutan menjadi polutan utama (sub-indeks terbesar)
+        untuk jam dengan AQI di atas 50, sesuai aturan pelaporan HJ 633-2012.
+
+        Returns:
+        - pd.DataFrame: Index stasiun, satu kolom per polutan.
+        """
+        rows = {}
+        for station, rows_slice in self._ranges(start, end, stations):
+            primary = self.primary[rows_slice][self.aqi[rows_slice] > AQI_CATEGORY_BOUNDS[0]]
+            rows[station] = np.bincount(primary[primary >= 0], minlength=len(self.pollutants))
+        return pd.DataFrame.from_dict(rows, orient='index', columns=self.pollutants)
+
+    def _daily_max(self, values, name, start=None, end=None, stations=None):
+        # Nilai tertinggi per hari untuk array terurut per stasiun, dipotong ke rentang
+        frames = []
+        for station, rows_slice in self._ranges(start, end, stations):
+            selected = values[rows_slice]
+            days = self.datetimes[rows_slice].astype('datetime64[D]')
+            if not len(days):
+                continue
+            first = np.flatnonzero(np.concatenate([[True], days[1:] != days[:-1]]))
+            daily = np.fmax.reduceat(np.where(np.isnan(selected), -np.inf, selected), first)
+            frames.append(pd.DataFrame({
+                'station': station, 'date': days[first],
+                name: np.where(np.isinf(daily), np.nan, daily)}))
+        if not frames:
+            return pd.DataFrame(columns=['station', 'date', name])
+        return pd.concat(frames, ignore_index=True)
+
+    def daily_max(self, start=None, end=None, stations=None):
+        """
+        AQI per jam tertinggi setiap hari untuk setiap stasiun.
+
+        Returns:
+        - pd.DataFrame: Kolom 'station', 'date' dan 'AQI'.
+        """
+        return self._daily_max(self.aqi, 'AQI', start, end, stations)
+
+    def daily_max_mean(self, pollutant, start=None, end=None, stations=None):
+        """
+        Rata-rata bergerak tertinggi setiap hari untuk setiap stasiun, misalnya
+        rata-rata 8 jam O3 maksimum harian (MDA8).
+
+        Parameters:
+        - pollutant (str): Polutan (lihat ROLLING_WINDOWS).
+        - start, end (datetime): Rentang waktu (inklusif). None berarti tanpa batas.
+        - stations (iterable): Stasiun yang dihitung. Kosong atau None berarti semua.
+
+        Returns:
+        - pd.DataFrame: Kolom 'station', 'date' dan pollutant.
+        """
+        return self._daily_max(self.means[pollutant], pollutant, start, end, stations)
+
+    def window_stats(self, pollutant, start=None, end=None, stations=None):
+        """
+        Rata-rata dan maksimum bergerak per jam untuk rentang waktu yang dipilih.
+
+        Jendela di awal rentang tetap memuat jam sebelum start, seperti jendela
+        bergerak pada umumnya; hanya baris keluarannya yang dipotong ke rentang.
+
+        Returns:
+        - pd.DataFrame: Kolom 'station', 'datetime', 'rata_rata' dan 'maksimum'.
+        """
+        frames = [pd.DataFrame({
+            'station': station, 'datetime': self.datetimes[rows_slice],
+            'rata_rata': self.means[pollutant][rows_slice], 'maksimum': self.maxima[pollutant][rows_slice]})
+            for station, rows_slice in self._ranges(start, end, stations)]
+        if not frames:
+            return pd.DataFrame(columns=['station', 'datetime', 'rata_rata', 'maksimum'])
+        return pd.concat(frames, ignore_index=True)
+
+    def exceedances(self, pollutant, threshold, start=None, end=None, stations=None):
+        """
+        Jumlah jam ketika rata-rata bergerak polutan melebihi ambang batas.
+
+        Parameters:
+        - pollutant (str): Polutan (lihat ROLLING_WINDOWS).
+        - threshold (float): Ambang batas konsentrasi untuk rata-rata bergerak.
+        - start, end (datetime): Rentang waktu (inklusif). None berarti tanpa batas.
+        - stations (iterable): Stasiun yang dihitung. Kosong atau None berarti semua.
+
+        Returns:
+        - pd.DataFrame: Per stasiun: jam di atas ambang, jam valid, persentase,
+          rata-rata bergerak tertinggi beserta waktunya, dan nilai per jam tertinggi.
+        """
+        records = []
+        for station, rows_slice in self._ranges(start, end, stations):
+            means = self.means[pollutant][rows_slice]
+            valid = ~np.isnan(means)
+            above = int((means > threshold).sum())
+            record = {'station': station, 'jam_di_atas_ambang': above, 'jam_valid': int(valid.sum()),
+                      'persen': 100.0 * above / valid.sum() if valid.any() else np.nan,
+                      'rata_rata_tertinggi': np.nan, 'waktu_tertinggi': pd.NaT,
+                      'nilai_per_jam_tertinggi': np.nan}
+            if valid.any():
+                peak = int(np.nanargmax(means))
+                record['rata_rata_tertinggi'] = float(means[peak])
+                record['waktu_tertinggi'] = pd.Timestamp(self.datetimes[rows_slice][peak])
+            hourly = self.values[pollutant][rows_slice]
+            if (~np.isnan(hourly)).any():
+                record['nilai_per_jam_tertinggi'] = float(np.nanmax(hourly))
+            records.append(record)
+        return pd.DataFrame(records)
+
+
+def get_rolling_aqi(df):
+    """
+    Mengambil hasil perhitungan AQI bergerak untuk dataset, dihitung sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses dan terurut berdasarkan 'datetime'.
+
+    Returns:
+    - RollingAQI: Hasil perhitungan yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'rolling_aqi', RollingAQI)
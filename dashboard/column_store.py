@@ -0,0 +1,268 @@
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Naikkan nilai ini jika format file kolom berubah
+COLUMN_STORE_VERSION = 1
+
+_META_FILE = 'meta.json'
+
+
+def column_dir(cache_dir, fingerprint):
+    """
+    Direktori file kolom untuk satu versi dataset.
+    """
+    return os.path.join(cache_dir, 'columns', f'{fingerprint}-c{COLUMN_STORE_VERSION}')
+
+
+def has_columns(directory):
+    """
+    Mengecek apakah kolom dataset sudah ditulis lengkap ke direktori tersebut.
+    """
+    return os.path.exists(os.path.join(directory, _META_FILE))
+
+
+def write_columns(df, directory):
+    """
+    Menulis setiap kolom DataFrame sebagai file .npy agar dapat di-memory-map.
+
+    Kolom numerik dan datetime ditulis apa adanya, kolom kategori ditulis sebagai
+    array kode dengan daftar kategorinya di meta.json. Direktori ditulis ke lokasi
+    sementara lalu dipindahkan sekaligus, sehingga proses lain tidak pernah
+    membaca direktori yang belum lengkap.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang akan ditulis.
+    - directory (str): Direktori tujuan (lihat column_dir).
+    """
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.columns-')
+    try:
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            entry = {'name': col, 'file': f'{i:03d}.npy'}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                values = series.array.codes
+                entry['categories'] = series.cat.categories.tolist()
+                entry['ordered'] = bool(series.cat.ordered)
+            else:
+                values = series.to_numpy()
+                if values.dtype == object:
+                    raise TypeError(f"Kolom '{col}' bertipe object tidak dapat di-memory-map.")
+            np.save(os.path.join(tmp_dir, entry['file']), values, allow_pickle=False)
+            columns.append(entry)
+        with open(os.path.join(tmp_dir, _META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'version': COLUMN_STORE_VERSION, 'rows': len(df), 'columns': columns}, f)
+        try:
+            os.replace(tmp_dir, directory)
+        except OSError:
+            # Proses lain sudah lebih dulu menulis direktori yang sama
+            if not has_columns(directory):
+                raise
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def open_columns(directory):
+    """
+    Membuka kolom dataset sebagai array memory-mapped yang hanya dapat dibaca.
+
+    Isi file dibaca oleh sistem operasi saat halaman memorinya diakses dan dipakai
+    bersama oleh semua sesi serta semua proses server yang membuka file yang sama.
+    DataFrame dibangun tanpa menyalin array, dan setiap upaya mengubah nilainya
+    di tempat akan gagal dengan ValueError.
+
+    Parameters:
+    - directory (str): Direktori hasil write_columns.
+
+    Returns:
+    - pd.DataFrame: DataFrame dengan kolom berbasis memory-map.
+    """
+    with open(os.path.join(directory, _META_FILE), encoding='utf-8') as f:
+        meta = json.load(f)
+    data = {}
+    for entry in meta['columns']:
+        values = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            values = pd.Categorical.from_codes(
+                values, categories=entry['categories'], ordered=entry['ordered'], validate=False)
+        data[entry['name']] = pd.Series(values, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def _column_array(series):
+    # Array numpy yang menyimpan nilai kolom (kode untuk kolom kategori)
+    array = series.array
+    return array.codes if isinstance(array, pd.Categorical) else series.to_numpy()
+
+
+def read_only_frame(df):
+    """
+    Membuat DataFrame yang kolomnya tidak dapat diubah di tempat, tanpa menyalin data.
+
+    Dipakai untuk dataset bersama yang tidak berasal dari file memory-map
+    (misalnya setelah data live ditambahkan), sehingga perilakunya sama dengan
+    hasil open_columns: setiap upaya mengubah nilainya gagal dengan ValueError.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame sumber.
+
+    Returns:
+    - pd.DataFrame: df itu sendiri jika semua kolomnya sudah memory-mapped, atau
+      DataFrame baru berisi view read-only dari kolom-kolomnya.
+    """
+    if all(_is_mapped(_column_array(df[col])) for col in df.columns):
+        return df
+    data = {}
+    for col in df.columns:
+        series = df[col]
+        values = _column_array(series).view()
+        values.flags.writeable = False
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = pd.Categorical.from_codes(values, dtype=series.dtype, validate=False)
+        data[col] = pd.Series(values, index=df.index, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+class ColumnAppender:
+    """
+    Kolom dataset yang dapat ditambah baris di ujungnya dengan biaya amortisasi
+    sebanding jumlah baris baru.
+
+    Setiap kolom disimpan dalam buffer berkapasitas lebih yang digandakan saat
+    penuh. Frame yang dikembalikan adalah view read-only dari baris [0, rows),
+    sehingga baris baru ditulis setelah ujung frame lama tanpa mengubah isinya dan
+    frame lama tetap dapat dipakai sesi lain. Dataset dasar disalin satu kali saat
+    appender dibuat, selanjutnya hanya saat kapasitas habis.
+
+    Jika kolom dataset dasar memory-mapped (hasil open_columns), buffer juga
+    berupa file yang di-memory-map di direktori kolom yang sama, sehingga halaman
+    memorinya dapat dibuang sistem operasi seperti kolom dasarnya. File tersebut
+    hanya dipakai proses ini: proses server lain dan worker tidak dapat membuka
+    versi live, dan setiap proses yang menambahkan data live menyimpan salinan
+    dataset sendiri.
+
+    Atribut:
+    - rows (int): Jumlah baris frame terakhir.
+    - frame (pd.DataFrame): Frame terakhir (read-only).
+    """
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.rows = len(df)
+        # Dataset memory-mapped tetap memory-mapped: buffer ditulis ke file di
+        # direktori kolom yang sama
+        path = _mapped_file(_column_array(df[self.columns[0]])) if self.columns else None
+        self.directory = os.path.dirname(os.path.dirname(path)) if path else None
+        self.dtypes = {col: df[col].dtype for col in self.columns}
+        self.buffers = {}
+        for col in self.columns:
+            values = _column_array(df[col])
+            buffer = self._allocate(values.dtype, 2 * self.rows)
+            buffer[:self.rows] = values
+            self.buffers[col] = buffer
+        self.frame = self._frame()
+
+    def _allocate(self, dtype, capacity):
+        capacity = max(capacity, 1)
+        if self.directory is not None:
+            try:
+                fd, path = tempfile.mkstemp(dir=self.directory, prefix='.live-')
+                os.close(fd)
+                buffer = np.memmap(path, dtype=dtype, mode='w+', shape=(capacity,))
+            except OSError:
+                self.directory = None
+            else:
+                # Mapping tetap berlaku setelah file dihapus, sehingga file hilang
+                # bersama frame terakhir yang memakainya dan tidak pernah dibuka proses lain
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                return buffer
+        return np.empty(capacity, dtype=dtype)
+
+    def _encode(self, col, series):
+        # Nilai baris baru dalam representasi buffer; kategori baru ditambahkan di
+        # ujung daftar kategori sehingga kode baris lama tetap berlaku
+        dtype = self.dtypes[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            extra = sorted(set(series.dropna().astype(str)) - set(map(str, dtype.categories)))
+            if extra:
+                dtype = pd.CategoricalDtype([*dtype.categories, *extra], ordered=dtype.ordered)
+                self.dtypes[col] = dtype
+            return series.astype(dtype).array.codes
+        return series.to_numpy(dtype=self.buffers[col].dtype)
+
+    def append(self, appended):
+        """
+        Menambahkan baris di ujung kolom.
+
+        Parameters:
+        - appended (pd.DataFrame): Baris baru dengan kolom yang sama dengan dataset.
+
+        Returns:
+        - pd.DataFrame: Frame read-only berisi baris lama dan baris baru.
+        """
+        values = {col: self._encode(col, appended[col]) for col in self.columns}
+        end = self.rows + len(appended)
+        for col in self.columns:
+            buffer = self.buffers[col]
+            dtype = np.promote_types(buffer.dtype, values[col].dtype)
+            if end > len(buffer) or dtype != buffer.dtype:
+                # Buffer baru; frame lama tetap memegang buffer lamanya
+                grown = self._allocate(dtype, 2 * end)
+                grown[:self.rows] = buffer[:self.rows]
+                self.buffers[col] = buffer = grown
+            buffer[self.rows:end] = values[col]
+        self.rows = end
+        self.frame = self._frame()
+        return self.frame
+
+    def _frame(self):
+        data = {}
+        for col in self.columns:
+            values = self.buffers[col][:self.rows].view()
+            values.flags.writeable = False
+            if isinstance(self.dtypes[col], pd.CategoricalDtype):
+                values = pd.Categorical.from_codes(values, dtype=self.dtypes[col], validate=False)
+            data[col] = pd.Series(values, copy=False)
+        return pd.DataFrame(data, copy=False)
+
+
+def _mapped_file(values):
+    # Path file memory-map yang menyimpan array, None jika array ada di heap
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return values.filename
+        values = getattr(values, 'base', None)
+    return None
+
+
+def _is_mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = getattr(values, 'base', None)
+    return False
+
+
+def memory_usage(df):
+    """
+    Memisahkan memori DataFrame menjadi bagian memory-mapped dan bagian di heap proses.
+
+    Returns:
+    - dict: 'mapped' dan 'heap' dalam bytes.
+    """
+    usage = {'mapped': 0, 'heap': 0}
+    for col in df.columns:
+        values = _column_array(df[col])
+        nbytes = int(df[col].memory_usage(index=False, deep=True))
+        usage['mapped' if _is_mapped(values) else 'heap'] += nbytes
+    return usage
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived, register_extender
+from filter_engine import get_filter_index
+from schema import MEASUREMENT_COLUMNS
+
+# Dimensi blok statistik
+BLOCK_KEYS = ['station', 'year', 'month', 'season']
+
+
+def sufficient_stats(values):
+    """
+    Menghitung statistik cukup untuk korelasi pairwise-complete.
+
+    Untuk setiap pasangan kolom (i, j), hanya baris yang nilai i dan j-nya
+    tidak NaN yang dihitung, sama seperti DataFrame.corr() di pandas.
+
+    Parameters:
+    - values (np.ndarray): Array (baris, kolom) bertipe float64, boleh berisi NaN.
+
+    Returns:
+    - tuple: (n, sx, sxx, sxy), masing-masing array (kolom, kolom) dengan
+      n[i, j] jumlah baris valid, sx[i, j] = Σ x_i, sxx[i, j] = Σ x_i² dan
+      sxy[i, j] = Σ x_i x_j pada baris yang valid untuk i dan j.
+    """
+    valid = ~np.isnan(values)
+    mask = valid.astype('float64')
+    filled = np.where(valid, values, 0.0)
+    n = mask.T @ mask
+    sx = filled.T @ mask
+    sxx = (filled * filled).T @ mask
+    sxy = filled.T @ filled
+    return n, sx, sxx, sxy
+
+
+def correlation_from_stats(n, sx, sxx, sxy):
+    """
+    Menghitung matriks korelasi Pearson dari statistik cukup.
+
+    Returns:
+    - np.ndarray: Matriks korelasi (NaN jika data tidak cukup atau variansi nol).
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * sxy - sx * sx.T
+        var_x = n * sxx - sx ** 2
+        var_y = var_x.T
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[(n < 2) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+class CorrelationStats:
+    """
+    Statistik cukup korelasi per blok stasiun × tahun × bulan.
+
+    Matriks korelasi untuk kombinasi filter apa pun dihitung dengan menjumlahkan
+    blok yang tercakup penuh oleh filter. Hanya baris pada bulan yang terpotong
+    rentang waktu yang dihitung ulang dari data per jam.
+    """
+
+    def __init__(self, df, columns=None):
+        if columns is None:
+            columns = [col for col in MEASUREMENT_COLUMNS if col in df.columns]
+        self.df = df
+        self.columns = list(columns)
+        values = df[self.columns].to_numpy(dtype='float64')
+        # Nilai digeser dengan rata-rata global agar penjumlahan kuadrat tetap presisi
+        self.offsets = np.nan_to_num(np.nanmean(values, axis=0))
+
+        month = df['datetime'].dt.month.rename('month')
+        groups = df.groupby([df['station'], df['year'], month, df['season']],
+                            observed=True, sort=True).indices
+        self.blocks = pd.DataFrame(list(groups), columns=BLOCK_KEYS)
+        self.blocks['month_start'] = pd.to_datetime(
+            {'year': self.blocks['year'], 'month': self.blocks['month'], 'day': 1})
+
+        self.stats = self._block_stats(values, groups)
+
+    def _block_stats(self, values, groups):
+        k = len(self.columns)
+        stats = np.zeros((4, len(groups), k, k))
+        for b, rows in enumerate(groups.values()):
+            stats[:, b] = sufficient_stats(values[rows] - self.offsets)
+        return stats
+
+    def extended(self, df, offset):
+        """
+        Membuat statistik untuk df yang berisi dataset lama ditambah baris baru
+        mulai posisi offset. Statistik baris baru dijumlahkan ke blok yang sudah
+        ada atau menjadi blok baru; blok lain tidak dihitung ulang.
+
+        Returns:
+        - CorrelationStats: Statistik baru; objek lama tidak diubah.
+        """
+        appended = df.iloc[offset:]
+        values = appended[self.columns].to_numpy(dtype='float64')
+        month = appended['datetime'].dt.month.rename('month')
+        groups = appended.groupby([appended['station'], appended['year'], month, appended['season']],
+                                  observed=True, sort=True).indices
+        update = self._block_stats(values, groups)
+
+        stats = CorrelationStats.__new__(CorrelationStats)
+        stats.df = df
+        stats.columns = self.columns
+        # Offset lama tetap dipakai agar statistik blok lama dan baru dapat dijumlahkan
+        stats.offsets = self.offsets
+        positions = {key: b for b, key in enumerate(self.blocks[BLOCK_KEYS].itertuples(index=False, name=None))}
+        new_keys = [key for key in groups if key not in positions]
+        new_blocks = pd.DataFrame(new_keys, columns=BLOCK_KEYS)
+        new_blocks['month_start'] = pd.to_datetime(
+            {'year': new_blocks['year'], 'month': new_blocks['month'], 'day': 1})
+        stats.blocks = pd.concat([self.blocks, new_blocks], ignore_index=True)
+        stats.stats = np.concatenate(
+            [self.stats, np.zeros((4, len(new_keys)) + self.stats.shape[2:])], axis=1)
+        positions.update(zip(new_keys, range(len(self.blocks), len(stats.blocks))))
+        for b, key in enumerate(groups):
+            stats.stats[:, positions[key]] += update[:, b]
+        return stats
+
+    def _row_stats(self, positions):
+        values = self.df[self.columns].iloc[positions].to_numpy(dtype='float64')
+        return np.stack(sufficient_stats(values - self.offsets))
+
+    def correlation(self, selection=None, columns=None):
+        """
+        Menghitung matriks korelasi untuk data yang lolos filter.
+
+        Parameters:
+        - selection (FilterSelection): Pilihan filter. None berarti seluruh data.
+        - columns (list): Kolom yang dikorelasikan. Default semua kolom statistik.
+
+        Returns:
+        - pd.DataFrame: Matriks korelasi, setara dengan df[columns].corr() pada data terfilter.
+        """
+        columns = list(columns or self.columns)
+        idx = [self.columns.index(col) for col in columns]
+
+        blocks = self.blocks
+        keep = np.ones(len(blocks), dtype=bool)
+        partial_positions = np.empty(0, dtype=np.int64)
+        if selection is not None:
+            for col, selected in (('station', selection.stations),
+                                  ('year', selection.years),
+                                  ('season', selection.seasons)):
+                if selected:
+                    keep &= blocks[col].isin(selected).to_numpy()
+
+            # Bulan yang tercakup penuh oleh rentang waktu: [first_full, last_full)
+            start = pd.Timestamp(selection.start) if selection.start is not None else None
+            end = pd.Timestamp(selection.end) if selection.end is not None else None
+            month_start = blocks['month_start']
+            if start is not None:
+                first_full = start.to_period('M').to_timestamp()
+                if first_full < start:
+                    first_full += pd.offsets.MonthBegin(1)
+                keep &= (month_start >= first_full).to_numpy()
+            if end is not None:
+                last_full = (end + pd.Timedelta(1, 'ns')).to_period('M').to_timestamp()
+                keep &= (month_start < last_full).to_numpy()
+
+            # Baris pada bulan yang terpotong dihitung langsung dari data per jam
+            if start is not None or end is not None:
+                positions = get_filter_index(self.df).query(selection).positions
+                times = self.df['datetime'].to_numpy()[positions]
+                lo = np.searchsorted(times, np.datetime64(first_full), 'left') if start is not None else 0
+                hi = np.searchsorted(times, np.datetime64(last_full), 'left') if end is not None else len(times)
+                if hi < lo:
+                    lo = hi = len(times)
+                partial_positions = np.concatenate([positions[:lo], positions[hi:]])
+
+        totals = self.stats[:, keep].sum(axis=1)
+        if len(partial_positions):
+            totals = totals + self._row_stats(partial_positions)
+        totals = totals[:, idx][:, :, idx]
+        corr = correlation_from_stats(*totals)
+        return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def get_correlation_stats(df):
+    """
+    Mengambil statistik korelasi per blok, membangunnya sekali per versi dataset.
+    """
+    return get_derived(df, 'correlation_stats', CorrelationStats)
+
+
+register_extender('correlation_stats', lambda stats, df, offset: stats.extended(df, offset))
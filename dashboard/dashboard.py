@@ -1,200 +1,386 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import streamlit as st
-import numpy as np
-from plot import process_data, plot_pm_variation_combined, plot_weather_pollution_correlation, plot_pollutant_correlation, plot_station_pollutant_avg, display_filtered_dataframe, plot_monthly_pollutant_trends, plot_station_temperature_stats, plot_highest_rainfall_station
-
-# Mengatur konfigurasi halaman sebelum elemen lain
-st.set_page_config(
-    page_title="Dashboard Kualitas Udara",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Mengatur gaya seaborn default
-sns.set(style='darkgrid')
-
-
-def main():
-    """
-    Fungsi utama untuk menjalankan aplikasi Streamlit.
-    """
-    st.title("Dashboard Kualitas Udara")
-
-    # Sidebar untuk pengaturan plot
-    st.sidebar.header("Pengaturan Plot")
-
-    # Pilih gaya seaborn
-    style = st.sidebar.selectbox(
-        'Pilih Gaya Seaborn',
-        ('darkgrid', 'whitegrid', 'dark', 'white', 'ticks')
-    )
-
-    # Pilih context seaborn
-    context = st.sidebar.selectbox(
-        'Pilih Context Seaborn',
-        ('paper', 'notebook', 'talk', 'poster')
-    )
-    sns.set_context(context)
-
-    # Pilih palet warna seaborn
-    palette = st.sidebar.selectbox(
-        'Pilih Palet Warna Seaborn',
-        ('deep', 'muted', 'bright', 'pastel', 'dark', 'colorblind')
-    )
-
-    # Path ke file CSV
-    file_path = 'https://raw.githubusercontent.com/paizramadhan/analisis-data-dicoding/refs/heads/main/dashboard/combined_data.csv'
-
-    # Memuat dan memproses data
-    combined_df = process_data(file_path)
-
-    st.subheader("Overview")
-    st.write("This dashboard contains a bunch of analysis result of an air quality dataset provided by Dicoding Academy. The dataset itself includes information about various air pollutants such as SO2, NO2, CO, O3, as well as temperature, pressure, rain, wind direction, and wind speed.")
-
-    # Menampilkan DataFrame yang telah diproses
-    st.subheader("Data Kualitas Udara")
-    st.write(
-        "Berikut adalah data yang saya gunakan, data tersebut berasal dari [GitHub Repository](https://github.com/marceloreis/HTI/tree/master).")
-    display_filtered_dataframe(combined_df)
-
-    # Menambahkan Pertanyaan Bisnis
-    st.subheader('Pertanyaan Bisnis')
-    st.write("1. Bagaimana kualitas udara (khususnya tingkat PM2.5 dan PM10) bervariasi pada waktu yang berbeda sepanjang tahun di Changping dan Aotizhongxin?")
-    st.write("2. Apa korelasi antara kondisi cuaca (misalnya, suhu, kecepatan angin, dan tekanan) dan tingkat polusi di wilayah ini?")
-    st.write(
-        "3. Apakah ada korelasi antara berbagai polutan udara (SO2, NO2, CO, O3)?")
-    st.write("4. Bagaimana konsentrasi polutan udara di berbagai lokasi stasiun?")
-    st.write(
-        "5. Apakah ada tren atau pola yang terlihat pada tingkat polutan sepanjang tahun?")
-    st.write("6. Pada stasiun mana suhu mencapai derajat terendah dan tertingginya?")
-    st.write("7. Pada stasiun mana curah hujan mencapai volume tertingginya?")
-
-    # Membuat Tabs untuk Memisahkan Plot
-    tabs = st.tabs(["Pertanyaan Bisnis No.1",
-                   "Pertanyaan Bisnis No.2", "Pertanyaan Bisnis No.3", "Pertanyaan Bisnis No.4", "Pertanyaan Bisnis No.5", "Pertanyaan Bisnis No.6", "Pertanyaan Bisnis No.7", "Kesimpulan"])
-
-    # Tab untuk Pertanyaan Bisnis No.1
-    with tabs[0]:
-        # Menampilkan grafik PM2.5 dengan container dan expander
-        with st.container():
-            st.subheader("Tren Rata-rata Bulanan PM2.5 dan PM10")
-            plot_pm_variation_combined(combined_df, style, palette)
-            with st.expander("Penjelasan Tren Rata-rata Bulanan PM2.5 dan PM10"):
-                st.write("""
-                    - Musim Dingin (Desember - Februari): Baik PM2.5 maupun PM10 meningkat signifikan, menunjukkan kualitas udara yang memburuk. Hal ini dapat meningkatkan risiko kesehatan, terutama bagi individu yang rentan terhadap penyakit pernapasan.
-                    - Musim Panas (Juni - Agustus): Kualitas udara relatif lebih baik dengan tingkat PM2.5 dan PM10 yang lebih rendah, meskipun Aotizhongxin tetap menunjukkan polusi yang lebih tinggi dibandingkan Changping.
-                        """)
-
-    # Tab untuk Pertanyaan Bisnis No.2
-    with tabs[1]:
-        # Menampilkan grafik Korelasi antara Cuaca dan Polusi dengan container dan expander
-        with st.container():
-            st.subheader(
-                "Korelasi Kondisi Cuaca dan Tingkat Polusi")
-            # Menambahkan label bahwa ini adalah jawaban untuk pertanyaan bisnis No.2
-            # st.markdown("**Menjawab Pertanyaan Bisnis No.2**")
-            plot_weather_pollution_correlation(combined_df, style, palette)
-            with st.expander("Penjelasan Correlation Heatmap"):
-                st.write("""
-                        - Aotizhongxin cenderung memiliki konsentrasi PM2.5 dan PM10 yang lebih tinggi dibandingkan Changping, terlihat dari distribusi yang lebih lebar pada scatter plot.
-                        - Suhu (TEMP) dan kecepatan angin (WSPM) memiliki dampak signifikan terhadap tingkat polusi, di mana suhu rendah dan kecepatan angin rendah meningkatkan konsentrasi polusi.
-                        - Tekanan udara (PRES) tidak menunjukkan hubungan yang signifikan dengan polusi
-                        """)
-
-    # Tab untuk Pertanyaan Bisnis No.3
-    with tabs[2]:
-        with st.container():
-            st.subheader("Korelasi Antar Polutan Udara")
-            plot_pollutant_correlation(combined_df, style, palette)
-            with st.expander("Penjelasan Korelasi Antar Polutan"):
-                st.write("""
-                        - Polutan Primer:
-                            - NO2 dan CO menunjukkan hubungan yang kuat, menunjukkan bahwa keduanya berasal dari sumber utama yang sama, seperti emisi kendaraan.
-                            - SO2 memiliki korelasi moderat dengan NO2 dan CO, mencerminkan kontribusi dari pembakaran bahan bakar fosil.
-
-                        - Polutan Sekunder (O3):
-                            - Ozon (O3) memiliki hubungan negatif dengan NO2 dan CO, yang dapat dijelaskan oleh reaksi fotokimia di atmosfer. Ozon terbentuk ketika VOCs (volatile organic compounds) dan NOx bereaksi di bawah sinar matahari, sehingga konsentrasi tinggi NO2 dapat mengurangi ozon di lokasi tertentu.
-                        """)
-
-    # Tab untuk Pertanyaan Bisnis No.4
-    with tabs[3]:
-        with st.container():
-            st.subheader("Rata-rata Konsentrasi Polutan per Stasiun")
-            pollutants = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
-            plot_station_pollutant_avg(combined_df, pollutants, style, palette)
-            with st.expander("Penjelasan Konsentrasi Polutan Udara per Stasiun"):
-                st.write("""
-                            - Aotizhongxin secara konsisten memiliki konsentrasi rata-rata polutan udara (PM2.5, PM10, SO2, NO2, CO) yang lebih tinggi dibandingkan Changping.
-                                - Hal ini menunjukkan kualitas udara yang lebih buruk di Aotizhongxin, kemungkinan besar karena aktivitas manusia seperti industri dan transportasi.
-                            - Konsentrasi O3 di kedua stasiun relatif sama, menunjukkan pola distribusi yang lebih dipengaruhi oleh proses atmosferik
-                        """)
-
-    with tabs[4]:
-        with st.container():
-            pollutants = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
-            plot_monthly_pollutant_trends(
-                combined_df, pollutants, style, palette)
-            with st.expander("Penjelasan Rata-rata Bulanan Polutan Udara Sepanjang Tahun"):
-                st.write("""
-                        - Tren Musiman:
-                            - CO, PM2.5, PM10, SO2, dan NO2 menunjukkan peningkatan selama musim dingin karena aktivitas manusia yang lebih intensif dan kondisi atmosfer yang menahan polutan.
-                            - Ozon (O3) lebih tinggi selama musim panas karena pembentukan fotokimia yang dipengaruhi oleh sinar matahari.
-
-                        - Polusi Puncak:
-                            - Musim dingin menunjukkan tingkat polusi udara yang lebih tinggi untuk sebagian besar polutan primer, menandakan kualitas udara yang buruk selama periode ini.
-                        """)
-
-    with tabs[5]:
-        with st.container():
-            plot_station_temperature_stats(combined_df, style, palette)
-            with st.expander("Penjelasan Statistik Suhu Stasiun"):
-                st.write("""
-                            - Suhu Tertinggi: Dicapai di kedua stasiun, yaitu 40°C, selama musim panas.
-                            - Suhu Terendah: Dicapai di kedua stasiun, yaitu -10°C, selama musim dingin.
-                            - Variasi Musiman: Kedua lokasi menunjukkan perbedaan suhu yang signifikan antara musim panas dan musim dingin, dengan rentang suhu sekitar 50°C.
-                        """)
-
-    with tabs[6]:
-        with st.container():
-            plot_highest_rainfall_station(combined_df, style, palette)
-            with st.expander("Penjelasan Curah Hujan Tertinggi Per Stasiun"):
-                st.write("""
-                            - Curah hujan tertinggi terjadi di stasiun Aotizhongxin, menjadikannya wilayah dengan curah hujan yang lebih intens dibandingkan Changping.
-                            - Perbedaan curah hujan antara kedua stasiun dapat disebabkan oleh faktor geografis, topografi, atau pola iklim lokal.
-                        """)
-
-    with tabs[7]:
-        st.subheader("Kesimpulan")
-        st.write("""
-                    1. Variasi Kualitas Udara:
-                        - PM2.5 dan PM10 menunjukkan pola musiman dengan peningkatan konsentrasi selama musim dingin (Desember-Februari) akibat inversi suhu dan aktivitas manusia.
-                        - Aotizhongxin memiliki konsentrasi polusi yang lebih tinggi dibandingkan Changping.
-                    
-                    2. Korelasi Cuaca dan Polusi:
-                        - Suhu (TEMP) memiliki korelasi negatif dengan PM2.5 dan PM10, menunjukkan polusi lebih tinggi pada suhu rendah.
-                        - Kecepatan angin (WSPM) berpengaruh signifikan dalam menyebarkan polutan, dengan korelasi negatif terhadap PM2.5 dan PM10.
-                        - Tekanan udara (PRES) tidak memiliki hubungan signifikan dengan tingkat polusi.
-                    
-                    3. Korelasi Antar Polutan:
-                        - NO2 dan CO memiliki korelasi kuat positif, menunjukkan sumber emisi yang sama seperti kendaraan bermotor.
-                          Ozon (O3) memiliki korelasi negatif dengan NO2 dan CO, menunjukkan proses fotokimia yang berlawanan dengan polutan primer.
-                    
-                    4. Konsentrasi Polutan per Stasiun:
-                        - Aotizhongxin secara konsisten mencatat konsentrasi PM2.5, PM10, SO2, NO2, dan CO yang lebih tinggi dibandingkan Changping, menunjukkan kualitas udara yang lebih buruk di stasiun ini.
-                    
-                    5. Tren Polusi Sepanjang Tahun:
-                        - CO, PM2.5, PM10, SO2, dan NO2 meningkat selama musim dingin akibat aktivitas manusia dan inversi suhu.
-                        - Ozon (O3) lebih tinggi selama musim panas, terbentuk melalui reaksi fotokimia di bawah sinar matahari.
-                    
-                    6. Suhu Ekstrem:
-                        - Suhu tertinggi (40°C) dan terendah (-10°C) tercatat di kedua stasiun, menunjukkan variasi musiman yang ekstrem di wilayah ini.
-                    
-                    7. Curah Hujan Tertinggi:
-                        - Aotizhongxin mencatat curah hujan tertinggi (70 mm), lebih tinggi dibandingkan Changping (50 mm), menunjukkan intensitas hujan yang lebih besar di wilayah ini.
-                """)
-
-
-if __name__ == '__main__':
-    main()
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+import streamlit as st
+import numpy as np
+from aqi import EXCEEDANCE_LIMITS, ROLLING_WINDOWS
+from column_store import memory_usage
+from data_loader import DEFAULT_DATA_URL, clear_dataset_cache, is_offline
+from figure_cache import figure_cache
+from profiling import PROFILE_MEMORY, profile_run, set_memory_tracing, summary
+from schema import POLLUTANT_COLUMNS
+from timeseries import FREQUENCIES, FREQUENCY_LABELS
+from plot import process_data, plot_pm_variation_combined, plot_weather_pollution_correlation, plot_pollutant_correlation, plot_station_pollutant_avg, display_filtered_dataframe, plot_pollutant_trends, plot_station_temperature_stats, plot_highest_rainfall_station, plot_aqi_overview, display_exceedances, plot_wind_rose, plot_seasonal_analysis, display_pollution_episodes
+
+# Mengatur konfigurasi halaman sebelum elemen lain
+st.set_page_config(
+    page_title="Dashboard Kualitas Udara",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+
+def render_question_1(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.1: variasi PM2.5 dan PM10 sepanjang tahun.
+    """
+    # Menampilkan grafik PM2.5 dengan container dan expander
+    with st.container():
+        st.subheader("Tren Rata-rata Bulanan PM2.5 dan PM10")
+        plot_pm_variation_combined(dataset, style, palette, context=context)
+        with st.expander("Penjelasan Tren Rata-rata Bulanan PM2.5 dan PM10"):
+            st.write("""
+                - Musim Dingin (Desember - Februari): Baik PM2.5 maupun PM10 meningkat signifikan, menunjukkan kualitas udara yang memburuk. Hal ini dapat meningkatkan risiko kesehatan, terutama bagi individu yang rentan terhadap penyakit pernapasan.
+                - Musim Panas (Juni - Agustus): Kualitas udara relatif lebih baik dengan tingkat PM2.5 dan PM10 yang lebih rendah, meskipun Aotizhongxin tetap menunjukkan polusi yang lebih tinggi dibandingkan Changping.
+                    """)
+
+
+def render_question_2(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.2: korelasi kondisi cuaca dan tingkat polusi.
+    """
+    # Menampilkan grafik Korelasi antara Cuaca dan Polusi dengan container dan expander
+    with st.container():
+        st.subheader(
+            "Korelasi Kondisi Cuaca dan Tingkat Polusi")
+        # Menambahkan label bahwa ini adalah jawaban untuk pertanyaan bisnis No.2
+        # st.markdown("**Menjawab Pertanyaan Bisnis No.2**")
+        render_mode = st.radio(
+            'Mode Scatter Plot',
+            ('auto', 'density', 'sample', 'scatter'),
+            horizontal=True,
+            help="'density' menggambar histogram 2D per stasiun, 'sample' memakai sampel berstrata, 'scatter' menggambar semua titik. 'auto' memilih scatter untuk data kecil, sample untuk data sedang dan density untuk data besar."
+        )
+        plot_weather_pollution_correlation(
+            dataset, style, palette, render_mode, selection=selection, context=context)
+        with st.expander("Penjelasan Correlation Heatmap"):
+            st.write("""
+                    - Aotizhongxin cenderung memiliki konsentrasi PM2.5 dan PM10 yang lebih tinggi dibandingkan Changping, terlihat dari distribusi yang lebih lebar pada scatter plot.
+                    - Suhu (TEMP) dan kecepatan angin (WSPM) memiliki dampak signifikan terhadap tingkat polusi, di mana suhu rendah dan kecepatan angin rendah meningkatkan konsentrasi polusi.
+                    - Tekanan udara (PRES) tidak menunjukkan hubungan yang signifikan dengan polusi
+                    """)
+
+
+def render_question_3(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.3: korelasi antar polutan udara.
+    """
+    with st.container():
+        st.subheader("Korelasi Antar Polutan Udara")
+        plot_pollutant_correlation(dataset, style, palette, selection, context=context)
+        with st.expander("Penjelasan Korelasi Antar Polutan"):
+            st.write("""
+                    - Polutan Primer:
+                        - NO2 dan CO menunjukkan hubungan yang kuat, menunjukkan bahwa keduanya berasal dari sumber utama yang sama, seperti emisi kendaraan.
+                        - SO2 memiliki korelasi moderat dengan NO2 dan CO, mencerminkan kontribusi dari pembakaran bahan bakar fosil.
+
+                    - Polutan Sekunder (O3):
+                        - Ozon (O3) memiliki hubungan negatif dengan NO2 dan CO, yang dapat dijelaskan oleh reaksi fotokimia di atmosfer. Ozon terbentuk ketika VOCs (volatile organic compounds) dan NOx bereaksi di bawah sinar matahari, sehingga konsentrasi tinggi NO2 dapat mengurangi ozon di lokasi tertentu.
+                    """)
+
+
+def render_question_4(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.4: konsentrasi polutan per stasiun.
+    """
+    with st.container():
+        st.subheader("Rata-rata Konsentrasi Polutan per Stasiun")
+        pollutants = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
+        plot_station_pollutant_avg(dataset, pollutants, style, palette, context=context)
+        with st.expander("Penjelasan Konsentrasi Polutan Udara per Stasiun"):
+            st.write("""
+                        - Aotizhongxin secara konsisten memiliki konsentrasi rata-rata polutan udara (PM2.5, PM10, SO2, NO2, CO) yang lebih tinggi dibandingkan Changping.
+                            - Hal ini menunjukkan kualitas udara yang lebih buruk di Aotizhongxin, kemungkinan besar karena aktivitas manusia seperti industri dan transportasi.
+                        - Konsentrasi O3 di kedua stasiun relatif sama, menunjukkan pola distribusi yang lebih dipengaruhi oleh proses atmosferik
+                    """)
+
+
+def render_question_5(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.5: tren polutan sepanjang tahun.
+    """
+    with st.container():
+        pollutants = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
+        frequency = st.radio(
+            'Resolusi Waktu', FREQUENCIES, index=FREQUENCIES.index('monthly'),
+            format_func=FREQUENCY_LABELS.get, horizontal=True, key='trend_frequency',
+            help='Rentang waktu dan stasiun mengikuti filter DataFrame. Persempit rentang waktu untuk melihat detail per jam.')
+        plot_pollutant_trends(
+            dataset, pollutants, style, palette, frequency, selection, context=context)
+        with st.expander("Penjelasan Rata-rata Bulanan Polutan Udara Sepanjang Tahun"):
+            st.write("""
+                    - Tren Musiman:
+                        - CO, PM2.5, PM10, SO2, dan NO2 menunjukkan peningkatan selama musim dingin karena aktivitas manusia yang lebih intensif dan kondisi atmosfer yang menahan polutan.
+                        - Ozon (O3) lebih tinggi selama musim panas karena pembentukan fotokimia yang dipengaruhi oleh sinar matahari.
+
+                    - Polusi Puncak:
+                        - Musim dingin menunjukkan tingkat polusi udara yang lebih tinggi untuk sebagian besar polutan primer, menandakan kualitas udara yang buruk selama periode ini.
+                    """)
+
+
+def render_question_6(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.6: suhu terendah dan tertinggi per stasiun.
+    """
+    with st.container():
+        plot_station_temperature_stats(dataset, style, palette, selection, context=context)
+        with st.expander("Penjelasan Statistik Suhu Stasiun"):
+            st.write("""
+                        - Suhu Tertinggi: Dicapai di kedua stasiun, yaitu 40°C, selama musim panas.
+                        - Suhu Terendah: Dicapai di kedua stasiun, yaitu -10°C, selama musim dingin.
+                        - Variasi Musiman: Kedua lokasi menunjukkan perbedaan suhu yang signifikan antara musim panas dan musim dingin, dengan rentang suhu sekitar 50°C.
+                    """)
+
+
+def render_question_7(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Pertanyaan Bisnis No.7: curah hujan tertinggi per stasiun.
+    """
+    with st.container():
+        plot_highest_rainfall_station(dataset, style, palette, selection, context=context)
+        with st.expander("Penjelasan Curah Hujan Tertinggi Per Stasiun"):
+            st.write("""
+                        - Curah hujan tertinggi terjadi di stasiun Aotizhongxin, menjadikannya wilayah dengan curah hujan yang lebih intens dibandingkan Changping.
+                        - Perbedaan curah hujan antara kedua stasiun dapat disebabkan oleh faktor geografis, topografi, atau pola iklim lokal.
+                    """)
+
+
+def render_aqi(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab AQI: kategori AQI per stasiun dan jam di atas ambang batas.
+    """
+    with st.container():
+        plot_aqi_overview(dataset, style, palette, selection, context=context)
+
+        st.subheader("Jam di Atas Ambang Batas")
+        col_pollutant, col_threshold = st.columns(2)
+        pollutant = col_pollutant.selectbox('Polutan', list(ROLLING_WINDOWS), key='aqi_pollutant')
+        threshold = col_threshold.number_input(
+            f'Ambang batas rata-rata {ROLLING_WINDOWS[pollutant]} jam (µg/m³)',
+            min_value=0.0, value=float(EXCEEDANCE_LIMITS[pollutant]), key=f'aqi_threshold_{pollutant}',
+            help='Default mengikuti baku mutu harian GB 3095-2012 kelas II.')
+        display_exceedances(dataset, pollutant, threshold, selection)
+        with st.expander("Penjelasan AQI"):
+            st.write("""
+                    - AQI dihitung per jam dari rata-rata bergerak 24 jam (PM2.5, PM10, SO2, NO2, CO) dan 8 jam (O3) mengikuti HJ 633-2012.
+                    - Nilai AQI adalah sub-indeks terbesar di antara polutan, dan polutan dengan sub-indeks terbesar disebut polutan utama.
+                    - Kategori: 0-50 Sangat Baik, 51-100 Baik, 101-150 Tercemar Ringan, 151-200 Tercemar Sedang, 201-300 Tercemar Berat, di atas 300 Tercemar Parah.
+                    """)
+
+
+def render_wind_rose(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Arah Angin: wind rose dan rata-rata polutan per arah angin.
+    """
+    with st.container():
+        pollutant = st.selectbox('Polutan', POLLUTANT_COLUMNS, key='wind_pollutant')
+        plot_wind_rose(dataset, pollutant, style, palette, selection, context=context)
+        with st.expander("Penjelasan Arah Angin"):
+            st.write("""
+                    - Baris atas menunjukkan persentase jam angin bertiup dari setiap arah, ditumpuk menurut kelas kecepatan angin (WSPM).
+                    - Baris bawah menunjukkan rata-rata polutan untuk setiap arah dan kelas kecepatan; kelas kecepatan naik dari pusat ke arah luar.
+                    - Arah dengan rata-rata polutan tinggi pada kecepatan rendah menunjukkan sumber polusi lokal, sedangkan nilai tinggi pada kecepatan tinggi menunjukkan polusi yang terbawa angin dari wilayah lain.
+                    """)
+
+
+def render_conclusion(dataset, style, palette, selection, context='notebook'):
+    """
+    Menampilkan isi tab Kesimpulan dari seluruh pertanyaan bisnis.
+    """
+    st.subheader("Kesimpulan")
+    st.write("""
+                1. Variasi Kualitas Udara:
+                    - PM2.5 dan PM10 menunjukkan pola musiman dengan peningkatan konsentrasi selama musim dingin (Desember-Februari) akibat inversi suhu dan aktivitas manusia.
+                    - Aotizhongxin memiliki konsentrasi polusi yang lebih tinggi dibandingkan Changping.
+                
+                2. Korelasi Cuaca dan Polusi:
+                    - Suhu (TEMP) memiliki korelasi negatif dengan PM2.5 dan PM10, menunjukkan polusi lebih tinggi pada suhu rendah.
+                    - Kecepatan angin (WSPM) berpengaruh signifikan dalam menyebarkan polutan, dengan korelasi negatif terhadap PM2.5 dan PM10.
+                    - Tekanan udara (PRES) tidak memiliki hubungan signifikan dengan tingkat polusi.
+                
+                3. Korelasi Antar Polutan:
+                    - NO2 dan CO memiliki korelasi kuat positif, menunjukkan sumber emisi yang sama seperti kendaraan bermotor.
+                      Ozon (O3) memiliki korelasi negatif dengan NO2 dan CO, menunjukkan proses fotokimia yang berlawanan dengan polutan primer.
+                
+                4. Konsentrasi Polutan per Stasiun:
+                    - Aotizhongxin secara konsisten mencatat konsentrasi PM2.5, PM10, SO2, NO2, dan CO yang lebih tinggi dibandingkan Changping, menunjukkan kualitas udara yang lebih buruk di stasiun ini.
+                
+                5. Tren Polusi Sepanjang Tahun:
+                    - CO, PM2.5, PM10, SO2, dan NO2 meningkat selama musim dingin akibat aktivitas manusia dan inversi suhu.
+                    - Ozon (O3) lebih tinggi selama musim panas, terbentuk melalui reaksi fotokimia di bawah sinar matahari.
+                
+                6. Suhu Ekstrem:
+                    - Suhu tertinggi (40°C) dan terendah (-10°C) tercatat di kedua stasiun, menunjukkan variasi musiman yang ekstrem di wilayah ini.
+                
+                7. Curah Hujan Tertinggi:
+                    - Aotizhongxin mencatat curah hujan tertinggi (70 mm), lebih tinggi dibandingkan Changping (50 mm), menunjukkan intensitas hujan yang lebih besar di wilayah ini.
+            """)
+
+    # Pola musiman dan episode dihitung dari data, bukan teks tetap di atas
+    with st.container():
+        plot_seasonal_analysis(dataset, POLLUTANT_COLUMNS, style, palette, context=context)
+        pollutant = st.selectbox('Polutan untuk episode polusi', POLLUTANT_COLUMNS, key='episode_pollutant')
+        display_pollution_episodes(dataset, pollutant)
+        with st.expander("Penjelasan Pola Musiman"):
+            st.write("""
+                    - Setiap deret rata-rata harian stasiun × polutan didekomposisi menjadi tren (rata-rata bergerak 365 hari), komponen musiman tahunan (rata-rata per hari dalam setahun setelah tren dihapus) dan residual.
+                    - Amplitudo adalah selisih puncak dan titik terendah komponen musiman; bulan puncak dan terendah ditulis di atas gambar.
+                    - Episode polusi adalah hari berurutan dengan skor z robust residual (median dan MAD) di atas 3,5, yaitu konsentrasi yang jauh lebih tinggi daripada yang dijelaskan tren dan musimnya.
+                    """)
+
+# Urutan tab beserta fungsi yang mengisi masing-masing tab
+TABS = {
+    "Pertanyaan Bisnis No.1": render_question_1,
+    "Pertanyaan Bisnis No.2": render_question_2,
+    "Pertanyaan Bisnis No.3": render_question_3,
+    "Pertanyaan Bisnis No.4": render_question_4,
+    "Pertanyaan Bisnis No.5": render_question_5,
+    "Pertanyaan Bisnis No.6": render_question_6,
+    "Pertanyaan Bisnis No.7": render_question_7,
+    "AQI & Ambang Batas": render_aqi,
+    "Arah Angin": render_wind_rose,
+    "Kesimpulan": render_conclusion,
+}
+
+
+@st.fragment
+def render_selected_tab(dataset, style, palette, selection, context):
+    """
+    Menampilkan hanya tab yang sedang dipilih.
+
+    Fungsi ini berjalan sebagai fragment sehingga berpindah tab atau mengubah
+    kontrol di dalam tab hanya menjalankan ulang fragment ini, bukan seluruh
+    halaman, dan tab lain tidak dihitung maupun digambar.
+    """
+    # Saat fragment dijalankan ulang sendiri, catatan profilnya menjadi rerun terpisah
+    with profile_run('fragment'):
+        selected_tab = st.radio(
+            'Pilih Tab', list(TABS), horizontal=True,
+            key='selected_tab', label_visibility='collapsed')
+        TABS[selected_tab](dataset, style, palette, selection, context)
+
+
+def main():
+    """
+    Fungsi utama untuk menjalankan aplikasi Streamlit.
+    """
+    st.title("Dashboard Kualitas Udara")
+
+    # Sidebar untuk pengaturan plot
+    st.sidebar.header("Pengaturan Plot")
+
+    # Pilih gaya seaborn
+    style = st.sidebar.selectbox(
+        'Pilih Gaya Seaborn',
+        ('darkgrid', 'whitegrid', 'dark', 'white', 'ticks')
+    )
+
+    # Pilih context seaborn
+    context = st.sidebar.selectbox(
+        'Pilih Context Seaborn',
+        ('paper', 'notebook', 'talk', 'poster')
+    )
+
+    # Pilih palet warna seaborn
+    palette = st.sidebar.selectbox(
+        'Pilih Palet Warna Seaborn',
+        ('deep', 'muted', 'bright', 'pastel', 'dark', 'colorblind')
+    )
+
+    # Pengaturan sumber data
+    st.sidebar.header("Pengaturan Data")
+    offline = st.sidebar.checkbox(
+        'Mode Offline (gunakan snapshot lokal)', value=is_offline())
+    refresh = st.sidebar.button('Muat Ulang Data', disabled=offline)
+    if refresh:
+        clear_dataset_cache()
+
+    # Path ke file CSV
+    file_path = DEFAULT_DATA_URL
+
+    # Memuat dan memproses data (diunduh sekali, lalu dibaca dari cache lokal)
+    dataset = process_data(file_path, offline=offline, refresh=refresh)
+
+    st.subheader("Overview")
+    st.write("This dashboard contains a bunch of analysis result of an air quality dataset provided by Dicoding Academy. The dataset itself includes information about various air pollutants such as SO2, NO2, CO, O3, as well as temperature, pressure, rain, wind direction, and wind speed.")
+
+    # Menampilkan DataFrame yang telah diproses
+    st.subheader("Data Kualitas Udara")
+    st.write(
+        "Berikut adalah data yang saya gunakan, data tersebut berasal dari [GitHub Repository](https://github.com/marceloreis/HTI/tree/master).")
+    selection = display_filtered_dataframe(dataset)
+
+    # Menambahkan Pertanyaan Bisnis
+    st.subheader('Pertanyaan Bisnis')
+    st.write("1. Bagaimana kualitas udara (khususnya tingkat PM2.5 dan PM10) bervariasi pada waktu yang berbeda sepanjang tahun di Changping dan Aotizhongxin?")
+    st.write("2. Apa korelasi antara kondisi cuaca (misalnya, suhu, kecepatan angin, dan tekanan) dan tingkat polusi di wilayah ini?")
+    st.write(
+        "3. Apakah ada korelasi antara berbagai polutan udara (SO2, NO2, CO, O3)?")
+    st.write("4. Bagaimana konsentrasi polutan udara di berbagai lokasi stasiun?")
+    st.write(
+        "5. Apakah ada tren atau pola yang terlihat pada tingkat polutan sepanjang tahun?")
+    st.write("6. Pada stasiun mana suhu mencapai derajat terendah dan tertingginya?")
+    st.write("7. Pada stasiun mana curah hujan mencapai volume tertingginya?")
+
+    # Membuat Tabs untuk Memisahkan Plot
+    lazy_tabs = st.sidebar.checkbox(
+        'Render Tab Secara Lazy', value=True,
+        help='Hanya tab yang sedang dibuka yang dihitung dan digambar.')
+    if lazy_tabs:
+        render_selected_tab(dataset, style, palette, selection, context)
+    else:
+        tabs = st.tabs(list(TABS))
+        for tab, render_tab in zip(tabs, TABS.values()):
+            with tab:
+                render_tab(dataset, style, palette, selection, context)
+
+    # Statistik cache gambar (diisi di akhir agar mencakup rerun saat ini)
+    with st.sidebar.expander("Statistik Cache Gambar"):
+        cache_stats = figure_cache.stats()
+        st.write(f"Hit: {cache_stats['hits']} | Miss: {cache_stats['misses']}")
+        st.write(
+            f"Entri: {cache_stats['entries']} | Ukuran: {cache_stats['bytes'] / 1e6:.1f} / {cache_stats['max_bytes'] / 1e6:.0f} MB")
+        st.write(f"Eviction: {cache_stats['evictions']}")
+        if st.button('Kosongkan Cache Gambar'):
+            figure_cache.clear()
+
+    # Memori dataset: kolom memory-mapped dipakai bersama oleh semua sesi dan proses
+    with st.sidebar.expander("Memori Dataset"):
+        usage = memory_usage(dataset.frame)
+        st.write(f"Bersama (memory-map): {usage['mapped'] / 1e6:.1f} MB")
+        st.write(f"Di memori proses: {usage['heap'] / 1e6:.1f} MB")
+
+
+def render_diagnostics_panel(run):
+    """
+    Menampilkan panel diagnostik di sidebar: waktu, jumlah baris dan memori per
+    pemanggilan pada rerun saat ini, serta ringkasan semua sesi.
+
+    Parameters:
+    - run (profiling.ProfileRun): Catatan profil rerun saat ini.
+    """
+    with st.sidebar.expander("Diagnostik"):
+        show = st.checkbox('Tampilkan Panel Diagnostik', key='show_diagnostics')
+        st.caption('Profil memori (tracemalloc): ' + ('aktif' if PROFILE_MEMORY else
+                   'nonaktif, set AIR_QUALITY_PROFILE_MEMORY=1 saat menjalankan server'))
+        if not show:
+            return
+
+        records = run.frame()
+        top_level = sum(r['wall_s'] for r in run.records if r['depth'] == 0)
+        st.write(f"Rerun ini: {len(records)} pemanggilan, {top_level:.2f} detik")
+        st.dataframe(records, hide_index=True)
+
+        st.write("Semua sesi sejak server dimulai:")
+        totals = summary()
+        st.dataframe(totals)
+        st.download_button(
+            'Unduh Ringkasan (CSV)', totals.to_csv(), 'profil_dashboard.csv', 'text/csv')
+
+
+if __name__ == '__main__':
+    # tracemalloc berlaku untuk seluruh proses, jadi diatur per server, bukan per sesi
+    set_memory_tracing(PROFILE_MEMORY)
+    with profile_run('main') as run:
+        main()
+    render_diagnostics_panel(run)
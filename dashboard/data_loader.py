@@ -0,0 +1,470 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.request
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+from column_store import ColumnAppender, column_dir, has_columns, open_columns, read_only_frame, write_columns
+from ingest import read_station_dataset
+from profiling import profile_block
+from schema import apply_schema, read_csv_typed
+
+# Sumber data default untuk dashboard
+DEFAULT_DATA_URL = 'https://raw.githubusercontent.com/paizramadhan/analisis-data-dicoding/refs/heads/main/dashboard/combined_data.csv'
+
+# Direktori cache lokal (dapat diganti lewat environment variable)
+DEFAULT_CACHE_DIR = os.environ.get(
+    'AIR_QUALITY_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data_cache')
+)
+
+# Naikkan nilai ini jika cara parsing berubah agar snapshot lama tidak dipakai
+SNAPSHOT_VERSION = 2
+
+LoadResult = namedtuple(
+    'LoadResult', ['frame', 'fingerprint', 'invalid_rows', 'source'])
+
+# Jumlah struktur turunan (kubus agregat, indeks, dsb.) yang disimpan di memori
+MAX_DERIVED_ENTRIES = 16
+
+_frame_cache = {}
+_fingerprints = {}
+_derived_cache = OrderedDict()
+_extenders = {}
+_appenders = {}
+_cache_lock = threading.Lock()
+
+
+def is_offline():
+    """
+    Mengecek apakah mode offline diaktifkan lewat environment variable.
+
+    Returns:
+    - bool: True jika AIR_QUALITY_OFFLINE bernilai 1/true/yes.
+    """
+    return os.environ.get('AIR_QUALITY_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+
+def is_remote(source):
+    """
+    Mengecek apakah sumber data berupa URL HTTP(S).
+    """
+    return str(source).startswith(('http://', 'https://'))
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    Menghitung hash SHA-256 dari isi file secara bertahap.
+
+    Parameters:
+    - path (str): Path ke file.
+    - chunk_size (int): Ukuran potongan yang dibaca per iterasi.
+
+    Returns:
+    - str: Hash heksadesimal dari isi file.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def directory_sha256(directory):
+    """
+    Menghitung hash gabungan dari semua file Parquet di dataset terpartisi.
+
+    Parameters:
+    - directory (str): Direktori dataset hasil ingest.ingest_directory.
+
+    Returns:
+    - str: Hash heksadesimal yang berubah jika ada partisi yang berubah.
+    """
+    digest = hashlib.sha256()
+    for root, _, files in sorted(os.walk(directory)):
+        for name in sorted(files):
+            if name.endswith('.parquet'):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, directory).encode('utf-8'))
+                digest.update(file_sha256(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def _source_key(source):
+    return hashlib.sha256(str(source).encode('utf-8')).hexdigest()[:16]
+
+
+def _index_path(cache_dir):
+    return os.path.join(cache_dir, 'index.json')
+
+
+def _read_index(cache_dir):
+    try:
+        with open(_index_path(cache_dir), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_index(cache_dir, index):
+    # Menulis ke file sementara lalu rename agar index tidak pernah setengah jadi
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, _index_path(cache_dir))
+
+
+def _snapshot_path(cache_dir, fingerprint):
+    return os.path.join(cache_dir, f'{fingerprint}.parquet')
+
+
+def fetch_remote_csv(url, cache_dir=DEFAULT_CACHE_DIR, refresh=False, timeout=30):
+    """
+    Mengunduh file CSV remote satu kali dan menyimpannya di cache lokal.
+
+    Parameters:
+    - url (str): URL file CSV.
+    - cache_dir (str): Direktori cache lokal.
+    - refresh (bool): Paksa unduh ulang walaupun salinan lokal sudah ada.
+    - timeout (int): Batas waktu koneksi dalam detik.
+
+    Returns:
+    - str: Path ke salinan lokal file CSV.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    local_path = os.path.join(cache_dir, f'{_source_key(url)}.csv')
+    if os.path.exists(local_path) and not refresh:
+        return local_path
+
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.csv.part')
+    try:
+        with os.fdopen(fd, 'wb') as out, urllib.request.urlopen(url, timeout=timeout) as resp:
+            shutil.copyfileobj(resp, out)
+        os.replace(tmp_path, local_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        # Jaringan gagal: tetap gunakan salinan lama jika tersedia
+        if os.path.exists(local_path):
+            return local_path
+        raise
+    return local_path
+
+
+def parse_combined_csv(path):
+    """
+    Membaca file CSV gabungan dengan skema bertipe dan menyiapkan kolom 'datetime'.
+
+    Parameters:
+    - path (str): Path ke file CSV lokal.
+
+    Returns:
+    - tuple: (pd.DataFrame terurut berdasarkan datetime, jumlah baris datetime tidak valid)
+    """
+    df = read_csv_typed(path)
+    if 'datetime' not in df.columns:
+        raise KeyError("Kolom 'datetime' tidak ditemukan dalam dataset.")
+
+    df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
+    invalid_rows = int(df['datetime'].isna().sum())
+    if invalid_rows > 0:
+        df = df.dropna(subset=['datetime'])
+
+    df = df.sort_values(by='datetime', kind='stable').reset_index(drop=True)
+    return df, invalid_rows
+
+
+def _remember(fingerprint, df):
+    with _cache_lock:
+        _frame_cache[fingerprint] = df
+        _fingerprints[id(df)] = fingerprint
+
+
+def load_combined_data(source=DEFAULT_DATA_URL, cache_dir=DEFAULT_CACHE_DIR,
+                       offline=None, refresh=False):
+    """
+    Memuat dataset gabungan dengan strategi local-first.
+
+    File CSV hanya diunduh satu kali, lalu disimpan sebagai snapshot Parquet
+    yang dinamai berdasarkan hash isinya. DataFrame hasil parsing disimpan
+    di cache proses sehingga dipakai bersama oleh setiap rerun dan sesi.
+    Kolomnya juga ditulis sebagai file .npy dan dibuka lewat memory-map (lihat
+    column_store.py), sehingga beberapa proses server berbagi halaman memori yang
+    sama dan frame yang dikembalikan bersifat read-only. Kolom turunan dihitung
+    lewat get_derived, bukan ditambahkan ke frame ini.
+
+    Parameters:
+    - source (str): URL atau path lokal file CSV, atau direktori dataset Parquet
+      terpartisi per stasiun (hasil ingest.py).
+    - cache_dir (str): Direktori cache lokal.
+    - offline (bool): Baca snapshot terakhir tanpa akses jaringan. Default mengikuti
+      environment variable AIR_QUALITY_OFFLINE.
+    - refresh (bool): Unduh ulang sumber remote dan abaikan cache di memori.
+
+    Returns:
+    - LoadResult: (frame, fingerprint, invalid_rows, source)
+    """
+    if offline is None:
+        offline = is_offline()
+    os.makedirs(cache_dir, exist_ok=True)
+    index = _read_index(cache_dir)
+    key = _source_key(source)
+
+    if offline:
+        entry = index.get(key)
+        if entry is None or not os.path.exists(_snapshot_path(cache_dir, entry['fingerprint'])):
+            raise FileNotFoundError(
+                f"Snapshot offline untuk '{source}' belum tersedia. Jalankan sekali dalam mode online.")
+        fingerprint = entry['fingerprint']
+        invalid_rows = entry.get('invalid_rows', 0)
+    else:
+        with profile_block('load.hash_source'):
+            if os.path.isdir(source):
+                local_path = source
+                content_hash = directory_sha256(source)
+            else:
+                local_path = fetch_remote_csv(source, cache_dir, refresh) if is_remote(source) else source
+                content_hash = file_sha256(local_path)
+        fingerprint = f'{content_hash}-v{SNAPSHOT_VERSION}'
+        entry = index.get(key, {})
+        invalid_rows = entry.get('invalid_rows', 0) if entry.get('fingerprint') == fingerprint else None
+
+    with _cache_lock:
+        cached = _frame_cache.get(fingerprint)
+    if cached is not None and not refresh:
+        return LoadResult(cached, fingerprint, invalid_rows or 0, source)
+
+    snapshot = _snapshot_path(cache_dir, fingerprint)
+    columns = column_dir(cache_dir, fingerprint)
+    if has_columns(columns) and invalid_rows is not None:
+        # Kolom sudah ditulis oleh rerun atau proses server lain: cukup di-memory-map
+        with profile_block('load.map_columns') as info:
+            df = open_columns(columns)
+            info['rows'] = len(df)
+        _remember(fingerprint, df)
+        return LoadResult(df, fingerprint, invalid_rows, source)
+
+    if os.path.exists(snapshot) and invalid_rows is not None:
+        with profile_block('load.read_snapshot') as info:
+            df = apply_schema(pd.read_parquet(snapshot))
+            info['rows'] = len(df)
+    else:
+        with profile_block('load.parse_source') as info:
+            if os.path.isdir(local_path):
+                df, invalid_rows = read_station_dataset(local_path), 0
+            else:
+                df, invalid_rows = parse_combined_csv(local_path)
+            info['rows'] = len(df)
+        tmp_snapshot = f'{snapshot}.part'
+        df.to_parquet(tmp_snapshot, index=False)
+        os.replace(tmp_snapshot, snapshot)
+        index[key] = {'source': str(source), 'fingerprint': fingerprint,
+                      'invalid_rows': invalid_rows}
+        _write_index(cache_dir, index)
+
+    try:
+        with profile_block('load.write_columns', rows=len(df)):
+            write_columns(df, columns)
+        df = open_columns(columns)
+    except (OSError, TypeError):
+        # Tanpa file kolom, frame tetap dipakai bersama dari memori proses ini
+        df = read_only_frame(df)
+
+    _remember(fingerprint, df)
+    return LoadResult(df, fingerprint, invalid_rows, source)
+
+
+def attach_dataset(fingerprint, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Membuka dataset yang kolomnya sudah ditulis oleh load_combined_data, misalnya
+    di proses worker, tanpa membaca atau mem-parsing sumbernya lagi.
+
+    Kolom di-memory-map sehingga semua proses berbagi halaman memori yang sama,
+    dan frame didaftarkan dengan fingerprint aslinya agar struktur turunannya
+    memakai kunci cache yang sama dengan proses induk.
+
+    Parameters:
+    - fingerprint (str): Fingerprint dari LoadResult.
+    - cache_dir (str): Direktori cache lokal.
+
+    Returns:
+    - pd.DataFrame: Dataset bersama yang bersifat read-only.
+    """
+    with _cache_lock:
+        cached = _frame_cache.get(fingerprint)
+    if cached is not None:
+        return cached
+    columns = column_dir(cache_dir, fingerprint)
+    if not has_columns(columns):
+        raise FileNotFoundError(f"Kolom dataset '{fingerprint}' belum ditulis di '{cache_dir}'.")
+    df = open_columns(columns)
+    _remember(fingerprint, df)
+    return df
+
+
+def columns_on_disk(fingerprint, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Memeriksa apakah kolom dataset sudah ditulis di disk sehingga dapat dibuka
+    worker lewat attach_dataset.
+
+    Frame di cache proses ini belum tentu memiliki kolom di disk, misalnya hasil
+    extend_dataset atau ketika write_columns gagal, sehingga yang diperiksa
+    adalah file kolomnya, bukan cache frame.
+
+    Parameters:
+    - fingerprint (str): Fingerprint dataset.
+    - cache_dir (str): Direktori cache lokal.
+
+    Returns:
+    - bool: True jika worker dapat membuka dataset.
+    """
+    return has_columns(column_dir(cache_dir, fingerprint))
+
+
+def dataset_fingerprint(df):
+    """
+    Mengambil fingerprint dataset untuk dipakai sebagai kunci cache.
+
+    Frame yang berasal dari load_combined_data memakai hash isi file sumbernya,
+    frame lain (misalnya hasil filter) di-hash berdasarkan isinya.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang akan diambil fingerprint-nya.
+
+    Returns:
+    - str: Fingerprint dataset.
+    """
+    with _cache_lock:
+        fingerprint = _fingerprints.get(id(df))
+        if fingerprint is not None and _frame_cache.get(fingerprint) is df:
+            return fingerprint
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def get_derived(df, name, build):
+    """
+    Mengambil struktur turunan dataset (misalnya kubus agregat atau indeks filter),
+    membangunnya sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame sumber.
+    - name (str): Nama struktur turunan.
+    - build (callable): Fungsi yang menerima df dan mengembalikan struktur turunan.
+
+    Returns:
+    - object: Struktur turunan yang dipakai bersama oleh semua sesi.
+    """
+    key = (name, dataset_fingerprint(df))
+    with _cache_lock:
+        derived = _derived_cache.get(key)
+        if derived is not None:
+            _derived_cache.move_to_end(key)
+            return derived
+
+    with profile_block(f'build.{name}', rows=len(df)):
+        derived = build(df)
+    with _cache_lock:
+        _derived_cache[key] = derived
+        while len(_derived_cache) > MAX_DERIVED_ENTRIES:
+            _derived_cache.popitem(last=False)
+    return derived
+
+
+def register_extender(name, extend):
+    """
+    Mendaftarkan fungsi untuk memperbarui struktur turunan secara inkremental
+    saat baris baru ditambahkan ke dataset (lihat extend_dataset).
+
+    Parameters:
+    - name (str): Nama struktur turunan, sama dengan yang dipakai di get_derived.
+    - extend (callable): Fungsi (derived, new_df, offset) yang mengembalikan struktur
+      turunan baru untuk new_df, dengan baris baru berada di posisi offset ke atas.
+      Struktur lama tidak boleh diubah karena masih dapat dipakai sesi lain.
+    """
+    _extenders[name] = extend
+
+
+def extend_dataset(df, appended):
+    """
+    Menambahkan baris baru ke dataset bersama tanpa membangun ulang struktur turunannya.
+
+    Baris baru harus memiliki 'datetime' tidak lebih awal dari baris terakhir df
+    sehingga urutan datetime tetap terjaga. Kolom disimpan dalam ColumnAppender:
+    penambahan pertama pada suatu dataset menyalinnya satu kali, penambahan
+    berikutnya pada versi terbaru hanya menulis baris baru (amortisasi). Struktur
+    turunan df yang sudah ada di cache dan memiliki extender diperbarui dengan
+    biaya sebanding jumlah baris baru.
+
+    Versi baru tidak ditulis ke store kolom, sehingga worker dan proses server
+    lain tidak dapat membukanya lewat attach_dataset; kolomnya tetap memory-mapped
+    jika df memory-mapped (lihat ColumnAppender).
+
+    Parameters:
+    - df (pd.DataFrame): Dataset bersama (hasil load_combined_data atau extend_dataset).
+    - appended (pd.DataFrame): Baris baru dengan kolom yang sama dengan df.
+
+    Returns:
+    - pd.DataFrame: Dataset baru yang berisi df dan baris baru (dipakai bersama).
+    """
+    if len(df) and len(appended) and appended['datetime'].min() < df['datetime'].iloc[-1]:
+        raise ValueError("Baris baru harus memiliki 'datetime' setelah baris terakhir dataset.")
+
+    base_fingerprint = dataset_fingerprint(df)
+    appended = appended[list(df.columns)]
+    with _cache_lock:
+        # Appender versi terbaru diambil alih; penambahan lain pada versi yang sama
+        # (atau pada versi lama) memakai salinan sendiri agar tidak saling menimpa
+        appender = _appenders.pop(base_fingerprint, None)
+    if appender is None or appender.rows != len(df):
+        appender = ColumnAppender(df)
+
+    offset = len(df)
+    new_df = appender.append(appended)
+    row_hashes = pd.util.hash_pandas_object(appended, index=False).to_numpy()
+    fingerprint = hashlib.sha256(
+        base_fingerprint.encode('ascii') + row_hashes.tobytes()).hexdigest()
+
+    with _cache_lock:
+        previous = [(name, derived) for (name, key), derived in _derived_cache.items()
+                    if key == base_fingerprint and name in _extenders]
+    extended = [(name, _extenders[name](derived, new_df, offset)) for name, derived in previous]
+
+    with _cache_lock:
+        _frame_cache[fingerprint] = new_df
+        _fingerprints[id(new_df)] = fingerprint
+        _appenders[fingerprint] = appender
+        for name, derived in extended:
+            _derived_cache[(name, fingerprint)] = derived
+        while len(_derived_cache) > MAX_DERIVED_ENTRIES:
+            _derived_cache.popitem(last=False)
+    return new_df
+
+
+def forget_dataset(df):
+    """
+    Menghapus satu DataFrame dari cache memori, misalnya versi lama dataset live
+    yang sudah digantikan. Struktur turunannya akan tergeser oleh batas LRU.
+    """
+    with _cache_lock:
+        fingerprint = _fingerprints.pop(id(df), None)
+        if fingerprint is not None and _frame_cache.get(fingerprint) is df:
+            del _frame_cache[fingerprint]
+            _appenders.pop(fingerprint, None)
+
+
+def clear_dataset_cache():
+    """
+    Menghapus semua DataFrame dan struktur turunannya dari cache memori proses.
+    Snapshot Parquet di disk tetap dipertahankan untuk mode offline.
+    """
+    with _cache_lock:
+        _frame_cache.clear()
+        _fingerprints.clear()
+        _derived_cache.clear()
+        _appenders.clear()
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from column_store import read_only_frame
+from data_loader import dataset_fingerprint, get_derived, register_extender
+from filter_engine import get_filter_index
+from schema import MEASUREMENT_COLUMNS
+
+# Kolom yang wajib ada agar semua fungsi plot dapat berjalan
+REQUIRED_COLUMNS = ['datetime', 'station', 'year', 'month', 'hour', 'season', 'wd'] + MEASUREMENT_COLUMNS
+
+
+class DatasetError(ValueError):
+    """
+    Dataset tidak memenuhi skema yang dibutuhkan dashboard.
+    """
+
+
+def _month_starts(datetimes):
+    # Awal bulan setiap baris, dipakai sebagai kunci 'month_year' oleh kubus agregat
+    month_year = datetimes.astype('datetime64[M]')
+    month_year.flags.writeable = False
+    return month_year
+
+
+def validate_frame(df, offset=0):
+    """
+    Mengecek skema dataset: kolom wajib, tipe 'datetime' dan urutan waktunya.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang dicek.
+    - offset (int): Posisi baris pertama yang belum pernah dicek. Baris sebelumnya
+      dianggap sudah valid, sehingga dataset yang hanya bertambah cukup dicek
+      pada baris barunya.
+
+    Raises:
+    - DatasetError: Jika ada kolom yang hilang, 'datetime' bukan datetime, berisi
+      nilai kosong atau tidak terurut.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise DatasetError(f"Kolom berikut wajib ada dalam dataset: {missing}")
+    if not pd.api.types.is_datetime64_any_dtype(df['datetime']):
+        raise DatasetError("Kolom 'datetime' harus bertipe datetime.")
+
+    # Baris terakhir yang sudah dicek ikut dibandingkan dengan baris baru pertama
+    datetimes = df['datetime'].to_numpy()[max(offset - 1, 0):]
+    if np.isnat(datetimes).any():
+        raise DatasetError("Kolom 'datetime' berisi nilai kosong.")
+    if not (datetimes[1:] >= datetimes[:-1]).all():
+        raise DatasetError("Kolom 'datetime' harus terurut.")
+
+
+class AirQualityDataset:
+    """
+    Dataset kualitas udara yang sudah divalidasi dan tidak dapat diubah.
+
+    Skema dicek sekali saat objek dibuat, dan kunci waktu yang dipakai
+    berulang kali (awal bulan untuk 'month_year') dihitung sekali lalu disimpan.
+    Semua fungsi plot menerima objek ini sehingga tidak perlu lagi memvalidasi
+    kolom atau mengonversi 'datetime' di setiap pemanggilan.
+
+    Frame yang dibungkus harus sudah read-only (hasil load_combined_data dan
+    extend_dataset berupa memory-map atau column_store.read_only_frame), dan
+    atribut objek tidak dapat diganti, sehingga dataset aman dipakai bersama oleh
+    semua sesi tanpa salinan defensif.
+    """
+
+    __slots__ = ('frame', 'month_year')
+
+    def __init__(self, frame, month_year=None, validated=False):
+        if not validated:
+            validate_frame(frame)
+        object.__setattr__(self, 'frame', frame)
+        object.__setattr__(self, 'month_year', _month_starts(frame['datetime'].to_numpy())
+                           if month_year is None else month_year)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("AirQualityDataset tidak dapat diubah.")
+
+    def __delattr__(self, name):
+        raise AttributeError("AirQualityDataset tidak dapat diubah.")
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __getitem__(self, column):
+        return self.frame[column]
+
+    def __setitem__(self, column, value):
+        raise TypeError(
+            "AirQualityDataset tidak dapat diubah. Hitung kolom turunan lewat data_loader.get_derived.")
+
+    @property
+    def fingerprint(self):
+        return dataset_fingerprint(self.frame)
+
+    @property
+    def columns(self):
+        return self.frame.columns
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def subset(self, selection):
+        """
+        Mengambil bagian dataset yang lolos filter sebagai dataset baru.
+
+        Parameters:
+        - selection (filter_engine.FilterSelection): Pilihan filter.
+
+        Returns:
+        - AirQualityDataset: Dataset berisi baris hasil filter, tetap terurut
+          berdasarkan 'datetime' sehingga tidak perlu divalidasi ulang.
+        """
+        result = get_filter_index(self.frame).query(selection)
+        rows = result.rows if isinstance(result.rows, slice) else result.positions
+        return AirQualityDataset(read_only_frame(result.frame()), month_year=self.month_year[rows],
+                                 validated=True)
+
+    def extended(self, df, offset):
+        """
+        Membuat dataset untuk df yang berisi dataset ini ditambah baris baru mulai
+        posisi offset. Hanya baris baru yang divalidasi dan dihitung kuncinya.
+        """
+        validate_frame(df, offset)
+        month_year = np.concatenate([self.month_year, _month_starts(df['datetime'].to_numpy()[offset:])])
+        month_year.flags.writeable = False
+        return AirQualityDataset(df, month_year=month_year, validated=True)
+
+
+def get_dataset(df):
+    """
+    Membungkus dataset bersama menjadi AirQualityDataset, sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): Dataset bersama hasil load_combined_data atau extend_dataset.
+
+    Returns:
+    - AirQualityDataset: Dataset tervalidasi yang dipakai bersama oleh semua sesi.
+
+    Raises:
+    - DatasetError: Jika df tidak memenuhi skema.
+    """
+    return get_derived(df, 'dataset', AirQualityDataset)
+
+
+register_extender('dataset', lambda dataset, df, offset: dataset.extended(df, offset))
@@ -0,0 +1,101 @@
+import numpy as np
+
+# Jumlah titik maksimum sebelum scatter plot diganti dengan mode density/sampling
+DEFAULT_POINT_BUDGET = 5000
+DEFAULT_BINS = 60
+
+
+def bin_edges(df, columns, bins=DEFAULT_BINS):
+    """
+    Menghitung batas bin yang sama untuk setiap kolom agar histogram antar
+    stasiun dapat ditumpuk pada sumbu yang sama.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame sumber.
+    - columns (list): Kolom numerik yang akan di-bin.
+    - bins (int): Jumlah bin per kolom.
+
+    Returns:
+    - dict: Pemetaan nama kolom ke array batas bin (panjang bins + 1).
+    """
+    edges = {}
+    for col in columns:
+        values = df[col].to_numpy()
+        low, high = np.nanmin(values), np.nanmax(values)
+        if not np.isfinite(low) or low == high:
+            low, high = (0.0, 1.0) if not np.isfinite(low) else (low - 0.5, high + 0.5)
+        edges[col] = np.linspace(low, high, bins + 1)
+    return edges
+
+
+def _bin_index(values, edges):
+    # Indeks bin 0..bins-1, nilai NaN diberi -1
+    bins = len(edges) - 1
+    idx = np.searchsorted(edges, values, side='right') - 1
+    idx = np.clip(idx, 0, bins - 1)
+    idx[np.isnan(values)] = -1
+    return idx
+
+
+def pair_histograms(df, columns, hue='station', bins=DEFAULT_BINS):
+    """
+    Menghitung histogram 1D dan 2D untuk setiap pasangan kolom per kelompok `hue`.
+
+    Setiap kolom di-bin sekali per kelompok, lalu histogram 2D dihitung dengan
+    satu np.bincount per pasangan kolom sehingga seluruh proses tervektorisasi.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame sumber.
+    - columns (list): Kolom numerik untuk pairplot.
+    - hue (str): Kolom kategori untuk pewarnaan (misalnya 'station').
+    - bins (int): Jumlah bin per kolom.
+
+    Returns:
+    - tuple: (edges, groups) dengan groups berupa dict
+      {nilai_hue: {'hist1d': {kolom: counts}, 'hist2d': {(kolom_x, kolom_y): counts}}}.
+      Array hist2d berbentuk (bins_y, bins_x) agar siap ditampilkan dengan imshow.
+    """
+    edges = bin_edges(df, columns, bins)
+    groups = {}
+    for key, idx in df.groupby(hue, observed=True, sort=True).indices.items():
+        bin_idx = {col: _bin_index(df[col].to_numpy()[idx].astype('float64'), edges[col])
+                   for col in columns}
+        hist1d = {col: np.bincount(b[b >= 0], minlength=bins) for col, b in bin_idx.items()}
+        hist2d = {}
+        for i, col_x in enumerate(columns):
+            for col_y in columns[i + 1:]:
+                bx, by = bin_idx[col_x], bin_idx[col_y]
+                valid = (bx >= 0) & (by >= 0)
+                counts = np.bincount(
+                    by[valid] * bins + bx[valid], minlength=bins * bins).reshape(bins, bins)
+                hist2d[(col_x, col_y)] = counts
+                hist2d[(col_y, col_x)] = counts.T
+        groups[key] = {'hist1d': hist1d, 'hist2d': hist2d}
+    return edges, groups
+
+
+def stratified_sample(df, hue='station', budget=DEFAULT_POINT_BUDGET, random_state=0):
+    """
+    Mengambil sampel acak berstrata per kelompok `hue` dengan total sekitar `budget` baris.
+
+    Proporsi setiap kelompok dipertahankan dan setiap kelompok mendapat minimal satu baris.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame sumber.
+    - hue (str): Kolom kategori sebagai strata.
+    - budget (int): Jumlah titik maksimum.
+    - random_state (int): Seed agar sampel stabil di setiap rerun.
+
+    Returns:
+    - pd.DataFrame: Sampel DataFrame (atau DataFrame asli jika sudah di bawah budget).
+    """
+    if len(df) <= budget:
+        return df
+    rng = np.random.default_rng(random_state)
+    fraction = budget / len(df)
+    positions = []
+    for idx in df.groupby(hue, observed=True, sort=True).indices.values():
+        size = max(1, int(round(len(idx) * fraction)))
+        positions.append(rng.choice(idx, size=size, replace=False))
+    positions = np.sort(np.concatenate(positions))
+    return df.iloc[positions]
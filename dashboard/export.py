@@ -0,0 +1,246 @@
+import hashlib
+import os
+import tempfile
+import time
+from collections import namedtuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from data_loader import DEFAULT_CACHE_DIR, dataset_fingerprint
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'parquet': 'application/vnd.apache.parquet'}
+
+# Jumlah baris per potongan; untuk Parquet sekaligus ukuran row group
+DEFAULT_CHUNK_ROWS = 65536
+
+# Ukuran potongan saat mengirim file ekspor yang sudah disiapkan
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+# Jumlah file ekspor yang disimpan di direktori cache
+MAX_EXPORT_FILES = 8
+
+# Umur minimum (detik) sejak file ekspor terakhir dibuat atau dipakai sebelum boleh
+# dihapus, agar file yang baru disiapkan sesi lain tidak terhapus sebelum diunduh
+EXPORT_GRACE_SECONDS = 15 * 60
+
+ExportStats = namedtuple('ExportStats', ['path', 'rows', 'bytes', 'seconds'])
+
+
+class _ByteSink:
+    """
+    Tujuan tulis ParquetWriter yang isinya diambil setelah setiap row group,
+    sehingga file Parquet dapat dikirim sepotong-sepotong.
+    """
+
+    def __init__(self):
+        self._parts = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def _chunks(result, chunk_rows):
+    # Setiap potongan diambil dari DataFrame dasar: view untuk filter rentang waktu,
+    # salinan sebesar satu potongan untuk filter lain
+    for number in range(-(-len(result) // chunk_rows)):
+        yield result.page(number, chunk_rows)
+
+
+def iter_csv(result, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Menghasilkan isi CSV hasil filter sepotong demi sepotong.
+
+    Parameters:
+    - result (filter_engine.FilterResult): Hasil filter.
+    - chunk_rows (int): Jumlah baris per potongan.
+
+    Yields:
+    - tuple: (bytes UTF-8, jumlah baris pada potongan ini)
+    """
+    header = True
+    for chunk in _chunks(result, chunk_rows):
+        yield chunk.to_csv(index=False, header=header).encode('utf-8'), len(chunk)
+        header = False
+    if header:
+        yield result.df.iloc[:0].to_csv(index=False).encode('utf-8'), 0
+
+
+def iter_parquet(result, chunk_rows=DEFAULT_CHUNK_ROWS, compression='snappy'):
+    """
+    Menghasilkan isi file Parquet hasil filter, satu row group per potongan.
+
+    Parameters:
+    - result (filter_engine.FilterResult): Hasil filter.
+    - chunk_rows (int): Jumlah baris per row group.
+    - compression (str): Kompresi Parquet.
+
+    Yields:
+    - tuple: (bytes, jumlah baris pada potongan ini). Potongan terakhir berisi
+      footer file dengan 0 baris.
+    """
+    sink = _ByteSink()
+    schema = pa.Schema.from_pandas(result.df.iloc[:0], preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression=compression) as writer:
+        for chunk in _chunks(result, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False),
+                               row_group_size=chunk_rows)
+            yield sink.take(), len(chunk)
+    yield sink.take(), 0
+
+
+def iter_export(result, fmt, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Menghasilkan isi file ekspor dalam format 'csv' atau 'parquet' (lihat iter_csv, iter_parquet).
+    """
+    if fmt == 'csv':
+        return iter_csv(result, chunk_rows)
+    if fmt == 'parquet':
+        return iter_parquet(result, chunk_rows)
+    raise ValueError(f"Format '{fmt}' tidak dikenal. Pilih dari {list(EXPORT_FORMATS)}.")
+
+
+def export_path(result, selection, fmt, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Path file ekspor untuk kombinasi dataset, filter dan format.
+    """
+    key = hashlib.sha256(repr((dataset_fingerprint(result.df), _selection_key(selection), fmt)).encode()).hexdigest()
+    return os.path.join(cache_dir, 'exports', f'{key[:16]}.{fmt}')
+
+
+def _selection_key(selection):
+    # Filter yang setara (urutan pilihan berbeda, tanggal sebagai string atau Timestamp)
+    # memakai file yang sama, baik dari dashboard maupun dari endpoint /export
+    def timestamp(value):
+        return None if value is None else pd.Timestamp(value).isoformat()
+    return (tuple(sorted(map(str, selection.stations or ()))), tuple(sorted(map(int, selection.years or ()))),
+            tuple(sorted(map(str, selection.seasons or ()))), timestamp(selection.start), timestamp(selection.end))
+
+
+def open_export(result, selection, fmt, cache_dir=DEFAULT_CACHE_DIR, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Membuka file ekspor yang sudah disiapkan export_to_file untuk dikirim sepotong demi sepotong.
+
+    File dibuka sekali di awal, sehingga tetap dapat dibaca sampai selesai walaupun
+    dihapus _prune di tengah pengiriman.
+
+    Parameters:
+    - result (filter_engine.FilterResult): Hasil filter.
+    - selection (FilterSelection): Pilihan filter.
+    - fmt (str): 'csv' atau 'parquet'.
+    - cache_dir (str): Direktori cache lokal.
+    - chunk_bytes (int): Ukuran setiap potongan.
+
+    Returns:
+    - iterator or None: Potongan (bytes, 0) seperti iter_export, atau None jika
+      file belum disiapkan.
+    """
+    try:
+        f = open(export_path(result, selection, fmt, cache_dir), 'rb')
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(f.fileno())
+    except OSError:
+        pass
+    return _read_chunks(f, chunk_bytes)
+
+
+def _read_chunks(f, chunk_bytes):
+    with f:
+        while True:
+            data = f.read(chunk_bytes)
+            if not data:
+                return
+            yield data, 0
+
+
+def _prune(directory, keep, grace=EXPORT_GRACE_SECONDS):
+    # Hanya file di luar `keep` terbaru yang sudah melewati masa tenggang yang dihapus
+    files = sorted((entry for entry in os.scandir(directory)
+                    if entry.is_file() and not entry.name.endswith('.part')),
+                   key=lambda entry: entry.stat().st_mtime, reverse=True)
+    cutoff = time.time() - grace
+    for entry in files[keep:]:
+        if entry.stat().st_mtime > cutoff:
+            continue
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def export_to_file(result, selection, fmt, cache_dir=DEFAULT_CACHE_DIR, chunk_rows=DEFAULT_CHUNK_ROWS,
+                   progress=None):
+    """
+    Menulis hasil filter ke file CSV atau Parquet di direktori cache, sepotong demi sepotong.
+
+    Memori yang dipakai sebanding dengan satu potongan, bukan seluruh hasil filter.
+    File untuk dataset, filter dan format yang sama dipakai ulang. Hanya
+    MAX_EXPORT_FILES file terbaru yang disimpan; file lain dihapus setelah tidak
+    dipakai selama EXPORT_GRACE_SECONDS.
+
+    Parameters:
+    - result (filter_engine.FilterResult): Hasil filter.
+    - selection (FilterSelection): Pilihan filter, bagian dari nama file.
+    - fmt (str): 'csv' atau 'parquet'.
+    - cache_dir (str): Direktori cache lokal.
+    - chunk_rows (int): Jumlah baris per potongan (row group untuk Parquet).
+    - progress (callable): Dipanggil setelah setiap potongan dengan
+      (baris selesai, total baris, detik berlalu).
+
+    Returns:
+    - ExportStats: (path, rows, bytes, seconds)
+    """
+    path = export_path(result, selection, fmt, cache_dir)
+    total = len(result)
+    try:
+        # utime memulai ulang masa tenggang, sehingga _prune tidak menghapus file yang dipakai ulang
+        os.utime(path)
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        pass
+    else:
+        if progress is not None:
+            progress(total, total, 0.0)
+        return ExportStats(path, total, size, 0.0)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    start = time.perf_counter()
+    done = 0
+    # Nama sementara unik per pemanggil: sesi lain dapat mengekspor filter yang sama bersamaan
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f'.{os.path.basename(path)}-',
+                                    suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for data, rows in iter_export(result, fmt, chunk_rows):
+                f.write(data)
+                done += rows
+                if progress is not None and rows:
+                    progress(done, total, time.perf_counter() - start)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune(os.path.dirname(path), MAX_EXPORT_FILES)
+    return ExportStats(path, done, os.path.getsize(path), time.perf_counter() - start)
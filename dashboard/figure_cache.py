@@ -0,0 +1,124 @@
+import io
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+# Batas memori cache gambar dalam MB (dapat diganti lewat environment variable)
+DEFAULT_MAX_MB = float(os.environ.get('AIR_QUALITY_FIGURE_CACHE_MB', 64))
+
+CachedFigure = namedtuple('CachedFigure', ['png', 'notes'])
+
+
+class FigureCache:
+    """
+    Cache LRU untuk gambar yang sudah dirender (PNG bytes) dengan batas memori.
+
+    Kunci cache dibentuk oleh figure_cache_key sehingga tampilan yang sama
+    (fungsi plot, dataset, filter dan pengaturan gaya) tidak perlu menjalankan
+    pandas maupun matplotlib lagi.
+    """
+
+    def __init__(self, max_bytes=int(DEFAULT_MAX_MB * 1024 * 1024)):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Mengambil gambar dari cache dan menandainya sebagai yang terakhir dipakai.
+
+        Returns:
+        - CachedFigure atau None jika tidak ada di cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, png, notes=()):
+        """
+        Menyimpan gambar ke cache dan mengeluarkan entri terlama jika melebihi batas memori.
+
+        Parameters:
+        - key (tuple): Kunci cache.
+        - png (bytes): Gambar hasil render.
+        - notes (iterable): Teks pendamping gambar (markdown) yang ikut disimpan.
+
+        Returns:
+        - CachedFigure: Entri yang disimpan.
+        """
+        entry = CachedFigure(png, tuple(notes))
+        if len(png) > self.max_bytes:
+            return entry
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old.png)
+            self._entries[key] = entry
+            self._size += len(png)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.png)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Mengembalikan statistik cache.
+
+        Returns:
+        - dict: hits, misses, evictions, jumlah entri dan ukuran total (bytes).
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
+
+
+def figure_cache_key(name, fingerprint, params, style, palette, context='notebook'):
+    """
+    Membentuk kunci cache gambar.
+
+    Parameters:
+    - name (str): Nama fungsi plot.
+    - fingerprint (str): Fingerprint dataset.
+    - params (tuple): Parameter lain yang memengaruhi gambar (filter, kolom, mode).
+    - style (str): Gaya seaborn.
+    - palette (str): Palet warna seaborn.
+    - context (str): Context seaborn.
+
+    Returns:
+    - tuple: Kunci cache yang hashable.
+    """
+    return (name, fingerprint, params, style, context, palette)
+
+
+def figure_to_bytes(fig, fmt='png', dpi=200):
+    """
+    Merender Figure matplotlib menjadi bytes dalam format yang diminta ('png', 'svg', ...).
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+# Cache gambar bersama untuk semua sesi dalam satu proses server
+figure_cache = FigureCache()
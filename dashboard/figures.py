@@ -0,0 +1,411 @@
+import numpy as np
+import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+# Fungsi pembuat gambar per jenis plot. Setiap fungsi menerima data yang sudah
+# diagregasi dan mengembalikan Figure baru tanpa memakai state global pyplot,
+# sehingga aman dijalankan di worker render (lihat render.py).
+FIGURE_BUILDERS = {}
+
+
+def figure_builder(kind):
+    """
+    Decorator untuk mendaftarkan fungsi pembuat gambar dengan nama jenisnya.
+    """
+    def decorator(func):
+        FIGURE_BUILDERS[kind] = func
+        return func
+    return decorator
+
+
+@figure_builder('pm_variation')
+def build_pm_variation_figure(data, palette):
+    """
+    Tren rata-rata bulanan PM2.5 dan PM10 per stasiun.
+
+    Parameters:
+    - data (pd.DataFrame): Rata-rata per 'station' dan 'month_year'.
+    - palette (str): Palet warna seaborn.
+
+    Returns:
+    - Figure: Gambar dua panel (PM2.5 dan PM10).
+    """
+    fig = Figure(figsize=(14, 8))
+    axes = fig.subplots(2, 1)
+    for ax, pol in zip(axes, ['PM2.5', 'PM10']):
+        sns.lineplot(data=data, x='month_year', y=pol, hue='station', marker='o', ax=ax)
+        ax.set_title(f'Tren Rata-rata Bulanan {pol} di Changping dan Aotizhongxin')
+        ax.set_xlabel('Bulan')
+        ax.set_ylabel(pol)
+        ax.legend(title='Kota')
+    fig.tight_layout()
+    return fig
+
+
+@figure_builder('correlation_heatmap')
+def build_correlation_heatmap(data, palette, title, figsize):
+    """
+    Heatmap matriks korelasi dengan anotasi nilai.
+
+    Parameters:
+    - data (pd.DataFrame): Matriks korelasi.
+    - palette (str): Palet warna seaborn (heatmap selalu memakai 'coolwarm').
+    - title (str): Judul gambar.
+    - figsize (tuple): Ukuran gambar.
+    """
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.heatmap(data, annot=True, fmt=".2f", cmap='coolwarm', vmin=-1, vmax=1, ax=ax)
+    ax.set_title(title)
+    return fig
+
+
+@figure_builder('pair_scatter')
+def build_pair_scatter_figure(data, palette, columns, hue='station'):
+    """
+    Pairplot scatter per stasiun, setara dengan sns.pairplot tetapi digambar
+    pada Figure sendiri: panel di luar diagonal berisi scatter plot, panel
+    diagonal berisi KDE per stasiun.
+
+    Parameters:
+    - data (pd.DataFrame): Titik data (seluruh data atau sampel berstrata).
+    - palette (str): Palet warna seaborn yang dipilih (titik memakai 'viridis').
+    - columns (list): Kolom numerik untuk pairplot.
+    - hue (str): Kolom kategori untuk pewarnaan.
+    """
+    n = len(columns)
+    fig = Figure(figsize=(2.5 * n, 2.5 * n))
+    axes = fig.subplots(n, n, squeeze=False)
+    for i, col_y in enumerate(columns):
+        for j, col_x in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                sns.kdeplot(data=data, x=col_x, hue=hue, palette='viridis',
+                            fill=True, common_norm=False, legend=False, warn_singular=False, ax=ax)
+                ax.set_yticks([])
+            else:
+                sns.scatterplot(data=data, x=col_x, y=col_y, hue=hue, palette='viridis',
+                                s=8, linewidth=0, legend=False, ax=ax)
+            ax.set_xlabel(col_x if i == n - 1 else '')
+            ax.set_ylabel(col_y if j == 0 else '')
+
+    keys = list(data[hue].cat.categories if hasattr(data[hue], 'cat') else data[hue].unique())
+    colors = sns.color_palette('viridis', len(keys))
+    handles = [Line2D([0], [0], marker='o', linestyle='', color=color) for color in colors]
+    fig.legend(handles, [str(key) for key in keys], title=hue, loc='center right')
+    fig.suptitle('Scatter Plots Korelasi Kondisi Cuaca dan Polusi per Kota', y=1.02)
+    fig.tight_layout(rect=(0, 0, 0.9, 1))
+    return fig
+
+
+@figure_builder('pair_density')
+def build_pair_density_figure(data, palette, columns, hue='station'):
+    """
+    Pairplot berbasis histogram 2D: panel di luar diagonal menampilkan
+    kepadatan titik per stasiun, panel diagonal menampilkan histogram 1D.
+
+    Waktu render tidak bergantung pada jumlah baris karena yang digambar adalah
+    grid bin hasil np.bincount, bukan titik data satu per satu.
+
+    Parameters:
+    - data (tuple): (edges, groups) hasil density.pair_histograms.
+    - palette (str): Palet warna seaborn yang dipilih (stasiun memakai 'viridis').
+    - columns (list): Kolom numerik untuk pairplot.
+    - hue (str): Nama kolom kategori untuk judul legenda.
+    """
+    edges, groups = data
+    colors = dict(zip(groups, sns.color_palette('viridis', len(groups))))
+
+    n = len(columns)
+    fig = Figure(figsize=(2.6 * n, 2.6 * n))
+    axes = fig.subplots(n, n, squeeze=False)
+    for i, col_y in enumerate(columns):
+        for j, col_x in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                centers = (edges[col_x][:-1] + edges[col_x][1:]) / 2
+                for key, hist in groups.items():
+                    counts = hist['hist1d'][col_x]
+                    ax.plot(centers, counts / max(counts.sum(), 1),
+                            color=colors[key], drawstyle='steps-mid')
+                ax.set_yticks([])
+            else:
+                extent = (edges[col_x][0], edges[col_x][-1],
+                          edges[col_y][0], edges[col_y][-1])
+                for key, hist in groups.items():
+                    counts = hist['hist2d'][(col_x, col_y)]
+                    # Transparansi mengikuti log(jumlah titik) agar area jarang tetap terlihat
+                    alpha = np.log1p(counts) / max(np.log1p(counts.max()), 1)
+                    image = np.zeros(counts.shape + (4,))
+                    image[..., :3] = colors[key]
+                    image[..., 3] = alpha * 0.8
+                    ax.imshow(image, extent=extent, origin='lower',
+                              aspect='auto', interpolation='nearest')
+            if i == n - 1:
+                ax.set_xlabel(col_x)
+            else:
+                ax.set_xticklabels([])
+            if j == 0:
+                ax.set_ylabel(col_y)
+            elif i != j:
+                ax.set_yticklabels([])
+
+    handles = [Line2D([0], [0], color=color, lw=4) for color in colors.values()]
+    fig.legend(handles, [str(key) for key in colors], title=hue,
+               loc='center right')
+    fig.suptitle('Density Plots Korelasi Kondisi Cuaca dan Polusi per Kota', y=1.02)
+    fig.tight_layout(rect=(0, 0, 0.9, 1))
+    return fig
+
+
+@figure_builder('station_pollutant_avg')
+def build_station_pollutant_avg_figure(data, palette, pollutants):
+    """
+    Bar plot rata-rata konsentrasi setiap polutan per stasiun.
+
+    Parameters:
+    - data (pd.DataFrame): Rata-rata polutan per 'station'.
+    - palette (str): Palet warna seaborn yang dipilih (batang memakai 'viridis').
+    - pollutants (list): Kolom polutan, maksimal enam.
+    """
+    fig = Figure(figsize=(18, 12))
+    axes = fig.subplots(2, 3, squeeze=False).ravel()
+    for ax, pol in zip(axes, pollutants):
+        sns.barplot(x='station', y=pol, data=data, hue='station',
+                    palette='viridis', legend=False, ax=ax)
+        ax.set_title(f'Rata-rata {pol} per Stasiun')
+        ax.set_xlabel('Stasiun')
+        ax.set_ylabel(pol)
+        ax.tick_params(axis='x', rotation=45)
+    for ax in axes[len(pollutants):]:
+        ax.set_visible(False)
+    fig.tight_layout()
+    return fig
+
+
+@figure_builder('pollutant_trends')
+def build_pollutant_trends_figure(data, palette, pollutants, title):
+    """
+    Garis tren setiap polutan per stasiun, satu panel per polutan.
+
+    Parameters:
+    - data (pd.DataFrame): Kolom 'datetime', 'station', 'pollutant' dan 'value'
+      (sudah di-resample dan di-downsample).
+    - palette (str): Palet warna seaborn untuk garis stasiun.
+    - pollutants (list): Polutan yang digambar, sesuai urutan panel.
+    - title (str): Judul gambar.
+    """
+    stations = list(dict.fromkeys(data['station']))
+    colors = dict(zip(stations, sns.color_palette(palette, len(stations))))
+    n_cols = 2 if len(pollutants) > 1 else 1
+    n_rows = -(-len(pollutants) // n_cols)
+    fig = Figure(figsize=(14, 3.2 * n_rows + 1))
+    axes = fig.subplots(n_rows, n_cols, squeeze=False, sharex=True).ravel()
+    for ax, pol in zip(axes, pollutants):
+        subset = data[data['pollutant'] == pol]
+        for station, group in subset.groupby('station', sort=False):
+            ax.plot(group['datetime'], group['value'], color=colors[station],
+                    linewidth=0.9, label=station)
+        ax.set_title(pol)
+        ax.set_ylabel('Konsentrasi')
+        ax.grid(True)
+    for ax in axes[len(pollutants):]:
+        ax.set_visible(False)
+    handles = [Line2D([0], [0], color=color, lw=2) for color in colors.values()]
+    fig.legend(handles, stations, title='Stasiun', loc='upper right')
+    fig.suptitle(title)
+    fig.autofmt_xdate()
+    fig.tight_layout(rect=(0, 0, 0.88, 1))
+    return fig
+
+
+@figure_builder('temperature_stats')
+def build_temperature_stats_figure(data, palette):
+    """
+    Bar plot suhu terendah dan tertinggi per stasiun.
+
+    Parameters:
+    - data (pd.DataFrame): Kolom 'station', 'Temperature_Type' ('min'/'max') dan 'Temperature'.
+    - palette (str): Palet warna seaborn.
+    """
+    fig = Figure(figsize=(14, 8))
+    ax = fig.subplots()
+    sns.barplot(x='station', y='Temperature', hue='Temperature_Type',
+                data=data, palette=palette, ax=ax)
+    ax.set_title('Suhu Tertinggi dan Terendah per Stasiun')
+    ax.set_xlabel('Stasiun')
+    ax.set_ylabel('Suhu (°C)')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend(title='Jenis Suhu')
+    return fig
+
+
+@figure_builder('rainfall')
+def build_rainfall_figure(data, palette):
+    """
+    Bar plot curah hujan tertinggi per stasiun.
+
+    Parameters:
+    - data (pd.DataFrame): Kolom 'station' dan 'RAIN'.
+    - palette (str): Palet warna seaborn.
+    """
+    fig = Figure(figsize=(14, 8))
+    ax = fig.subplots()
+    sns.barplot(x='station', y='RAIN', data=data, hue='station',
+                palette=palette, legend=False, ax=ax)
+    ax.set_title('Curah Hujan Tertinggi per Stasiun')
+    ax.set_xlabel('Stasiun')
+    ax.set_ylabel('Curah Hujan (mm)')
+    ax.tick_params(axis='x', rotation=45)
+    return fig
+
+
+@figure_builder('aqi_overview')
+def build_aqi_overview_figure(data, palette, categories, colors, bounds):
+    """
+    Ringkasan AQI: proporsi jam per kategori AQI setiap stasiun dan AQI
+    harian tertinggi sepanjang waktu.
+
+    Parameters:
+    - data (tuple): (jumlah jam per kategori per stasiun, AQI harian tertinggi
+      dengan kolom 'station', 'date' dan 'AQI').
+    - palette (str): Palet warna seaborn untuk garis stasiun.
+    - categories (list): Nama kategori AQI.
+    - colors (list): Warna setiap kategori.
+    - bounds (list): Batas atas nilai AQI setiap kategori, kecuali yang terakhir.
+    """
+    category_hours, daily = data
+    fig = Figure(figsize=(14, 10))
+    ax_share, ax_daily = fig.subplots(2, 1, gridspec_kw={'height_ratios': [1, 2]})
+
+    share = category_hours.div(category_hours.sum(axis=1).replace(0, 1), axis=0) * 100
+    left = np.zeros(len(share))
+    for category, color in zip(categories, colors):
+        ax_share.barh(share.index.astype(str), share[category], left=left,
+                      color=color, edgecolor='white', label=category)
+        left += share[category].to_numpy()
+    ax_share.set_xlim(0, 100)
+    ax_share.set_xlabel('Persentase Jam (%)')
+    ax_share.set_title('Proporsi Jam per Kategori AQI')
+    ax_share.legend(ncol=len(categories), loc='upper center',
+                    bbox_to_anchor=(0.5, -0.35), fontsize='small')
+
+    # Pita warna kategori di belakang garis AQI harian
+    edges = [0, *bounds, max(500, float(daily['AQI'].max()) if len(daily) else 500)]
+    for lo, hi, color in zip(edges[:-1], edges[1:], colors):
+        ax_daily.axhspan(lo, hi, color=color, alpha=0.15, linewidth=0)
+    sns.lineplot(data=daily, x='date', y='AQI', hue='station', palette=palette,
+                 linewidth=0.8, ax=ax_daily)
+    ax_daily.set_ylim(0, edges[-1])
+    ax_daily.set_title('AQI Harian Tertinggi per Stasiun')
+    ax_daily.set_xlabel('Tanggal')
+    ax_daily.set_ylabel('AQI')
+    ax_daily.legend(title='Stasiun')
+    fig.tight_layout()
+    return fig
+
+
+@figure_builder('wind_rose')
+def build_wind_rose_figure(data, palette, pollutant, directions, bands):
+    """
+    Wind rose dan rata-rata polutan per arah × kelas kecepatan angin, satu kolom per stasiun.
+
+    Baris atas: persentase jam per arah angin, ditumpuk per kelas kecepatan.
+    Baris bawah: rata-rata polutan per arah (sudut) dan kelas kecepatan (jari-jari).
+
+    Parameters:
+    - data (pd.DataFrame): Kolom 'station', 'direction', 'band', 'hours' dan
+      'mean' (lihat windrose.WindRose.aggregate).
+    - palette (str): Palet warna seaborn untuk kelas kecepatan.
+    - pollutant (str): Nama polutan yang dirata-ratakan.
+    - directions (list): Arah angin searah jarum jam dari utara.
+    - bands (list): Label kelas kecepatan angin, dari yang paling pelan.
+    """
+    stations = list(dict.fromkeys(data['station']))
+    n_dir, n_band = len(directions), len(bands)
+    width = 2 * np.pi / n_dir
+    theta = np.arange(n_dir) * width
+    colors = sns.color_palette(palette, n_band)
+
+    fig = Figure(figsize=(5 * len(stations) + 1, 10))
+    axes = fig.subplots(2, len(stations), squeeze=False, subplot_kw={'projection': 'polar'})
+    vmax = np.nanmax(data['mean'].to_numpy()) if data['mean'].notna().any() else 1.0
+    mesh = None
+    for col, station in enumerate(stations):
+        # Data sudah terurut per (arah, kelas kecepatan) untuk setiap stasiun
+        rows = data[data['station'] == station]
+        hours = rows['hours'].to_numpy(dtype=float).reshape(n_dir, n_band)
+        means = rows['mean'].to_numpy(dtype=float).reshape(n_dir, n_band)
+        share = hours / max(hours.sum(), 1) * 100
+
+        ax_rose, ax_mean = axes[0, col], axes[1, col]
+        bottom = np.zeros(n_dir)
+        for band in range(n_band):
+            ax_rose.bar(theta, share[:, band], width=width * 0.95, bottom=bottom,
+                        color=colors[band], edgecolor='white', linewidth=0.3, label=f'{bands[band]} m/s')
+            bottom += share[:, band]
+        ax_rose.set_title(f'{station}\nFrekuensi Arah Angin (%)', pad=18)
+
+        theta_edges = np.append(theta, 2 * np.pi) - width / 2
+        radius_edges = np.arange(n_band + 1)
+        mesh = ax_mean.pcolormesh(theta_edges, radius_edges, means.T, cmap='magma_r',
+                                  vmin=0, vmax=vmax, shading='flat')
+        # Kelas kecepatan naik dari pusat ke luar, sama dengan urutan legenda
+        ax_mean.set_yticks(np.arange(n_band) + 0.5)
+        ax_mean.set_yticklabels([])
+        ax_mean.set_title(f'Rata-rata {pollutant} per Arah\n(kecepatan naik ke arah luar)', pad=18)
+
+        for ax in (ax_rose, ax_mean):
+            ax.set_theta_zero_location('N')
+            ax.set_theta_direction(-1)
+            ax.set_xticks(theta)
+            ax.set_xticklabels(directions, fontsize='x-small')
+            ax.tick_params(axis='y', labelsize='x-small')
+
+    handles, labels = axes[0, 0].get_legend_handles_labels()
+    fig.legend(handles, labels, title='Kecepatan Angin', loc='upper center', ncol=n_band,
+               fontsize='small', bbox_to_anchor=(0.5, 1.0))
+    fig.subplots_adjust(top=0.84, hspace=0.4)
+    if mesh is not None:
+        fig.colorbar(mesh, ax=axes[1, :].tolist(), shrink=0.8, label=pollutant)
+    return fig
+
+
+@figure_builder('seasonal_profile')
+def build_seasonal_profile_figure(data, palette, pollutants, month_starts, month_labels):
+    """
+    Komponen musiman tahunan setiap polutan per stasiun, satu panel per polutan.
+
+    Parameters:
+    - data (pd.DataFrame): Kolom 'station', 'pollutant', 'day' (1-365) dan
+      'seasonal' (lihat seasonal.SeasonalAnalysis.profiles).
+    - palette (str): Palet warna seaborn untuk garis stasiun.
+    - pollutants (list): Polutan yang digambar, sesuai urutan panel.
+    - month_starts (list): Hari pertama setiap bulan pada kalender 365 hari.
+    - month_labels (list): Label sumbu x untuk setiap bulan.
+    """
+    stations = list(dict.fromkeys(data['station']))
+    colors = dict(zip(stations, sns.color_palette(palette, len(stations))))
+    n_cols = 2 if len(pollutants) > 1 else 1
+    n_rows = -(-len(pollutants) // n_cols)
+    fig = Figure(figsize=(14, 3.2 * n_rows + 1))
+    axes = fig.subplots(n_rows, n_cols, squeeze=False, sharex=True).ravel()
+    for ax, pol in zip(axes, pollutants):
+        subset = data[data['pollutant'] == pol]
+        for station, group in subset.groupby('station', sort=False):
+            ax.plot(group['day'], group['seasonal'], color=colors[station], linewidth=1.2, label=station)
+        ax.axhline(0, color='grey', linewidth=0.8, linestyle='--')
+        ax.set_title(pol)
+        ax.set_ylabel('Selisih dari Tren')
+        ax.set_xticks(month_starts)
+        ax.set_xticklabels(month_labels)
+        ax.set_xlim(1, 365)
+        ax.grid(True)
+    for ax in axes[len(pollutants):]:
+        ax.set_visible(False)
+    handles = [Line2D([0], [0], color=color, lw=2) for color in colors.values()]
+    fig.legend(handles, stations, title='Stasiun', loc='upper right')
+    fig.suptitle('Komponen Musiman Tahunan per Polutan')
+    fig.tight_layout(rect=(0, 0, 0.88, 1))
+    return fig
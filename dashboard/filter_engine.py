@@ -0,0 +1,171 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived, register_extender
+
+# Kolom kategori yang memiliki indeks baris
+INDEXED_COLUMNS = ['station', 'year', 'season']
+
+FilterSelection = namedtuple(
+    'FilterSelection', ['stations', 'years', 'seasons', 'start', 'end'])
+
+
+class FilterResult:
+    """
+    Hasil filter berupa posisi baris pada DataFrame dasar.
+
+    DataFrame dasar tidak pernah disalin; baris baru diambil saat dibutuhkan,
+    misalnya satu halaman untuk ditampilkan.
+    """
+
+    def __init__(self, df, rows):
+        self.df = df
+        # `rows` berupa slice (filter rentang waktu saja) atau array posisi terurut
+        self.rows = rows
+
+    def __len__(self):
+        if isinstance(self.rows, slice):
+            return self.rows.stop - self.rows.start
+        return len(self.rows)
+
+    @property
+    def positions(self):
+        """
+        Posisi baris hasil filter sebagai array integer terurut.
+        """
+        if isinstance(self.rows, slice):
+            return np.arange(self.rows.start, self.rows.stop)
+        return self.rows
+
+    def frame(self):
+        """
+        Mengembalikan DataFrame hasil filter. Jika filter hanya berupa rentang
+        waktu, hasilnya adalah irisan (view) dari DataFrame dasar.
+        """
+        return self.df.iloc[self.rows]
+
+    def page(self, number, size):
+        """
+        Mengambil satu halaman hasil filter.
+
+        Parameters:
+        - number (int): Nomor halaman, dimulai dari 0.
+        - size (int): Jumlah baris per halaman.
+
+        Returns:
+        - pd.DataFrame: Baris pada halaman tersebut.
+        """
+        start = number * size
+        if isinstance(self.rows, slice):
+            start = min(self.rows.start + start, self.rows.stop)
+            return self.df.iloc[start:min(start + size, self.rows.stop)]
+        return self.df.iloc[self.rows[start:start + size]]
+
+
+class FilterIndex:
+    """
+    Indeks untuk memfilter dataset berdasarkan stasiun, tahun, musim dan rentang waktu.
+
+    Rentang waktu dicari dengan binary search pada kolom 'datetime' yang terurut,
+    sedangkan stasiun/tahun/musim memakai daftar posisi baris yang dihitung sekali.
+    """
+
+    def __init__(self, df):
+        datetimes = df['datetime'].to_numpy()
+        if not (datetimes[1:] >= datetimes[:-1]).all():
+            raise ValueError("Kolom 'datetime' harus terurut untuk membangun indeks filter.")
+        self.df = df
+        self.datetimes = datetimes
+        self.row_sets = {
+            col: {key: np.asarray(rows, dtype=np.int64)
+                  for key, rows in df.groupby(col, observed=True, sort=True).indices.items()}
+            for col in INDEXED_COLUMNS if col in df.columns
+        }
+
+    def extended(self, df, offset):
+        """
+        Membuat indeks untuk df yang berisi dataset lama ditambah baris baru
+        mulai posisi offset. Hanya posisi baris baru yang dikelompokkan.
+        """
+        appended = df.iloc[offset:]
+        index = FilterIndex.__new__(FilterIndex)
+        index.df = df
+        index.datetimes = df['datetime'].to_numpy()
+        index.row_sets = {}
+        for col, row_set in self.row_sets.items():
+            row_set = dict(row_set)
+            for key, rows in appended.groupby(col, observed=True, sort=True).indices.items():
+                rows = np.asarray(rows, dtype=np.int64) + offset
+                row_set[key] = np.concatenate([row_set[key], rows]) if key in row_set else rows
+            index.row_sets[col] = dict(sorted(row_set.items()))
+        return index
+
+    def values(self, column):
+        """
+        Daftar nilai unik kolom kategori yang terindeks.
+        """
+        return list(self.row_sets[column])
+
+    def _rows_for(self, column, selected):
+        # None berarti kolom ini tidak perlu difilter
+        row_set = self.row_sets.get(column)
+        if row_set is None or not selected or set(selected) >= set(row_set):
+            return None
+        parts = [row_set[key] for key in selected if key in row_set]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+
+    def query(self, selection):
+        """
+        Menjalankan filter tanpa menyalin DataFrame dasar.
+
+        Pilihan kosong pada stasiun/tahun/musim berarti tidak difilter, sama seperti
+        perilaku multiselect di dashboard.
+
+        Parameters:
+        - selection (FilterSelection): Pilihan filter.
+
+        Returns:
+        - FilterResult: Posisi baris yang lolos filter.
+        """
+        lo, hi = 0, len(self.datetimes)
+        if selection.start is not None:
+            lo = int(np.searchsorted(self.datetimes, np.datetime64(pd.Timestamp(selection.start)), side='left'))
+        if selection.end is not None:
+            hi = int(np.searchsorted(self.datetimes, np.datetime64(pd.Timestamp(selection.end)), side='right'))
+        hi = max(lo, hi)
+
+        candidates = [rows for rows in (
+            self._rows_for('station', selection.stations),
+            self._rows_for('year', selection.years),
+            self._rows_for('season', selection.seasons),
+        ) if rows is not None]
+        if not candidates:
+            return FilterResult(self.df, slice(lo, hi))
+
+        # Mulai dari himpunan terkecil, potong ke rentang waktu, lalu irisan dengan sisanya
+        candidates.sort(key=len)
+        rows = candidates[0]
+        rows = rows[np.searchsorted(rows, lo):np.searchsorted(rows, hi)]
+        for other in candidates[1:]:
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return FilterResult(self.df, rows)
+
+
+def get_filter_index(df):
+    """
+    Mengambil indeks filter untuk dataset, membangunnya sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses dan terurut berdasarkan 'datetime'.
+
+    Returns:
+    - FilterIndex: Indeks filter yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'filter_index', FilterIndex)
+
+
+register_extender('filter_index', lambda index, df, offset: index.extended(df, offset))
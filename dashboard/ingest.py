@@ -0,0 +1,164 @@
+import argparse
+import glob
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from schema import SEASON_BY_MONTH, apply_schema, read_csv_typed
+
+STATION_FILE_PATTERN = 'PRSA_Data_*.csv'
+PARTITION_FILE = 'part-0.parquet'
+
+
+def discover_station_files(directory, pattern=STATION_FILE_PATTERN):
+    """
+    Mencari semua file CSV stasiun PRSA di sebuah direktori.
+
+    Parameters:
+    - directory (str): Direktori yang berisi file PRSA_Data_*.csv.
+    - pattern (str): Pola nama file.
+
+    Returns:
+    - list: Path file yang ditemukan, terurut berdasarkan nama.
+    """
+    return sorted(glob.glob(os.path.join(directory, pattern)))
+
+
+def station_name_from_path(path):
+    """
+    Mengambil nama stasiun dari nama file, misalnya
+    'PRSA_Data_Changping_20130301-20170228.csv' -> 'Changping'.
+    """
+    match = re.match(r'PRSA_Data_(.+?)_\d{8}-\d{8}\.csv$', os.path.basename(path))
+    return match.group(1) if match else os.path.splitext(os.path.basename(path))[0]
+
+
+def parse_station_file(path):
+    """
+    Membaca satu file CSV stasiun dengan skema bertipe dan menyiapkan
+    kolom 'datetime' dan 'season' seperti pada combined_data.csv.
+
+    Parameters:
+    - path (str): Path ke file CSV stasiun.
+
+    Returns:
+    - pd.DataFrame: Data stasiun terurut berdasarkan datetime.
+    """
+    df = read_csv_typed(path)
+    if 'station' not in df.columns:
+        df['station'] = station_name_from_path(path)
+
+    datetime = pd.to_datetime(df[['year', 'month', 'day', 'hour']], errors='coerce')
+    df.insert(0, 'datetime', datetime)
+    df = df.dropna(subset=['datetime'])
+    df['season'] = df['month'].map(SEASON_BY_MONTH)
+    df = df.drop(columns=['No'], errors='ignore')
+    return apply_schema(df).sort_values('datetime', kind='stable').reset_index(drop=True)
+
+
+def partition_path(output_dir, station):
+    return os.path.join(output_dir, f'station={station}', PARTITION_FILE)
+
+
+def ingest_station_file(path, output_dir):
+    """
+    Memproses satu file stasiun dan menuliskannya sebagai partisi Parquet.
+    Dijalankan di proses worker.
+
+    Returns:
+    - dict: Ringkasan file (stasiun, jumlah baris, waktu parsing dan penulisan).
+    """
+    start = time.perf_counter()
+    df = parse_station_file(path)
+    parsed = time.perf_counter()
+
+    station = str(df['station'].iloc[0]) if len(df) else station_name_from_path(path)
+    target = partition_path(output_dir, station)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    df.to_parquet(f'{target}.part', index=False)
+    os.replace(f'{target}.part', target)
+    written = time.perf_counter()
+
+    return {
+        'file': os.path.basename(path),
+        'station': station,
+        'rows': len(df),
+        'parse_s': parsed - start,
+        'write_s': written - parsed,
+    }
+
+
+def ingest_directory(data_dir, output_dir, workers=None):
+    """
+    Memproses semua file stasiun secara paralel menjadi dataset Parquet terpartisi
+    per stasiun (output_dir/station=<nama>/part-0.parquet).
+
+    Parameters:
+    - data_dir (str): Direktori berisi file PRSA_Data_*.csv.
+    - output_dir (str): Direktori keluaran dataset terpartisi.
+    - workers (int): Jumlah proses worker. Default jumlah core CPU.
+
+    Returns:
+    - pd.DataFrame: Ringkasan per file (stasiun, jumlah baris, waktu per tahap).
+    """
+    files = discover_station_files(data_dir)
+    if not files:
+        raise FileNotFoundError(
+            f"Tidak ada file {STATION_FILE_PATTERN} di direktori '{data_dir}'.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(ingest_station_file, files, [output_dir] * len(files)))
+    return pd.DataFrame(results)
+
+
+def read_station_dataset(output_dir):
+    """
+    Membaca dataset Parquet terpartisi per stasiun menjadi satu DataFrame.
+
+    Parameters:
+    - output_dir (str): Direktori dataset hasil ingest_directory.
+
+    Returns:
+    - pd.DataFrame: Data semua stasiun, terurut berdasarkan datetime.
+    """
+    parts = sorted(glob.glob(os.path.join(output_dir, 'station=*', '*.parquet')))
+    if not parts:
+        raise FileNotFoundError(f"Tidak ada partisi Parquet di '{output_dir}'.")
+    frames = [pd.read_parquet(part) for part in parts]
+    # Kategori tiap partisi berbeda, sehingga kolom kategori disatukan ulang
+    for col in ('station', 'season'):
+        categories = sorted(set().union(*(frame[col].astype(str).unique() for frame in frames)))
+        for frame in frames:
+            frame[col] = frame[col].astype(pd.CategoricalDtype(categories))
+    df = pd.concat(frames, ignore_index=True)
+    return apply_schema(df).sort_values('datetime', kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Menggabungkan file PRSA_Data_*.csv menjadi dataset Parquet terpartisi per stasiun.')
+    parser.add_argument('data_dir', help='Direktori berisi file PRSA_Data_*.csv')
+    parser.add_argument('--output', default=os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '.data_cache', 'stations'),
+        help='Direktori keluaran dataset terpartisi')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Jumlah proses worker (default: jumlah core CPU)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = ingest_directory(args.data_dir, args.output, args.workers)
+    elapsed = time.perf_counter() - start
+
+    with pd.option_context('display.width', 120, 'display.float_format', '{:.3f}'.format):
+        print(report.to_string(index=False))
+    total_rows = report['rows'].sum()
+    print(f"\n{len(report)} file, {total_rows} baris dalam {elapsed:.2f} detik "
+          f"({total_rows / elapsed:,.0f} baris/detik) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+import argparse
+import glob
+import json
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from data_loader import dataset_fingerprint, extend_dataset, forget_dataset
+from schema import (MEASUREMENT_COLUMNS, POLLUTANT_COLUMNS, SEASON_BY_MONTH,
+                    WIND_DIRECTIONS, apply_schema)
+
+# Direktori store data live (kosong berarti fitur data live tidak aktif)
+DEFAULT_LIVE_STORE = os.environ.get('AIR_QUALITY_LIVE_STORE', '')
+
+# Urutan kolom mengikuti combined_data.csv
+LIVE_COLUMNS = ['datetime', 'year', 'month', 'day', 'hour', *MEASUREMENT_COLUMNS[:10],
+                'wd', 'WSPM', 'station', 'season']
+
+# Observasi ditahan sampai semua stasiun yang mengirim data live mencapai
+# waktunya, agar dataset tetap terurut berdasarkan datetime. Stasiun yang
+# tertinggal lebih dari batas ini dari stasiun terbaru tidak ditunggu; barisnya
+# yang datang kemudian tetapi lebih awal dari data live yang sudah ditambahkan
+# dilewati dan dihitung di LiveStatus.late_rows
+LIVE_MAX_DELAY = pd.Timedelta(hours=int(os.environ.get('AIR_QUALITY_LIVE_MAX_DELAY_HOURS', 6)))
+
+LiveStatus = namedtuple(
+    'LiveStatus', ['version', 'applied_rows', 'pending_rows', 'snapshot_rows', 'late_rows'])
+
+_store_lock = threading.Lock()
+_sessions = {}
+
+
+class LiveStore:
+    """
+    Store append-only untuk observasi per jam yang datang setelah snapshot dataset.
+
+    Setiap penambahan ditulis sebagai file Parquet baru per stasiun × bulan
+    (station=<nama>/month=<YYYY-MM>/part-<versi>.parquet) dan dicatat di
+    manifest.json dengan nomor versi yang terus naik. File lama tidak pernah
+    ditulis ulang, sehingga pembaca cukup membaca file dari versi yang belum dilihat.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+
+    def manifest(self):
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'version': 0, 'last': {}, 'appends': []}
+
+    @property
+    def version(self):
+        return self.manifest()['version']
+
+    def validate(self, rows):
+        """
+        Memvalidasi dan menormalkan observasi baru sesuai skema dataset.
+
+        Kolom 'datetime' dapat diberikan langsung atau dibentuk dari kolom
+        year/month/day/hour. Kolom pengukuran yang tidak ada diisi NaN.
+
+        Parameters:
+        - rows (pd.DataFrame): Observasi baru, satu baris per stasiun per jam.
+
+        Returns:
+        - pd.DataFrame: Observasi dengan kolom dan dtype sesuai skema, terurut berdasarkan datetime.
+        """
+        df = pd.DataFrame(rows).copy()
+        if 'station' not in df.columns:
+            raise ValueError("Kolom 'station' wajib ada.")
+        if 'datetime' in df.columns:
+            df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
+        elif {'year', 'month', 'day', 'hour'} <= set(df.columns):
+            df['datetime'] = pd.to_datetime(df[['year', 'month', 'day', 'hour']], errors='coerce')
+        else:
+            raise ValueError("Kolom 'datetime' atau year/month/day/hour wajib ada.")
+
+        errors = []
+        if df['datetime'].isna().any():
+            errors.append(f"{int(df['datetime'].isna().sum())} baris memiliki 'datetime' tidak valid")
+        elif (df['datetime'] != df['datetime'].dt.floor('h')).any():
+            errors.append("'datetime' harus tepat di awal jam")
+        if df['station'].isna().any():
+            errors.append("'station' tidak boleh kosong")
+        if df.duplicated(['station', 'datetime']).any():
+            errors.append('ada baris ganda untuk stasiun dan jam yang sama')
+
+        for col in MEASUREMENT_COLUMNS:
+            if col not in df.columns:
+                df[col] = np.nan
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        negative = [col for col in POLLUTANT_COLUMNS if (df[col] < 0).any()]
+        if negative:
+            errors.append(f"nilai polutan negatif pada kolom {', '.join(negative)}")
+        if 'wd' not in df.columns:
+            df['wd'] = np.nan
+        unknown_wd = set(df['wd'].dropna()) - set(WIND_DIRECTIONS)
+        if unknown_wd:
+            errors.append(f"arah angin tidak dikenal: {', '.join(sorted(map(str, unknown_wd)))}")
+
+        if not errors:
+            last = self.manifest()['last']
+            for station, times in df.groupby('station')['datetime']:
+                if str(station) in last and times.min() <= pd.Timestamp(last[str(station)]):
+                    errors.append(f"data stasiun {station} harus setelah {last[str(station)]}")
+        if errors:
+            raise ValueError('Observasi tidak valid: ' + '; '.join(errors) + '.')
+
+        df['year'] = df['datetime'].dt.year
+        df['month'] = df['datetime'].dt.month
+        df['day'] = df['datetime'].dt.day
+        df['hour'] = df['datetime'].dt.hour
+        df['season'] = df['month'].map(SEASON_BY_MONTH)
+        df['station'] = df['station'].astype(str)
+        df = apply_schema(df[LIVE_COLUMNS])
+        return df.sort_values(['datetime', 'station'], kind='stable').reset_index(drop=True)
+
+    def append(self, rows):
+        """
+        Memvalidasi lalu menambahkan observasi baru ke store.
+
+        Parameters:
+        - rows (pd.DataFrame): Observasi baru (lihat validate).
+
+        Returns:
+        - int: Nomor versi store setelah penambahan.
+        """
+        with _store_lock:
+            df = self.validate(rows)
+            manifest = self.manifest()
+            version = manifest['version'] + 1
+            files = []
+            month = df['datetime'].dt.strftime('%Y-%m')
+            for (station, month_key), part in df.groupby([df['station'].astype(str), month], sort=True):
+                path = os.path.join(f'station={station}', f'month={month_key}', f'part-{version:06d}.parquet')
+                target = os.path.join(self.root, path)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                part.to_parquet(f'{target}.part', index=False)
+                os.replace(f'{target}.part', target)
+                files.append(path)
+
+            for station, times in df.groupby(df['station'].astype(str))['datetime']:
+                manifest['last'][station] = times.max().isoformat()
+            manifest['appends'].append({'version': version, 'rows': len(df), 'files': files})
+            manifest['version'] = version
+            # Manifest ditulis terakhir: pembaca tidak pernah melihat versi yang belum lengkap
+            tmp_path = f'{self.manifest_path}.part'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
+        return version
+
+    def read_since(self, version):
+        """
+        Membaca observasi yang ditambahkan setelah versi tertentu.
+
+        Parameters:
+        - version (int): Versi terakhir yang sudah dibaca (0 untuk semua data).
+
+        Returns:
+        - tuple: (pd.DataFrame observasi baru terurut berdasarkan datetime, versi terbaru)
+        """
+        manifest = self.manifest()
+        paths = [os.path.join(self.root, path)
+                 for entry in manifest['appends'] if entry['version'] > version
+                 for path in entry['files']]
+        if not paths:
+            return pd.DataFrame(columns=LIVE_COLUMNS), manifest['version']
+        df = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+        df = apply_schema(df.astype({'station': str, 'season': str}))
+        return df.sort_values(['datetime', 'station'], kind='stable').reset_index(drop=True), manifest['version']
+
+    def read_all(self):
+        """
+        Membaca seluruh isi store, termasuk file yang ditulis di luar manifest.
+        """
+        paths = sorted(glob.glob(os.path.join(self.root, 'station=*', 'month=*', '*.parquet')))
+        if not paths:
+            return pd.DataFrame(columns=LIVE_COLUMNS)
+        df = pd.concat([pd.read_parquet(path).astype({'station': str, 'season': str}) for path in paths],
+                       ignore_index=True)
+        return apply_schema(df).sort_values('datetime', kind='stable').reset_index(drop=True)
+
+
+def _watermark(last):
+    # Waktu terakhir yang sudah dicapai semua stasiun yang tidak tertinggal
+    newest = max(last.values())
+    return min(time for time in last.values() if time >= newest - LIVE_MAX_DELAY)
+
+
+def sync_live_data(df, store_dir=DEFAULT_LIVE_STORE):
+    """
+    Menambahkan observasi live yang belum dilihat ke dataset bersama.
+
+    Untuk setiap dataset dasar, versi store yang terakhir diterapkan dicatat
+    sehingga rerun berikutnya hanya membaca file dari versi yang lebih baru.
+    Kubus agregat, indeks filter dan statistik korelasi diperbarui secara
+    inkremental lewat data_loader.extend_dataset.
+
+    Store hanya menjamin urutan waktu per stasiun, sedangkan dataset terurut
+    berdasarkan datetime untuk semua stasiun. Karena itu baris ditambahkan
+    sampai waktu yang sudah dicapai semua stasiun (lihat LIVE_MAX_DELAY); baris
+    setelahnya menunggu rerun berikutnya. Baris yang tidak dapat ditambahkan
+    tanpa merusak urutan tidak disisipkan, tetapi dilewati dan dihitung di
+    live_status: baris yang sudah tercakup snapshot (tidak lebih baru dari baris
+    terakhir df) dan baris terlambat (lebih awal dari data live yang sudah ditambahkan).
+
+    Parameters:
+    - df (pd.DataFrame): Dataset dasar hasil load_combined_data.
+    - store_dir (str): Direktori LiveStore. Kosong berarti tidak ada data live.
+
+    Returns:
+    - pd.DataFrame: Dataset dasar ditambah observasi live (dipakai bersama, jangan dimodifikasi).
+    """
+    if not store_dir or not os.path.exists(os.path.join(store_dir, 'manifest.json')):
+        return df
+    store = LiveStore(store_dir)
+    key = (dataset_fingerprint(df), os.path.abspath(store_dir))
+    with _store_lock:
+        state = _sessions.get(key)
+        if state is None:
+            state = {'version': 0, 'frame': df, 'pending': None, 'last': {},
+                     'applied': 0, 'snapshot': 0, 'late': 0}
+        if store.version == state['version']:
+            return state['frame']
+
+        previous = state['frame']
+        appended, latest = store.read_since(state['version'])
+        for station, times in appended.groupby('station', observed=True)['datetime']:
+            state['last'][str(station)] = times.max()
+        if state['pending'] is not None and len(state['pending']):
+            appended = pd.concat([state['pending'], appended], ignore_index=True)
+        times = appended['datetime']
+
+        snapshot = times <= df['datetime'].iloc[-1] if len(df) else pd.Series(False, index=appended.index)
+        late = ~snapshot & (times < previous['datetime'].iloc[-1] if len(previous) else False)
+        ready = ~snapshot & ~late
+        if state['last']:
+            ready &= times <= _watermark(state['last'])
+        state['snapshot'] += int(snapshot.sum())
+        state['late'] += int(late.sum())
+        state['pending'] = appended[~snapshot & ~late & ~ready]
+
+        current = previous
+        if ready.any():
+            rows = appended[ready].sort_values(['datetime', 'station'], kind='stable')
+            current = extend_dataset(previous, rows)
+            state['applied'] += len(rows)
+        if previous is not df and previous is not current:
+            forget_dataset(previous)
+        state['version'], state['frame'] = latest, current
+        _sessions[key] = state
+        return current
+
+
+def live_status(df, store_dir=DEFAULT_LIVE_STORE):
+    """
+    Status data live yang diterapkan ke dataset dasar oleh sync_live_data.
+
+    Parameters:
+    - df (pd.DataFrame): Dataset dasar hasil load_combined_data.
+    - store_dir (str): Direktori LiveStore.
+
+    Returns:
+    - LiveStatus atau None: (version, applied_rows, pending_rows, snapshot_rows,
+      late_rows), jumlah baris dihitung sejak proses dimulai. None jika data live
+      belum pernah diterapkan.
+    """
+    if not store_dir:
+        return None
+    with _store_lock:
+        state = _sessions.get((dataset_fingerprint(df), os.path.abspath(store_dir)))
+        if state is None:
+            return None
+        pending = len(state['pending']) if state['pending'] is not None else 0
+        return LiveStatus(state['version'], state['applied'], pending, state['snapshot'], state['late'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Menambahkan observasi per jam ke store data live.')
+    parser.add_argument('store', help='Direktori store data live')
+    parser.add_argument('csv', nargs='?', help='File CSV observasi baru. Tanpa file, tampilkan status store.')
+    args = parser.parse_args()
+
+    store = LiveStore(args.store)
+    if args.csv:
+        version = store.append(pd.read_csv(args.csv))
+        print(f'Observasi ditambahkan, versi store sekarang {version}.')
+    else:
+        manifest = store.manifest()
+        print(f"Versi {manifest['version']}, {sum(e['rows'] for e in manifest['appends'])} baris.")
+        for station, last in sorted(manifest['last'].items()):
+            print(f'  {station}: data terakhir {last}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from data_loader import file_sha256
+from impute import DEFAULT_NEIGHBORS, MAX_INTERPOLATION_GAP, impute_missing
+from ingest import discover_station_files, parse_station_file, station_name_from_path
+from rollup import RollupCube
+
+DEFAULT_PIPELINE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.data_cache', 'pipeline')
+
+# Naikkan versi tahap jika logikanya berubah agar hasil lama dibangun ulang
+STAGE_VERSIONS = {
+    'parse': 1,
+    'impute': 1,
+    'aggregate': 1,
+    'combine': 1,
+}
+
+
+def _digest(payload):
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class Pipeline:
+    """
+    Pipeline praproses bertahap dengan cache per partisi stasiun.
+
+    Setiap tahap disimpan dengan kunci hash dari input, parameter dan versi
+    tahapnya. Tahap dilewati jika kuncinya sama dengan build sebelumnya dan
+    outputnya masih ada, sehingga perubahan satu file stasiun hanya memproses
+    ulang partisi stasiun itu dan tahap gabungan yang bergantung padanya.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_PIPELINE_DIR, log=print):
+        self.cache_dir = cache_dir
+        self.log = log
+        self.manifest_path = os.path.join(cache_dir, 'manifest.json')
+        os.makedirs(cache_dir, exist_ok=True)
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+        self.summary = {'run': 0, 'skip': 0}
+
+    def _save_manifest(self):
+        tmp_path = f'{self.manifest_path}.part'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _change_reason(self, previous, record, output):
+        if previous is None:
+            return 'belum pernah dibangun'
+        if previous['version'] != record['version']:
+            return 'versi tahap berubah'
+        changed = sorted(name for name in set(previous['inputs']) | set(record['inputs'])
+                         if previous['inputs'].get(name) != record['inputs'].get(name))
+        if changed:
+            return f"input berubah: {', '.join(changed)}"
+        if previous['params'] != record['params']:
+            return 'parameter berubah'
+        if not os.path.exists(output):
+            return 'output hilang'
+        return None
+
+    def run_stage(self, stage, partition, inputs, params, build):
+        """
+        Menjalankan satu tahap untuk satu partisi, atau melewatinya jika tidak berubah.
+
+        Parameters:
+        - stage (str): Nama tahap (kunci STAGE_VERSIONS).
+        - partition (str): Nama partisi, misalnya nama stasiun atau 'all'.
+        - inputs (dict): Nama input -> hash isi/kunci tahap sebelumnya.
+        - params (dict): Parameter tahap yang memengaruhi output.
+        - build (callable): Fungsi tanpa argumen yang mengembalikan DataFrame output.
+
+        Returns:
+        - tuple: (path file output Parquet, kunci tahap)
+        """
+        record = {'version': STAGE_VERSIONS[stage], 'inputs': inputs, 'params': params}
+        key = _digest(record)
+        output = os.path.join(self.cache_dir, stage, f'{partition}-{key[:16]}.parquet')
+        manifest_key = f'{stage}/{partition}'
+        previous = self.manifest.get(manifest_key)
+
+        reason = self._change_reason(previous, record, output)
+        if reason is None:
+            self.summary['skip'] += 1
+            self.log(f'[skip] {manifest_key}: tidak berubah')
+            return output, key
+
+        start = time.perf_counter()
+        df = build()
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        df.to_parquet(f'{output}.part', index=False)
+        os.replace(f'{output}.part', output)
+        # Output lama partisi ini tidak dipakai lagi
+        if previous is not None and previous.get('output') != output and os.path.exists(previous['output']):
+            os.remove(previous['output'])
+
+        self.manifest[manifest_key] = {**record, 'key': key, 'output': output}
+        self._save_manifest()
+        self.summary['run'] += 1
+        self.log(f'[run ] {manifest_key}: {reason} ({time.perf_counter() - start:.2f} detik)')
+        return output, key
+
+    def run(self, data_dir, max_gap=MAX_INTERPOLATION_GAP, n_neighbors=DEFAULT_NEIGHBORS,
+            workers=None, output_csv=None):
+        """
+        Menjalankan seluruh pipeline: parse -> impute -> aggregate per stasiun,
+        lalu combine untuk semua stasiun.
+
+        Parameters:
+        - data_dir (str): Direktori berisi file PRSA_Data_*.csv.
+        - max_gap (int): Panjang celah maksimum untuk interpolasi.
+        - n_neighbors (int): Jumlah tetangga KNN.
+        - workers (int): Jumlah proses worker untuk imputasi.
+        - output_csv (str): Jika diisi, dataset gabungan juga ditulis ke CSV ini
+          (format yang sama dengan dashboard/combined_data.csv).
+
+        Returns:
+        - dict: Path output 'combined' (Parquet) dan 'aggregates' (kubus agregat).
+        """
+        files = discover_station_files(data_dir)
+        if not files:
+            raise FileNotFoundError(f"Tidak ada file PRSA_Data_*.csv di '{data_dir}'.")
+
+        imputed_keys, aggregate_keys = {}, {}
+        imputed_paths, aggregate_paths = {}, {}
+        for path in files:
+            station = station_name_from_path(path)
+            parse_path, parse_key = self.run_stage(
+                'parse', station, {'file': file_sha256(path)}, {},
+                lambda path=path: parse_station_file(path))
+
+            impute_path, impute_key = self.run_stage(
+                'impute', station, {'parse': parse_key},
+                {'max_gap': max_gap, 'n_neighbors': n_neighbors},
+                lambda parse_path=parse_path: impute_missing(
+                    pd.read_parquet(parse_path), max_gap=max_gap,
+                    n_neighbors=n_neighbors, workers=workers))
+            imputed_keys[station], imputed_paths[station] = impute_key, impute_path
+
+            aggregate_path, aggregate_key = self.run_stage(
+                'aggregate', station, {'impute': impute_key}, {},
+                lambda impute_path=impute_path: RollupCube.from_frame(
+                    pd.read_parquet(impute_path)).cells.reset_index().pipe(_flatten_columns))
+            aggregate_keys[station], aggregate_paths[station] = aggregate_key, aggregate_path
+
+        combined_path, _ = self.run_stage(
+            'combine', 'all', {f'impute/{s}': k for s, k in imputed_keys.items()}, {},
+            lambda: _combine_frames(imputed_paths.values()))
+        # Kubus gabungan hanya ditulis ulang jika kubus salah satu stasiun berubah
+        aggregates_path = os.path.join(self.cache_dir, 'aggregates.parquet')
+        aggregates_key = _digest(aggregate_keys)
+        if self.manifest.get('aggregates') != aggregates_key or not os.path.exists(aggregates_path):
+            start = time.perf_counter()
+            aggregates = pd.concat(
+                [pd.read_parquet(path) for path in aggregate_paths.values()], ignore_index=True)
+            aggregates.to_parquet(f'{aggregates_path}.part', index=False)
+            os.replace(f'{aggregates_path}.part', aggregates_path)
+            self.manifest['aggregates'] = aggregates_key
+            self._save_manifest()
+            self.log(f'[run ] aggregates: ditulis ({time.perf_counter() - start:.2f} detik)')
+        else:
+            self.log('[skip] aggregates: tidak berubah')
+
+        if output_csv:
+            csv_key = self.manifest.get('combine/all', {}).get('key')
+            if self.manifest.get('csv') != [csv_key, output_csv] or not os.path.exists(output_csv):
+                pd.read_parquet(combined_path).to_csv(output_csv, index=False)
+                self.manifest['csv'] = [csv_key, output_csv]
+                self._save_manifest()
+                self.log(f'[run ] csv: ditulis ke {output_csv}')
+            else:
+                self.log('[skip] csv: tidak berubah')
+
+        self.log(f"Selesai: {self.summary['run']} tahap dijalankan, {self.summary['skip']} dilewati.")
+        return {'combined': combined_path, 'aggregates': aggregates_path}
+
+
+def _flatten_columns(df):
+    # Kolom MultiIndex (kolom, statistik) dari kubus agregat disimpan sebagai 'kolom|statistik'
+    df.columns = ['|'.join(col).strip('|') if isinstance(col, tuple) else col for col in df.columns]
+    return df
+
+
+def _combine_frames(paths):
+    frames = [pd.read_parquet(path) for path in paths]
+    for col in ('station', 'season'):
+        categories = sorted(set().union(*(frame[col].astype(str).unique() for frame in frames)))
+        for frame in frames:
+            frame[col] = frame[col].astype(pd.CategoricalDtype(categories))
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values('datetime', kind='stable').reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pipeline praproses bertahap: parse -> impute -> aggregate -> combine.')
+    parser.add_argument('data_dir', help='Direktori berisi file PRSA_Data_*.csv')
+    parser.add_argument('--cache', default=DEFAULT_PIPELINE_DIR, help='Direktori cache pipeline')
+    parser.add_argument('--output-csv', help='Tulis dataset gabungan ke CSV ini, misalnya dashboard/combined_data.csv')
+    parser.add_argument('--max-gap', type=int, default=MAX_INTERPOLATION_GAP)
+    parser.add_argument('--neighbors', type=int, default=DEFAULT_NEIGHBORS)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    outputs = Pipeline(args.cache).run(
+        args.data_dir, max_gap=args.max_gap, n_neighbors=args.neighbors,
+        workers=args.workers, output_csv=args.output_csv)
+    for name, path in outputs.items():
+        print(f'{name}: {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,484 +1,845 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import streamlit as st
-import numpy as np
-
-
-def process_data(file_path):
-    """
-    Membaca dan memproses data dari file CSV.
-
-    Parameters:
-    - file_path (str): Path ke file CSV.
-
-    Returns:
-    - pd.DataFrame: DataFrame yang telah diproses.
-    """
-    try:
-        # Membaca file CSV
-        df = pd.read_csv(file_path)
-    except FileNotFoundError:
-        st.error(f"File '{file_path}' tidak ditemukan. Pastikan path benar.")
-        st.stop()
-    except pd.errors.EmptyDataError:
-        st.error("File CSV kosong.")
-        st.stop()
-    except Exception as e:
-        st.error(f"Terjadi kesalahan saat membaca file CSV: {e}")
-        st.stop()
-
-    # Konversi kolom 'datetime' jika ada
-    if 'datetime' in df.columns:
-        try:
-            df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
-        except Exception as e:
-            st.error(
-                f"Terjadi kesalahan saat mengonversi kolom 'datetime': {e}")
-            st.stop()
-    else:
-        st.error("Kolom 'datetime' tidak ditemukan dalam dataset.")
-        st.stop()
-
-    # Validasi nilai 'datetime'
-    invalid_datetime = df['datetime'].isna().sum()
-    if invalid_datetime > 0:
-        st.warning(
-            f"Ada {invalid_datetime} baris dengan nilai 'datetime' tidak valid. Baris ini akan dihapus.")
-        df = df.dropna(subset=['datetime'])
-
-    # Mengurutkan DataFrame berdasarkan datetime
-    df = df.sort_values(by='datetime').reset_index(drop=True)
-
-    return df
-
-
-def plot_pm_variation_combined(df, style, palette):
-    """
-    Membuat visualisasi tren bulanan rata-rata PM2.5 dan PM10 untuk setiap kota.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - style (str): Gaya seaborn yang dipilih.
-    - palette (str): Palet warna seaborn yang dipilih.
-    """
-    # Pastikan kolom 'date' tidak menjadi indeks, atau buat ulang kolom 'date'
-    if isinstance(df.index, pd.DatetimeIndex):
-        df = df.reset_index()
-
-    # Menghitung Rata-rata PM2.5 dan PM10 per Bulan untuk Setiap Kota
-    df['datetime'] = pd.to_datetime(
-        df[['year', 'month', 'day', 'hour']], errors='coerce')
-    # Mengelompokkan berdasarkan periode bulanan
-    df['month_year'] = df['datetime'].dt.to_period('M')
-    monthly_avg = df.groupby(['station', 'month_year'])[
-        ['PM2.5', 'PM10']].mean().reset_index()
-
-    # Konversi kembali 'month_year' ke datetime untuk plotting
-    monthly_avg['month_year'] = monthly_avg['month_year'].dt.to_timestamp()
-
-    # Visualisasi
-    plt.figure(figsize=(14, 8))
-    sns.set_style(style)
-    sns.set_palette(palette)
-
-    # PM2.5
-    plt.subplot(2, 1, 1)
-    sns.lineplot(data=monthly_avg, x='month_year',
-                 y='PM2.5', hue='station', marker='o')
-    plt.title('Tren Rata-rata Bulanan PM2.5 di Changping dan Aotizhongxin')
-    plt.xlabel('Bulan')
-    plt.ylabel('PM2.5')
-    plt.legend(title='Kota')
-
-    # PM10
-    plt.subplot(2, 1, 2)
-    sns.lineplot(data=monthly_avg, x='month_year',
-                 y='PM10', hue='station', marker='o')
-    plt.title('Tren Rata-rata Bulanan PM10 di Changping dan Aotizhongxin')
-    plt.xlabel('Bulan')
-    plt.ylabel('PM10')
-    plt.legend(title='Kota')
-
-    plt.tight_layout()
-    st.pyplot(plt.gcf())
-    plt.clf()
-
-
-def plot_weather_pollution_correlation(df, style, palette):
-    """
-    Membuat visualisasi korelasi antara kondisi cuaca dan tingkat polusi,
-    menggunakan heatmap dan scatter plots.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - style (str): Gaya seaborn yang dipilih.
-    - palette (str): Palet warna seaborn yang dipilih.
-    """
-    weather_pollutant_cols = ['TEMP', 'PRES', 'WSPM', 'PM2.5', 'PM10']
-
-    # a. Menghitung Matriks Korelasi
-    correlation_matrix = df[weather_pollutant_cols].corr()
-
-    # b. Visualisasi Heatmap Korelasi
-    plt.figure(figsize=(8, 6))
-    sns.set_style(style)
-    sns.heatmap(correlation_matrix, annot=True, fmt=".2f",
-                cmap='coolwarm', vmin=-1, vmax=1)
-    plt.title('Heatmap Korelasi Antara Kondisi Cuaca dan Tingkat Polusi')
-    st.pyplot(plt.gcf())
-    plt.clf()
-
-    # c. Visualisasi Scatter Plots
-    sns.set_palette(palette)
-    pairplot_fig = sns.pairplot(
-        df, vars=weather_pollutant_cols, hue='station', palette='viridis')
-    pairplot_fig.fig.suptitle(
-        'Scatter Plots Korelasi Kondisi Cuaca dan Polusi per Kota', y=1.02)
-    st.pyplot(pairplot_fig.fig)
-
-
-def plot_pollutant_correlation(df, style, palette):
-    """
-    Membuat heatmap korelasi antar polutan udara.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - style (str): Gaya seaborn yang dipilih.
-    - palette (str): Palet warna seaborn yang dipilih.
-    """
-    # Pastikan kolom polutan ada di dataset
-    pollutant_cols = ['SO2', 'NO2', 'CO', 'O3']
-    if not set(pollutant_cols).issubset(df.columns):
-        st.error(f"Kolom-kolom {pollutant_cols} tidak ditemukan dalam data.")
-        return
-
-    # Menghitung matriks korelasi
-    pollutant_corr = df[pollutant_cols].corr()
-
-    # Visualisasi Heatmap
-    plt.figure(figsize=(6, 5))
-    sns.set_style(style)
-    sns.heatmap(pollutant_corr, annot=True, fmt=".2f",
-                cmap='coolwarm', vmin=-1, vmax=1)
-    plt.title('Heatmap Korelasi Antar Polutan Udara')
-    st.pyplot(plt.gcf())
-    plt.clf()
-
-
-def plot_station_pollutant_avg(df, pollutants, style, palette):
-    """
-    Membuat visualisasi rata-rata konsentrasi polutan per stasiun.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - pollutants (list): Daftar nama kolom polutan untuk divisualisasikan.
-    - style (str): Gaya seaborn yang dipilih.
-    - palette (str): Palet warna seaborn yang dipilih.
-    """
-    # Pastikan kolom polutan dan 'station' ada di dataset
-    if not {'station'}.issubset(df.columns):
-        st.error("Kolom 'station' tidak ditemukan dalam data.")
-        return
-    if not set(pollutants).issubset(df.columns):
-        st.error(f"Kolom-kolom {pollutants} tidak ditemukan dalam data.")
-        return
-
-    # Menghitung rata-rata konsentrasi polutan per stasiun
-    station_pollutant_avg = df.groupby(
-        'station')[pollutants].mean().reset_index()
-
-    # Visualisasi
-    plt.figure(figsize=(18, 12))
-    sns.set_style(style)
-    sns.set_palette(palette)
-
-    for i, pol in enumerate(pollutants, 1):
-        plt.subplot(2, 3, i)
-        sns.barplot(x='station', y=pol,
-                    data=station_pollutant_avg, palette='viridis')
-        plt.title(f'Rata-rata {pol} per Stasiun')
-        plt.xlabel('Stasiun')
-        plt.ylabel(pol)
-        plt.xticks(rotation=45)
-
-    plt.tight_layout()
-    st.pyplot(plt.gcf())
-    plt.clf()
-
-
-def plot_monthly_pollutant_trends(df, pollutant_columns, style="darkgrid",palette="viridis"):
-    """
-    Membuat plot tren rata-rata bulanan polutan udara sepanjang tahun.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - pollutant_columns (list): Daftar nama kolom untuk polutan yang akan dianalisis.
-    - palette (str): Palet warna seaborn untuk plot.
-    - style (str): Gaya seaborn untuk plot.
-
-    Returns:
-    - None
-    """
-    st.subheader("Tren Rata-rata Bulanan Polutan Udara Sepanjang Tahun")
-
-    # Mengatur gaya seaborn
-    sns.set_style(style)
-    sns.set_palette(palette)
-
-    # Validasi kolom 'datetime'
-    if 'datetime' not in df.columns:
-        st.error("Kolom 'datetime' tidak ditemukan dalam dataset.")
-        return
-    if not pd.api.types.is_datetime64_any_dtype(df['datetime']):
-        try:
-            df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
-        except Exception as e:
-            st.error(f"Error saat mengonversi kolom 'datetime': {e}")
-            return
-
-    # Resampling data per bulan dan menghitung rata-rata polutan
-    try:
-        monthly_pollutant_avg = df.set_index(
-            'datetime')[pollutant_columns].resample('M').mean().reset_index()
-    except Exception as e:
-        st.error(f"Error saat melakukan resampling data: {e}")
-        return
-
-    # Membuat plot
-    plt.figure(figsize=(14, 10))
-    for pol in pollutant_columns:
-        plt.plot(monthly_pollutant_avg['datetime'],
-                 monthly_pollutant_avg[pol], label=pol)
-    plt.title('Tren Rata-rata Bulanan Polutan Udara Sepanjang Tahun')
-    plt.xlabel('Bulan')
-    plt.ylabel('Konsentrasi Polutan')
-    plt.legend()
-    plt.grid(True)
-
-    # Menampilkan plot di Streamlit
-    st.pyplot(plt.gcf())
-    plt.clf()
-
-
-def plot_station_temperature_stats(df, style="darkgrid", palette="coolwarm"):
-    """
-    Membuat plot suhu tertinggi dan terendah per stasiun, serta menampilkan informasi
-    stasiun dengan suhu tertinggi dan terendah.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - palette (str): Palet warna seaborn untuk plot.
-    - style (str): Gaya seaborn untuk plot.
-
-    Returns:
-    - None
-    """
-    st.subheader("Suhu Tertinggi dan Terendah per Stasiun")
-
-    # Mengatur gaya seaborn
-    sns.set_style(style)
-    sns.set_palette(palette)
-
-    # Pastikan kolom 'TEMP' dan 'station' ada
-    required_columns = {'TEMP', 'station'}
-    if not required_columns.issubset(df.columns):
-        st.error(f"Kolom berikut wajib ada dalam dataset: {required_columns}")
-        return
-
-    # Menghitung suhu minimum dan maksimum per stasiun
-    try:
-        station_temp_stats = df.groupby('station')['TEMP'].agg(
-            ['min', 'max']).reset_index()
-    except Exception as e:
-        st.error(f"Error saat menghitung statistik suhu: {e}")
-        return
-
-    # Menemukan stasiun dengan suhu terendah dan tertinggi
-    try:
-        lowest_temp_station = station_temp_stats.loc[station_temp_stats['min'].idxmin(
-        )]
-        highest_temp_station = station_temp_stats.loc[station_temp_stats['max'].idxmax(
-        )]
-    except Exception as e:
-        st.error(f"Error saat menentukan stasiun dengan suhu ekstrem: {e}")
-        return
-
-    # Menampilkan hasil di Streamlit
-    st.write(
-        f"**Suhu terendah**: {lowest_temp_station['min']}°C di stasiun **{lowest_temp_station['station']}**")
-    st.write(
-        f"**Suhu tertinggi**: {highest_temp_station['max']}°C di stasiun **{highest_temp_station['station']}**")
-
-    # Visualisasi suhu per stasiun
-    try:
-        melted_temp = station_temp_stats.melt(
-            id_vars='station',
-            value_vars=['min', 'max'],
-            var_name='Temperature_Type',
-            value_name='Temperature'
-        )
-
-        plt.figure(figsize=(14, 8))
-        sns.barplot(
-            x='station',
-            y='Temperature',
-            hue='Temperature_Type',
-            data=melted_temp,
-            palette=palette
-        )
-        plt.title('Suhu Tertinggi dan Terendah per Stasiun')
-        plt.xlabel('Stasiun')
-        plt.ylabel('Suhu (°C)')
-        plt.xticks(rotation=45)
-        plt.legend(title='Jenis Suhu')
-
-        # Menampilkan plot di Streamlit
-        st.pyplot(plt.gcf())
-        plt.clf()
-    except Exception as e:
-        st.error(f"Error saat membuat visualisasi: {e}")
-
-
-def plot_highest_rainfall_station(df, style="darkgrid", palette="Blues_d"):
-    """
-    Membuat plot curah hujan tertinggi per stasiun, serta menampilkan informasi
-    stasiun dengan curah hujan tertinggi.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang telah diproses.
-    - palette (str): Palet warna seaborn untuk plot.
-    - style (str): Gaya seaborn untuk plot.
-
-    Returns:
-    - None
-    """
-    st.subheader("Curah Hujan Tertinggi per Stasiun")
-
-    # Mengatur gaya seaborn
-    sns.set_style(style)
-    sns.set_palette(palette)
-
-    # Pastikan kolom 'RAIN' dan 'station' ada
-    required_columns = {'RAIN', 'station'}
-    if not required_columns.issubset(df.columns):
-        st.error(f"Kolom berikut wajib ada dalam dataset: {required_columns}")
-        return
-
-    # Menghitung curah hujan maksimum per stasiun
-    try:
-        station_rain_max = df.groupby('station')['RAIN'].max().reset_index()
-    except Exception as e:
-        st.error(f"Error saat menghitung curah hujan maksimum: {e}")
-        return
-
-    # Menemukan stasiun dengan curah hujan tertinggi
-    try:
-        highest_rain_station = station_rain_max.loc[station_rain_max['RAIN'].idxmax(
-        )]
-    except Exception as e:
-        st.error(
-            f"Error saat menentukan stasiun dengan curah hujan tertinggi: {e}")
-        return
-
-    # Menampilkan hasil di Streamlit
-    st.write(
-        f"**Curah hujan tertinggi**: {highest_rain_station['RAIN']} mm di stasiun **{highest_rain_station['station']}**"
-    )
-
-    # Visualisasi curah hujan per stasiun
-    try:
-        plt.figure(figsize=(14, 8))
-        sns.barplot(
-            x='station',
-            y='RAIN',
-            data=station_rain_max,
-            palette=palette
-        )
-        plt.title('Curah Hujan Tertinggi per Stasiun')
-        plt.xlabel('Stasiun')
-        plt.ylabel('Curah Hujan (mm)')
-        plt.xticks(rotation=45)
-
-        # Menampilkan plot di Streamlit
-        st.pyplot(plt.gcf())
-        plt.clf()
-    except Exception as e:
-        st.error(f"Error saat membuat visualisasi: {e}")
-
-
-def display_filtered_dataframe(df):
-    """
-    Menampilkan DataFrame dengan filter langsung di dashboard Streamlit.
-
-    Parameters:
-    - df (pd.DataFrame): DataFrame yang akan difilter dan ditampilkan.
-    """
-    st.subheader("Filter DataFrame")
-
-    # Validasi kolom 'datetime'
-    if 'datetime' not in df.columns:
-        st.error("Kolom 'datetime' tidak ditemukan dalam dataset.")
-        return
-
-    # Konversi kolom 'datetime' ke tipe datetime64 jika belum
-    if not pd.api.types.is_datetime64_any_dtype(df['datetime']):
-        try:
-            df['datetime'] = pd.to_datetime(df['datetime'], errors='coerce')
-        except Exception as e:
-            st.error(f"Error saat mengonversi kolom 'datetime': {e}")
-            return
-
-    # Filter untuk kolom 'station'
-    selected_station = st.multiselect(
-        "Pilih Stasiun", df['station'].unique(), default=df['station'].unique()
-    )
-
-    # Filter untuk kolom 'year'
-    selected_year = st.multiselect(
-        "Pilih Tahun", df['year'].unique(), default=df['year'].unique()
-    )
-
-    # Filter untuk kolom 'season'
-    selected_season = st.multiselect(
-        "Pilih Musim", df['season'].unique(), default=df['season'].unique()
-    )
-
-    # Slider untuk rentang waktu
-    # Konversi ke Python datetime
-    min_datetime = df['datetime'].min().to_pydatetime()
-    # Konversi ke Python datetime
-    max_datetime = df['datetime'].max().to_pydatetime()
-
-    # Validasi nilai minimum dan maksimum
-    if pd.isnull(min_datetime) or pd.isnull(max_datetime):
-        st.error("Nilai minimum atau maksimum datetime tidak valid.")
-        return
-
-    # Slider untuk memilih rentang waktu
-    selected_datetime_range = st.slider(
-        "Pilih Rentang Waktu",
-        min_value=min_datetime,
-        max_value=max_datetime,
-        value=(min_datetime, max_datetime),
-        format="YYYY-MM-DD HH:mm"
-    )
-
-    # Menerapkan filter pada DataFrame
-    filtered_df = df.copy()
-    if selected_station:
-        filtered_df = filtered_df[filtered_df['station'].isin(
-            selected_station)]
-    if selected_year:
-        filtered_df = filtered_df[filtered_df['year'].isin(selected_year)]
-    if selected_season:
-        filtered_df = filtered_df[filtered_df['season'].isin(selected_season)]
-    if selected_datetime_range:
-        filtered_df = filtered_df[
-            (filtered_df['datetime'] >= selected_datetime_range[0]) &
-            (filtered_df['datetime'] <= selected_datetime_range[1])
-        ]
-
-    # Menampilkan DataFrame yang telah difilter
-    st.write(f"Data setelah difilter: {filtered_df.shape[0]} baris")
-    st.dataframe(filtered_df)
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+from api import DEFAULT_API_URL, export_url
+from aqi import AQI_CATEGORIES, AQI_CATEGORY_BOUNDS, AQI_COLORS, ROLLING_WINDOWS, get_rolling_aqi
+from corr_stats import get_correlation_stats
+from data_loader import load_combined_data
+from dataset import AirQualityDataset, DatasetError, get_dataset
+from density import DEFAULT_POINT_BUDGET, pair_histograms, stratified_sample
+from export import EXPORT_FORMATS, export_to_file
+from figure_cache import figure_cache, figure_cache_key
+from filter_engine import FilterSelection, get_filter_index
+from live_store import DEFAULT_LIVE_STORE, live_status, sync_live_data
+from profiling import profile_block, profiled, record_timing
+from range_index import get_range_index
+from render import render_pool
+from rollup import get_rollup
+from schema import MONTH_NAMES, WIND_DIRECTIONS
+from seasonal import ANOMALY_THRESHOLD, MONTH_OF_DAY, get_seasonal_analysis
+from timeseries import DEFAULT_LINE_POINTS, FREQUENCY_LABELS, get_resample_cache
+from windrose import SPEED_BANDS, get_wind_rose
+
+
+@profiled()
+def process_data(file_path, offline=None, refresh=False, live_store=DEFAULT_LIVE_STORE):
+    """
+    Membaca dan memproses data dari file CSV.
+
+    Data dimuat lewat cache lokal (lihat data_loader.load_combined_data) sehingga
+    file remote hanya diunduh sekali dan hasil parsing dipakai bersama oleh semua sesi.
+    Skemanya divalidasi sekali per versi dataset (lihat dataset.AirQualityDataset).
+
+    Parameters:
+    - file_path (str): Path atau URL ke file CSV.
+    - offline (bool): Baca snapshot lokal terakhir tanpa akses jaringan.
+    - refresh (bool): Unduh ulang data dan abaikan cache di memori.
+    - live_store (str): Direktori LiveStore berisi observasi baru. Hanya observasi
+      yang belum dilihat sejak rerun sebelumnya yang dibaca dan ditambahkan.
+
+    Returns:
+    - AirQualityDataset: Dataset tervalidasi dan read-only yang dipakai bersama.
+    """
+    try:
+        result = load_combined_data(
+            file_path, offline=offline, refresh=refresh)
+    except FileNotFoundError as e:
+        st.error(f"File '{file_path}' tidak ditemukan. Pastikan path benar. ({e})")
+        st.stop()
+    except pd.errors.EmptyDataError:
+        st.error("File CSV kosong.")
+        st.stop()
+    except KeyError:
+        st.error("Kolom 'datetime' tidak ditemukan dalam dataset.")
+        st.stop()
+    except Exception as e:
+        st.error(f"Terjadi kesalahan saat membaca file CSV: {e}")
+        st.stop()
+
+    # Validasi nilai 'datetime'
+    if result.invalid_rows > 0:
+        st.warning(
+            f"Ada {result.invalid_rows} baris dengan nilai 'datetime' tidak valid. Baris ini telah dihapus.")
+
+    try:
+        df = sync_live_data(result.frame, live_store)
+    except (OSError, ValueError) as e:
+        st.warning(f"Data live tidak dapat dimuat, menampilkan snapshot saja: {e}")
+        df = result.frame
+    status = live_status(result.frame, live_store)
+    if status is not None and (status.snapshot_rows or status.late_rows):
+        st.warning(
+            f"{status.snapshot_rows + status.late_rows} baris data live dilewati: "
+            f"{status.snapshot_rows} sudah tercakup snapshot dan {status.late_rows} datang "
+            f"lebih awal dari data live yang sudah ditampilkan.")
+
+    try:
+        return get_dataset(df)
+    except DatasetError as e:
+        st.error(f"Dataset tidak valid: {e}")
+        st.stop()
+
+
+def show_cached_figure(name, dataset, params, style, palette, prepare, context='notebook'):
+    """
+    Menampilkan gambar dari cache, atau merendernya lalu menyimpannya ke cache.
+
+    Agregasi dijalankan di proses ini (memakai struktur turunan yang di-cache),
+    sedangkan pembuatan dan encoding gambar dijalankan di pool render (render.py)
+    dengan gaya seaborn yang hanya berlaku untuk gambar tersebut.
+
+    Parameters:
+    - name (str): Nama fungsi plot (bagian dari kunci cache).
+    - dataset (AirQualityDataset): Dataset sumber, dipakai untuk fingerprint dataset.
+    - params (tuple): Parameter lain yang memengaruhi gambar (kolom, filter, mode).
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - prepare (callable): Fungsi tanpa argumen yang mengembalikan tuple
+      (jenis gambar, data, argumen pembuat gambar, daftar teks markdown yang
+      ditampilkan sebelum gambar). Hanya dipanggil jika gambar belum ada di cache.
+    - context (str): Context seaborn yang dipilih.
+    """
+    key = figure_cache_key(name, dataset.fingerprint, params, style, palette, context)
+    entry = figure_cache.get(key)
+    if entry is None:
+        with profile_block(f'{name}.prepare'):
+            kind, data, figure_params, notes = prepare()
+        with profile_block(f'{name}.render'):
+            png, draw_s, encode_s = render_pool.render(
+                key, kind, data, style, palette, context, figure_params)
+        # Waktu di worker dicatat terpisah: penggambaran seaborn dan encoding PNG
+        record_timing(f'{name}.draw', draw_s)
+        record_timing(f'{name}.encode', encode_s)
+        entry = figure_cache.put(key, png, notes)
+
+    for note in entry.notes:
+        st.write(note)
+    with profile_block(f'{name}.send'):
+        st.image(entry.png, use_container_width=True)
+
+
+def prepare_pm_variation(dataset):
+    """
+    Menyiapkan data gambar tren bulanan rata-rata PM2.5 dan PM10 per kota.
+
+    Fungsi prepare_* tidak memakai Streamlit sehingga dapat dipakai ulang di luar
+    dashboard (lihat report.py). Semuanya mengembalikan tuple (jenis gambar, data,
+    argumen pembuat gambar, daftar teks markdown).
+    """
+    # Menghitung Rata-rata PM2.5 dan PM10 per Bulan untuk Setiap Kota dari kubus agregat
+    monthly_avg = get_rollup(dataset.frame, dataset.month_year).mean(
+        ['station', 'month_year'], ['PM2.5', 'PM10'])
+    return 'pm_variation', monthly_avg, {}, ()
+
+
+@profiled()
+def plot_pm_variation_combined(dataset, style, palette, context='notebook'):
+    """
+    Membuat visualisasi tren bulanan rata-rata PM2.5 dan PM10 untuk setiap kota.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - context (str): Context seaborn yang dipilih.
+    """
+    show_cached_figure('plot_pm_variation_combined', dataset, (),
+                       style, palette, partial(prepare_pm_variation, dataset), context)
+
+
+WEATHER_POLLUTANT_COLUMNS = ['TEMP', 'PRES', 'WSPM', 'PM2.5', 'PM10']
+
+# Pada mode 'auto', data yang lebih besar dari kelipatan point_budget ini digambar
+# sebagai histogram 2D: sampel sebesar point_budget tidak lagi mewakili sebarannya
+DENSITY_MIN_BUDGETS = 20
+
+
+def prepare_weather_heatmap(dataset, selection=None):
+    """
+    Menyiapkan heatmap korelasi kondisi cuaca dan tingkat polusi sesuai filter.
+    """
+    # a. Menghitung Matriks Korelasi dari statistik blok sesuai filter
+    correlation_matrix = get_correlation_stats(dataset.frame).correlation(
+        selection, WEATHER_POLLUTANT_COLUMNS)
+
+    # b. Visualisasi Heatmap Korelasi
+    return 'correlation_heatmap', correlation_matrix, {
+        'title': 'Heatmap Korelasi Antara Kondisi Cuaca dan Tingkat Polusi',
+        'figsize': (8, 6),
+    }, ()
+
+
+def prepare_weather_pairplot(dataset, render_mode='density', point_budget=DEFAULT_POINT_BUDGET):
+    """
+    Menyiapkan pairplot kondisi cuaca dan polusi per stasiun.
+
+    Parameters:
+    - render_mode (str): 'scatter', 'sample' atau 'density' (lihat
+      plot_weather_pollution_correlation; 'auto' sudah harus diterjemahkan).
+    """
+    params = {'columns': WEATHER_POLLUTANT_COLUMNS, 'hue': 'station'}
+    if render_mode == 'density':
+        return 'pair_density', pair_histograms(dataset.frame, WEATHER_POLLUTANT_COLUMNS, 'station'), params, ()
+
+    data, notes = dataset.frame[WEATHER_POLLUTANT_COLUMNS + ['station']], ()
+    if render_mode == 'sample':
+        data = stratified_sample(data, 'station', point_budget)
+        notes = (f"Menampilkan sampel berstrata {len(data)} titik dari {data['station'].nunique()} stasiun.",)
+    return 'pair_scatter', data, params, notes
+
+
+@profiled()
+def plot_weather_pollution_correlation(dataset, style, palette, render_mode='auto',
+                                       point_budget=DEFAULT_POINT_BUDGET, selection=None,
+                                       context='notebook'):
+    """
+    Membuat visualisasi korelasi antara kondisi cuaca dan tingkat polusi,
+    menggunakan heatmap dan scatter plots.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - render_mode (str): 'scatter' (semua titik), 'sample' (sampel berstrata per stasiun),
+      'density' (histogram 2D per stasiun), atau 'auto' (scatter jika semua baris muat
+      dalam point_budget, sample hingga DENSITY_MIN_BUDGETS × point_budget baris,
+      density untuk data yang lebih besar).
+    - point_budget (int): Jumlah titik maksimum untuk mode sample dan batas mode 'auto'.
+      Mode 'scatter' selalu menggambar semua baris.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe untuk heatmap.
+      None berarti seluruh data.
+    - context (str): Context seaborn yang dipilih.
+    """
+    show_cached_figure('plot_weather_pollution_correlation.heatmap', dataset, (selection,),
+                       style, palette, partial(prepare_weather_heatmap, dataset, selection), context)
+
+    # c. Visualisasi Scatter Plots
+    if render_mode == 'auto':
+        if len(dataset) <= point_budget:
+            render_mode = 'scatter'
+        elif len(dataset) <= point_budget * DENSITY_MIN_BUDGETS:
+            render_mode = 'sample'
+        else:
+            render_mode = 'density'
+
+    show_cached_figure('plot_weather_pollution_correlation.pairplot', dataset,
+                       (render_mode, point_budget), style, palette,
+                       partial(prepare_weather_pairplot, dataset, render_mode, point_budget), context)
+
+
+CORRELATED_POLLUTANTS = ['SO2', 'NO2', 'CO', 'O3']
+
+
+def prepare_pollutant_correlation(dataset, selection=None):
+    """
+    Menyiapkan heatmap korelasi antar polutan udara sesuai filter.
+    """
+    # Menghitung matriks korelasi dari statistik blok sesuai filter
+    pollutant_corr = get_correlation_stats(dataset.frame).correlation(
+        selection, CORRELATED_POLLUTANTS)
+    return 'correlation_heatmap', pollutant_corr, {
+        'title': 'Heatmap Korelasi Antar Polutan Udara',
+        'figsize': (6, 5),
+    }, ()
+
+
+@profiled()
+def plot_pollutant_correlation(dataset, style, palette, selection=None, context='notebook'):
+    """
+    Membuat heatmap korelasi antar polutan udara.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe.
+      None berarti seluruh data.
+    - context (str): Context seaborn yang dipilih.
+    """
+    show_cached_figure('plot_pollutant_correlation', dataset, (selection,),
+                       style, palette, partial(prepare_pollutant_correlation, dataset, selection), context)
+
+
+def prepare_station_pollutant_avg(dataset, pollutants):
+    """
+    Menyiapkan bar plot rata-rata konsentrasi polutan per stasiun.
+    """
+    # Menghitung rata-rata konsentrasi polutan per stasiun dari kubus agregat
+    station_pollutant_avg = get_rollup(dataset.frame, dataset.month_year).mean(['station'], pollutants)
+    return 'station_pollutant_avg', station_pollutant_avg, {'pollutants': list(pollutants)}, ()
+
+
+@profiled()
+def plot_station_pollutant_avg(dataset, pollutants, style, palette, context='notebook'):
+    """
+    Membuat visualisasi rata-rata konsentrasi polutan per stasiun.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutants (list): Daftar nama kolom polutan untuk divisualisasikan.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - context (str): Context seaborn yang dipilih.
+    """
+    # Kolom wajib sudah dicek oleh AirQualityDataset; pollutants berasal dari pemanggil
+    if not set(pollutants).issubset(dataset.columns):
+        st.error(f"Kolom-kolom {pollutants} tidak ditemukan dalam data.")
+        return
+
+    show_cached_figure('plot_station_pollutant_avg', dataset, tuple(pollutants),
+                       style, palette, partial(prepare_station_pollutant_avg, dataset, pollutants), context)
+
+
+def prepare_pollutant_trends(dataset, pollutant_columns, frequency='monthly', start=None, end=None,
+                             stations=(), max_points=DEFAULT_LINE_POINTS):
+    """
+    Menyiapkan garis tren polutan per stasiun pada resolusi waktu yang dipilih.
+
+    Parameters:
+    - start, end (datetime): Rentang waktu (inklusif). None berarti tanpa batas.
+    - stations (tuple): Stasiun yang digambar. Kosong berarti semua.
+    """
+    cache = get_resample_cache(dataset.frame)
+    selected = [station for station in cache.stations if not stations or station in stations]
+    frames = []
+    for pol in pollutant_columns:
+        for station in selected:
+            window = cache.window(station, pol, frequency, start, end, max_points)
+            frames.append(pd.DataFrame({
+                'datetime': window['datetime'], 'station': station,
+                'pollutant': pol, 'value': window[pol]}))
+    trends = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if trends.empty:
+        raise ValueError("Tidak ada data pada rentang waktu yang dipilih.")
+    notes = (_window_note(start, end),)
+    return 'pollutant_trends', trends, {
+        'pollutants': list(pollutant_columns),
+        'title': f'Tren Rata-rata {FREQUENCY_LABELS[frequency]} Polutan Udara per Stasiun',
+    }, notes
+
+
+@profiled()
+def plot_pollutant_trends(dataset, pollutant_columns, style="darkgrid", palette="viridis", frequency='monthly',
+                          selection=None, max_points=DEFAULT_LINE_POINTS, context='notebook'):
+    """
+    Membuat plot tren rata-rata polutan udara per stasiun pada resolusi waktu yang dipilih.
+
+    Deret per (stasiun, polutan, resolusi) diambil dari cache resample (lihat
+    timeseries.ResampleCache). Hanya bagian dalam rentang waktu filter yang
+    digambar, dan setiap garis dikecilkan dengan LTTB ke paling banyak
+    max_points titik, sehingga resolusi per jam tetap cepat untuk rentang panjang.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutant_columns (list): Daftar nama kolom untuk polutan yang akan dianalisis.
+    - palette (str): Palet warna seaborn untuk plot.
+    - style (str): Gaya seaborn untuk plot.
+    - frequency (str): Resolusi waktu, salah satu timeseries.FREQUENCIES.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe. Hanya
+      rentang waktu dan stasiun yang diterapkan. None berarti seluruh data.
+    - max_points (int): Jumlah titik maksimum per garis.
+    - context (str): Context seaborn untuk plot.
+
+    Returns:
+    - None
+    """
+    st.subheader("Tren Rata-rata Polutan Udara Sepanjang Tahun")
+
+    start, end, stations = _window_params(selection)
+
+    try:
+        show_cached_figure('plot_pollutant_trends', dataset,
+                           (tuple(pollutant_columns), frequency, start, end, stations, max_points),
+                           style, palette,
+                           partial(prepare_pollutant_trends, dataset, pollutant_columns, frequency,
+                                   start, end, stations, max_points), context)
+    except Exception as e:
+        st.error(f"Error saat menghitung tren polutan: {e}")
+
+
+def plot_monthly_pollutant_trends(df, pollutant_columns, style="darkgrid", palette="viridis", context='notebook'):
+    """
+    Nama lama plot_pollutant_trends: tren bulanan untuk seluruh data tanpa filter.
+
+    Dipertahankan agar pemanggil lama tetap berjalan.
+
+    Parameters:
+    - df (pd.DataFrame or AirQualityDataset): Dataset hasil load_combined_data atau process_data.
+    - pollutant_columns (list): Daftar nama kolom untuk polutan yang akan dianalisis.
+    - palette (str): Palet warna seaborn untuk plot.
+    - style (str): Gaya seaborn untuk plot.
+    - context (str): Context seaborn untuk plot.
+
+    Returns:
+    - None
+    """
+    dataset = df if isinstance(df, AirQualityDataset) else get_dataset(df)
+    plot_pollutant_trends(dataset, pollutant_columns, style, palette, frequency='monthly', context=context)
+
+
+def _window_params(selection):
+    # Rentang waktu dan stasiun dari filter; tahun dan musim tidak berupa rentang kontigu
+    if selection is None:
+        return None, None, ()
+    return selection.start, selection.end, tuple(selection.stations)
+
+
+def _window_note(start, end):
+    if start is None and end is None:
+        return "Rentang waktu: seluruh data"
+    start = '-' if start is None else pd.Timestamp(start).strftime('%Y-%m-%d %H:%M')
+    end = '-' if end is None else pd.Timestamp(end).strftime('%Y-%m-%d %H:%M')
+    return f"Rentang waktu: {start} s.d. {end}"
+
+
+def prepare_temperature_stats(dataset, start=None, end=None, stations=()):
+    """
+    Menyiapkan suhu tertinggi dan terendah per stasiun beserta waktu terjadinya.
+    """
+    # Suhu minimum dan maksimum per stasiun pada rentang waktu dari indeks nilai ekstrem
+    station_temp_stats = get_range_index(dataset.frame).extremes('TEMP', start, end, stations)
+    if station_temp_stats.empty:
+        raise ValueError("Tidak ada data suhu pada rentang waktu yang dipilih.")
+
+    # Menemukan stasiun dengan suhu terendah dan tertinggi
+    lowest_temp_station = station_temp_stats.loc[station_temp_stats['min'].idxmin(
+    )]
+    highest_temp_station = station_temp_stats.loc[station_temp_stats['max'].idxmax(
+    )]
+    notes = (
+        _window_note(start, end),
+        f"**Suhu terendah**: {lowest_temp_station['min']:.1f}°C di stasiun **{lowest_temp_station['station']}** "
+        f"pada {lowest_temp_station['min_time']:%Y-%m-%d %H:%M}",
+        f"**Suhu tertinggi**: {highest_temp_station['max']:.1f}°C di stasiun **{highest_temp_station['station']}** "
+        f"pada {highest_temp_station['max_time']:%Y-%m-%d %H:%M}",
+    )
+
+    # Visualisasi suhu per stasiun
+    melted_temp = station_temp_stats.melt(
+        id_vars='station',
+        value_vars=['min', 'max'],
+        var_name='Temperature_Type',
+        value_name='Temperature'
+    )
+    return 'temperature_stats', melted_temp, {}, notes
+
+
+@profiled()
+def plot_station_temperature_stats(dataset, style="darkgrid", palette="coolwarm", selection=None, context='notebook'):
+    """
+    Membuat plot suhu tertinggi dan terendah per stasiun, serta menampilkan informasi
+    stasiun dengan suhu tertinggi dan terendah beserta waktu terjadinya.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - palette (str): Palet warna seaborn untuk plot.
+    - style (str): Gaya seaborn untuk plot.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe. Hanya
+      rentang waktu dan stasiun yang diterapkan. None berarti seluruh data.
+    - context (str): Context seaborn untuk plot.
+
+    Returns:
+    - None
+    """
+    st.subheader("Suhu Tertinggi dan Terendah per Stasiun")
+
+    start, end, stations = _window_params(selection)
+
+    try:
+        show_cached_figure('plot_station_temperature_stats', dataset, (start, end, stations),
+                           style, palette, partial(prepare_temperature_stats, dataset, start, end, stations), context)
+    except Exception as e:
+        st.error(f"Error saat menghitung statistik suhu: {e}")
+
+
+def prepare_rainfall(dataset, start=None, end=None, stations=()):
+    """
+    Menyiapkan curah hujan tertinggi per stasiun beserta waktu terjadinya.
+    """
+    # Curah hujan maksimum per stasiun pada rentang waktu dari indeks nilai ekstrem
+    extremes = get_range_index(dataset.frame).extremes('RAIN', start, end, stations)
+    if extremes.empty:
+        raise ValueError("Tidak ada data curah hujan pada rentang waktu yang dipilih.")
+    station_rain_max = extremes[['station', 'max']].rename(columns={'max': 'RAIN'})
+
+    # Menemukan stasiun dengan curah hujan tertinggi
+    highest_rain_station = extremes.loc[extremes['max'].idxmax()]
+    notes = (
+        _window_note(start, end),
+        f"**Curah hujan tertinggi**: {highest_rain_station['max']:.1f} mm di stasiun "
+        f"**{highest_rain_station['station']}** pada {highest_rain_station['max_time']:%Y-%m-%d %H:%M}",
+    )
+    return 'rainfall', station_rain_max, {}, notes
+
+
+@profiled()
+def plot_highest_rainfall_station(dataset, style="darkgrid", palette="Blues_d", selection=None, context='notebook'):
+    """
+    Membuat plot curah hujan tertinggi per stasiun, serta menampilkan informasi
+    stasiun dengan curah hujan tertinggi beserta waktu terjadinya.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - palette (str): Palet warna seaborn untuk plot.
+    - style (str): Gaya seaborn untuk plot.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe. Hanya
+      rentang waktu dan stasiun yang diterapkan. None berarti seluruh data.
+    - context (str): Context seaborn untuk plot.
+
+    Returns:
+    - None
+    """
+    st.subheader("Curah Hujan Tertinggi per Stasiun")
+
+    start, end, stations = _window_params(selection)
+
+    try:
+        show_cached_figure('plot_highest_rainfall_station', dataset, (start, end, stations),
+                           style, palette, partial(prepare_rainfall, dataset, start, end, stations), context)
+    except Exception as e:
+        st.error(f"Error saat membuat visualisasi: {e}")
+
+
+def prepare_aqi_overview(dataset, start=None, end=None, stations=()):
+    """
+    Menyiapkan proporsi jam per kategori AQI dan AQI harian tertinggi per stasiun.
+    """
+    engine = get_rolling_aqi(dataset.frame)
+    category_hours = engine.category_hours(start, end, stations)
+    if category_hours.to_numpy().sum() == 0:
+        raise ValueError("Tidak ada data AQI pada rentang waktu yang dipilih.")
+    daily = engine.daily_max(start, end, stations)
+    worst = daily.loc[daily['AQI'].idxmax()]
+    notes = (
+        _window_note(start, end),
+        f"**AQI harian tertinggi**: {worst['AQI']:.0f} di stasiun **{worst['station']}** "
+        f"pada {pd.Timestamp(worst['date']):%Y-%m-%d}",
+    )
+    return 'aqi_overview', (category_hours, daily), {
+        'categories': AQI_CATEGORIES,
+        'colors': AQI_COLORS,
+        'bounds': AQI_CATEGORY_BOUNDS,
+    }, notes
+
+
+@profiled()
+def plot_aqi_overview(dataset, style, palette, selection=None, context='notebook'):
+    """
+    Membuat ringkasan AQI per stasiun: proporsi jam per kategori AQI dan AQI
+    harian tertinggi, dihitung dari rata-rata bergerak (lihat aqi.RollingAQI).
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn yang dipilih.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe. Hanya
+      rentang waktu dan stasiun yang diterapkan. None berarti seluruh data.
+    - context (str): Context seaborn yang dipilih.
+    """
+    st.subheader("Indeks Kualitas Udara (AQI) per Stasiun")
+
+    start, end, stations = _window_params(selection)
+
+    try:
+        show_cached_figure('plot_aqi_overview', dataset, (start, end, stations),
+                           style, palette, partial(prepare_aqi_overview, dataset, start, end, stations), context)
+    except Exception as e:
+        st.error(f"Error saat menghitung AQI: {e}")
+
+
+def prepare_wind_rose(dataset, pollutant, selection=None):
+    """
+    Menyiapkan wind rose dan rata-rata polutan per arah × kelas kecepatan angin.
+    """
+    rose = get_wind_rose(dataset.frame).aggregate(pollutant, selection)
+    if rose['hours'].sum() == 0:
+        raise ValueError("Tidak ada data angin untuk filter yang dipilih.")
+
+    # Arah angin paling sering dan arah dengan rata-rata polutan tertinggi per stasiun
+    per_direction = rose.groupby(['station', 'direction'], sort=False)[['hours', 'measured']].sum()
+    per_direction['sum'] = (rose['mean'].fillna(0) * rose['measured']).groupby(
+        [rose['station'], rose['direction']], sort=False).sum()
+    per_direction['mean'] = per_direction['sum'] / per_direction['measured'].where(per_direction['measured'] > 0)
+    notes = []
+    for station, group in per_direction.groupby(level='station', sort=False):
+        group = group.droplevel('station')
+        line = (f"**{station}**: angin paling sering dari arah **{group['hours'].idxmax()}** "
+                f"({group['hours'].max() / group['hours'].sum():.0%} jam)")
+        if group['mean'].notna().any():
+            line += (f", rata-rata {pollutant} tertinggi saat angin dari arah "
+                     f"**{group['mean'].idxmax()}** ({group['mean'].max():.1f})")
+        notes.append(line)
+    return 'wind_rose', rose, {
+        'pollutant': pollutant,
+        'directions': WIND_DIRECTIONS,
+        'bands': SPEED_BANDS,
+    }, tuple(notes)
+
+
+@profiled()
+def plot_wind_rose(dataset, pollutant, style, palette, selection=None, context='notebook'):
+    """
+    Membuat wind rose per stasiun beserta rata-rata polutan per arah dan kecepatan angin.
+
+    Jumlah jam dan rata-rata polutan per (stasiun, arah, kelas kecepatan) dihitung
+    dengan satu np.bincount atas kode sel per baris (lihat windrose.WindRose) dan
+    disimpan per filter, sehingga seluruh riwayat multi-stasiun tetap cepat.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutant (str): Polutan yang dirata-ratakan per arah angin.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn untuk kelas kecepatan angin.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe (stasiun,
+      tahun, musim dan rentang waktu). None berarti seluruh data.
+    - context (str): Context seaborn yang dipilih.
+    """
+    st.subheader("Arah Angin dan Polusi per Stasiun")
+
+    try:
+        show_cached_figure('plot_wind_rose', dataset, (pollutant, selection),
+                           style, palette, partial(prepare_wind_rose, dataset, pollutant, selection), context)
+    except Exception as e:
+        st.error(f"Error saat menghitung wind rose: {e}")
+
+
+@profiled()
+def display_exceedances(dataset, pollutant, threshold, selection=None):
+    """
+    Menampilkan jumlah jam ketika rata-rata bergerak polutan melebihi ambang batas,
+    jumlah hari ketika rata-rata bergerak maksimum harian melebihi ambang batas,
+    serta polutan utama untuk jam dengan AQI di atas 50.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutant (str): Polutan yang diperiksa (lihat aqi.ROLLING_WINDOWS).
+    - threshold (float): Ambang batas untuk rata-rata bergerak polutan tersebut.
+    - selection (FilterSelection): Filter dari display_filtered_dataframe. Hanya
+      rentang waktu dan stasiun yang diterapkan. None berarti seluruh data.
+    """
+    start, end, stations = _window_params(selection)
+    engine = get_rolling_aqi(dataset.frame)
+
+    window = ROLLING_WINDOWS[pollutant]
+    st.write(f"Jam dengan rata-rata {window} jam {pollutant} di atas {threshold:g} µg/m³:")
+    st.dataframe(engine.exceedances(pollutant, threshold, start, end, stations), hide_index=True)
+
+    # Rata-rata bergerak maksimum harian, misalnya MDA8 untuk O3
+    daily = engine.daily_max_mean(pollutant, start, end, stations).dropna(subset=[pollutant])
+    if not daily.empty:
+        st.write(f"Hari dengan rata-rata {window} jam maksimum harian {pollutant} di atas {threshold:g} µg/m³:")
+        above = daily[pollutant] > threshold
+        st.dataframe(pd.DataFrame({
+            'hari_di_atas_ambang': above.groupby(daily['station'], sort=False).sum(),
+            'hari_valid': daily.groupby('station', sort=False).size(),
+            'maksimum_harian_tertinggi': daily.groupby('station', sort=False)[pollutant].max(),
+        }))
+
+    st.write("Jumlah jam setiap polutan menjadi polutan utama (AQI > 50):")
+    st.dataframe(engine.primary_hours(start, end, stations))
+
+
+def prepare_seasonal_profile(dataset, pollutants):
+    """
+    Menyiapkan komponen musiman tahunan per polutan dan stasiun beserta ringkasannya.
+    """
+    analysis = get_seasonal_analysis(dataset.frame)
+    profiles = analysis.profiles[analysis.profiles['pollutant'].isin(pollutants)]
+    if profiles['seasonal'].isna().all():
+        raise ValueError("Data terlalu pendek untuk dekomposisi musiman.")
+
+    # Bulan puncak dan terendah komponen musiman per polutan, dihitung dari data
+    notes = []
+    summary = analysis.summary.set_index('pollutant')
+    for pol in pollutants:
+        rows = summary.loc[[pol]].dropna(subset=['peak_month'])
+        if rows.empty:
+            continue
+        peaks = ', '.join(f"{row.station} {MONTH_NAMES[int(row.peak_month) - 1]}" for row in rows.itertuples())
+        troughs = ', '.join(f"{row.station} {MONTH_NAMES[int(row.trough_month) - 1]}" for row in rows.itertuples())
+        notes.append(f"**{pol}**: puncak musiman {peaks}; terendah {troughs}; "
+                     f"amplitudo {rows['amplitude'].min():.1f}-{rows['amplitude'].max():.1f}")
+    # Hari pertama (1-365) setiap bulan untuk label sumbu x
+    month_starts = [day + 1 for day in range(len(MONTH_OF_DAY))
+                    if day == 0 or MONTH_OF_DAY[day] != MONTH_OF_DAY[day - 1]]
+    return 'seasonal_profile', profiles, {
+        'pollutants': list(pollutants),
+        'month_starts': month_starts,
+        'month_labels': [name[:3] for name in MONTH_NAMES],
+    }, tuple(notes)
+
+
+@profiled()
+def plot_seasonal_analysis(dataset, pollutants, style, palette, context='notebook'):
+    """
+    Membuat visualisasi komponen musiman setiap polutan per stasiun dan tabel amplitudonya.
+
+    Setiap deret harian stasiun × polutan didekomposisi menjadi tren, musiman dan
+    residual (lihat seasonal.py). Analisisnya dijalankan paralel di pool proses
+    dan disimpan sekali per versi dataset.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutants (list): Polutan yang divisualisasikan.
+    - style (str): Gaya seaborn yang dipilih.
+    - palette (str): Palet warna seaborn untuk garis stasiun.
+    - context (str): Context seaborn yang dipilih.
+    """
+    st.subheader("Pola Musiman dan Episode Polusi")
+
+    try:
+        show_cached_figure('plot_seasonal_analysis', dataset, tuple(pollutants),
+                           style, palette, partial(prepare_seasonal_profile, dataset, pollutants), context)
+        summary = get_seasonal_analysis(dataset.frame).summary
+        summary = summary[summary['pollutant'].isin(pollutants)]
+        table = summary.pivot(index='station', columns='pollutant', values='amplitude')[list(pollutants)]
+        st.write("Amplitudo musiman (selisih puncak dan titik terendah komponen musiman):")
+        st.dataframe(table.round(1))
+    except Exception as e:
+        st.error(f"Error saat menghitung pola musiman: {e}")
+
+
+@profiled()
+def display_pollution_episodes(dataset, pollutant, limit=20):
+    """
+    Menampilkan episode polusi: hari berurutan dengan residual jauh di atas pola
+    musiman dan trennya.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset hasil process_data.
+    - pollutant (str): Polutan yang ditampilkan.
+    - limit (int): Jumlah episode dengan skor tertinggi yang ditampilkan.
+    """
+    analysis = get_seasonal_analysis(dataset.frame)
+    episodes = analysis.episodes[analysis.episodes['pollutant'] == pollutant]
+    st.write(f"{len(episodes)} episode {pollutant} dengan skor z robust di atas {ANOMALY_THRESHOLD:g} "
+             f"(analisis {analysis.seconds:.2f} detik, {analysis.workers or 1} proses):")
+    top = episodes.sort_values('peak_score', ascending=False).head(limit)
+    st.dataframe(top.drop(columns='pollutant').round({'peak_value': 1, 'peak_score': 2}), hide_index=True)
+
+
+@profiled()
+def display_filtered_dataframe(dataset, page_sizes=(50, 100, 500, 1000)):
+    """
+    Menampilkan DataFrame dengan filter langsung di dashboard Streamlit.
+
+    Filter dijalankan lewat indeks (lihat filter_engine.FilterIndex) tanpa menyalin
+    DataFrame, dan hanya satu halaman baris yang dikirim ke browser.
+
+    Parameters:
+    - dataset (AirQualityDataset): Dataset yang akan difilter dan ditampilkan.
+    - page_sizes (tuple): Pilihan jumlah baris per halaman.
+
+    Returns:
+    - FilterSelection: Pilihan filter pengguna, atau None jika data tidak valid.
+    """
+    st.subheader("Filter DataFrame")
+
+    index = get_filter_index(dataset.frame)
+
+    # Filter untuk kolom 'station'
+    stations = index.values('station')
+    selected_station = st.multiselect(
+        "Pilih Stasiun", stations, default=stations
+    )
+
+    # Filter untuk kolom 'year'
+    years = index.values('year')
+    selected_year = st.multiselect(
+        "Pilih Tahun", years, default=years
+    )
+
+    # Filter untuk kolom 'season'
+    seasons = index.values('season')
+    selected_season = st.multiselect(
+        "Pilih Musim", seasons, default=seasons
+    )
+
+    # Slider untuk rentang waktu
+    # Data sudah terurut, sehingga nilai minimum dan maksimum ada di ujung array
+    min_datetime = pd.Timestamp(index.datetimes[0]).to_pydatetime()
+    max_datetime = pd.Timestamp(index.datetimes[-1]).to_pydatetime()
+
+    # Validasi nilai minimum dan maksimum
+    if pd.isnull(min_datetime) or pd.isnull(max_datetime):
+        st.error("Nilai minimum atau maksimum datetime tidak valid.")
+        return None
+
+    # Slider untuk memilih rentang waktu
+    selected_datetime_range = st.slider(
+        "Pilih Rentang Waktu",
+        min_value=min_datetime,
+        max_value=max_datetime,
+        value=(min_datetime, max_datetime),
+        format="YYYY-MM-DD HH:mm"
+    )
+
+    # Menerapkan filter lewat indeks
+    selection = FilterSelection(
+        stations=tuple(selected_station),
+        years=tuple(selected_year),
+        seasons=tuple(selected_season),
+        start=selected_datetime_range[0],
+        end=selected_datetime_range[1],
+    )
+    with profile_block('filter.query') as info:
+        result = index.query(selection)
+        info['rows'] = len(result)
+
+    # Menampilkan DataFrame yang telah difilter per halaman
+    total_rows = len(result)
+    st.write(f"Data setelah difilter: {total_rows} baris")
+    col_size, col_page = st.columns(2)
+    page_size = col_size.selectbox("Baris per Halaman", page_sizes)
+    page_count = max(1, -(-total_rows // page_size))
+    page_number = col_page.number_input(
+        f"Halaman (1 - {page_count})", min_value=1, max_value=page_count, value=1)
+    st.dataframe(result.page(page_number - 1, page_size))
+
+    display_export(result, selection)
+
+    return selection
+
+
+def display_export(result, selection):
+    """
+    Menampilkan tombol untuk mengunduh seluruh hasil filter sebagai CSV atau Parquet.
+
+    File ditulis ke cache lokal sepotong demi sepotong langsung dari indeks filter
+    (lihat export.export_to_file), tanpa membentuk DataFrame hasil filter secara
+    utuh, dan progresnya ditampilkan dalam baris per detik. File yang sudah pernah
+    dibuat untuk filter dan format yang sama dipakai ulang tanpa ditulis ulang.
+    Unduhannya berupa tautan ke endpoint /export di api.py, yang mengirim file
+    tersebut bertahap sehingga memori server tidak bergantung pada ukuran hasil.
+
+    Parameters:
+    - result (FilterResult): Hasil filter dari indeks.
+    - selection (FilterSelection): Pilihan filter.
+    """
+    with st.expander("Unduh Data Hasil Filter"):
+        fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key='export_format',
+                       format_func=str.upper)
+        if st.button(f"Siapkan File {fmt.upper()} ({len(result)} baris)", key='export_prepare'):
+            bar = st.progress(0.0, text="Menyiapkan file...")
+
+            def progress(done, total, seconds):
+                rate = f"{done / seconds:,.0f} baris/detik" if seconds > 0 else "dari cache"
+                bar.progress(done / total if total else 1.0, text=f"{done:,} dari {total:,} baris ({rate})")
+
+            try:
+                with profile_block(f'export.{fmt}', rows=len(result)):
+                    stats = export_to_file(result, selection, fmt, progress=progress)
+            except (OSError, ValueError) as e:
+                st.error(f"File tidak dapat dibuat: {e}")
+                return
+            if stats.seconds > 0:
+                st.write(f"{stats.rows:,} baris ({stats.bytes / 1e6:,.1f} MB) dalam {stats.seconds:.2f} detik "
+                         f"({stats.rows / stats.seconds:,.0f} baris/detik)")
+
+            # st.download_button menyimpan seluruh isi file di memori server, jadi
+            # unduhan dikirim bertahap oleh endpoint /export di api.py, yang membaca
+            # file yang baru disiapkan ini dari disk
+            st.link_button(f"Unduh {fmt.upper()}", export_url(selection, fmt))
+            st.caption(f"Unduhan dikirim oleh layanan API di {DEFAULT_API_URL} "
+                       f"(jalankan `python dashboard/api.py`, atur alamatnya dengan AIR_QUALITY_API_URL).")
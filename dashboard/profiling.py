@@ -0,0 +1,245 @@
+import argparse
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# File JSONL untuk log profil lintas sesi (kosong berarti tidak ditulis)
+DEFAULT_PROFILE_LOG = os.environ.get('AIR_QUALITY_PROFILE_LOG', '')
+
+# Pencatatan alokasi memori untuk seluruh proses server, bukan per sesi
+PROFILE_MEMORY = os.environ.get('AIR_QUALITY_PROFILE_MEMORY', '').lower() in ('1', 'true', 'yes')
+
+# Kolom ringkasan per fungsi
+SUMMARY_COLUMNS = ['calls', 'total_s', 'mean_s', 'max_s', 'rows', 'mem_mb']
+
+_local = threading.local()
+_totals = {}
+_totals_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+class ProfileRun:
+    """
+    Kumpulan catatan profil untuk satu rerun skrip Streamlit.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.started = datetime.now().isoformat(timespec='milliseconds')
+        self.records = []
+        self.depth = 0
+
+    def frame(self):
+        """
+        Mengembalikan catatan rerun ini sebagai DataFrame, dengan nama
+        fungsi diberi indentasi sesuai kedalaman pemanggilan.
+        """
+        df = pd.DataFrame(self.records, columns=['name', 'depth', 'wall_s', 'rows', 'mem_bytes', 'peak_bytes'])
+        df['name'] = ['  ' * depth + name for name, depth in zip(df['name'], df['depth'])]
+        return df.drop(columns='depth')
+
+
+def set_memory_tracing(enabled):
+    """
+    Mengaktifkan atau menonaktifkan pencatatan alokasi memori (tracemalloc).
+
+    tracemalloc berlaku untuk seluruh proses dan memperlambat kode yang banyak
+    melakukan alokasi kecil, sehingga hanya diaktifkan saat dibutuhkan. Karena
+    berlaku untuk semua sesi, dashboard mengaturnya dari PROFILE_MEMORY
+    (AIR_QUALITY_PROFILE_MEMORY), bukan dari pilihan satu sesi.
+    """
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def current_run():
+    """
+    Mengambil ProfileRun yang aktif di thread ini, atau None.
+    """
+    return getattr(_local, 'run', None)
+
+
+@contextmanager
+def profile_run(label='rerun', log_path=DEFAULT_PROFILE_LOG):
+    """
+    Mengumpulkan catatan profil untuk satu rerun. Jika sudah ada rerun yang aktif
+    (misalnya fragment yang dipanggil dari main), rerun tersebut dipakai ulang.
+
+    Parameters:
+    - label (str): Label rerun, misalnya 'main' atau 'fragment'.
+    - log_path (str): File JSONL tujuan log. Kosong berarti tidak ditulis.
+
+    Yields:
+    - ProfileRun: Catatan profil rerun ini.
+    """
+    run = current_run()
+    if run is not None:
+        yield run
+        return
+
+    run = ProfileRun(label)
+    _local.run = run
+    try:
+        yield run
+    finally:
+        _local.run = None
+        if log_path and run.records:
+            write_log(run, log_path)
+
+
+def _record(name, wall_s, rows, mem_bytes, peak_bytes, depth):
+    run = current_run()
+    if run is not None:
+        run.records.append({'name': name, 'depth': depth, 'wall_s': wall_s, 'rows': rows,
+                            'mem_bytes': mem_bytes, 'peak_bytes': peak_bytes})
+    with _totals_lock:
+        total = _totals.setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'rows': 0, 'mem_bytes': 0})
+        total['calls'] += 1
+        total['total_s'] += wall_s
+        total['max_s'] = max(total['max_s'], wall_s)
+        total['rows'] += rows or 0
+        total['mem_bytes'] += mem_bytes or 0
+
+
+def record_timing(name, wall_s, rows=None):
+    """
+    Mencatat waktu yang diukur di tempat lain, misalnya di proses worker render.
+    """
+    run = current_run()
+    _record(name, wall_s, rows, None, None, run.depth if run is not None else 0)
+
+
+@contextmanager
+def profile_block(name, rows=None):
+    """
+    Mengukur waktu dan alokasi memori sebuah blok kode.
+
+    Parameters:
+    - name (str): Nama blok pada catatan profil.
+    - rows (int): Jumlah baris yang diproses, jika diketahui.
+
+    Yields:
+    - dict: Dapat diisi 'rows' di dalam blok jika jumlah baris baru diketahui di sana.
+    """
+    run = current_run()
+    depth = run.depth if run is not None else 0
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        mem_start = tracemalloc.get_traced_memory()[0]
+        # Puncak hanya di-reset di tingkat teratas agar puncak blok luar tidak hilang
+        if depth == 0:
+            tracemalloc.reset_peak()
+    info = {'rows': rows}
+    if run is not None:
+        run.depth += 1
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        wall_s = time.perf_counter() - start
+        if run is not None:
+            run.depth -= 1
+        mem_bytes = peak_bytes = None
+        if tracing and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            mem_bytes = current - mem_start
+            peak_bytes = peak - mem_start if depth == 0 else None
+        _record(name, wall_s, info['rows'], mem_bytes, peak_bytes, depth)
+
+
+def _default_rows(args, kwargs, result):
+    # Jumlah baris dari argumen DataFrame pertama, atau dari hasil fungsi
+    for value in (*args, *kwargs.values(), result):
+        if isinstance(value, pd.DataFrame):
+            return len(value)
+    return None
+
+
+def profiled(name=None, rows=_default_rows):
+    """
+    Decorator untuk mencatat waktu, jumlah baris dan alokasi memori setiap pemanggilan.
+
+    Parameters:
+    - name (str): Nama fungsi pada catatan profil. Default nama fungsi.
+    - rows (callable): Fungsi (args, kwargs, hasil) yang mengembalikan jumlah baris.
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_block(label) as info:
+                result = func(*args, **kwargs)
+                info['rows'] = rows(args, kwargs, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def summary():
+    """
+    Ringkasan waktu per fungsi dari semua sesi sejak proses dimulai.
+
+    Returns:
+    - pd.DataFrame: Jumlah panggilan, total/rata-rata/maksimum waktu, baris dan memori.
+    """
+    with _totals_lock:
+        totals = {name: dict(total) for name, total in _totals.items()}
+    df = pd.DataFrame.from_dict(totals, orient='index')
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    df['mean_s'] = df['total_s'] / df['calls']
+    df['mem_mb'] = df['mem_bytes'] / 2 ** 20
+    return df[SUMMARY_COLUMNS].sort_values('total_s', ascending=False)
+
+
+def reset_summary():
+    with _totals_lock:
+        _totals.clear()
+
+
+def write_log(run, log_path):
+    """
+    Menambahkan catatan satu rerun ke file JSONL, satu baris per pemanggilan.
+    """
+    lines = [json.dumps({'time': run.started, 'run': run.label, 'pid': os.getpid(), **record})
+             for record in run.records]
+    with _log_lock, open(log_path, 'a', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def summarize_log(log_path):
+    """
+    Meringkas file log JSONL lintas sesi: jumlah panggilan dan persentil waktu per fungsi.
+
+    Returns:
+    - pd.DataFrame: Ringkasan per fungsi, diurutkan dari total waktu terbesar.
+    """
+    df = pd.read_json(log_path, lines=True)
+    grouped = df.groupby('name')['wall_s']
+    report = pd.DataFrame({
+        'calls': grouped.size(),
+        'total_s': grouped.sum(),
+        'p50_s': grouped.median(),
+        'p95_s': grouped.quantile(0.95),
+        'max_s': grouped.max(),
+        'rows_mean': df.groupby('name')['rows'].mean(),
+    })
+    return report.sort_values('total_s', ascending=False)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Meringkas log profil dashboard (JSONL).')
+    parser.add_argument('log', help='File log, misalnya yang diisi lewat AIR_QUALITY_PROFILE_LOG')
+    args = parser.parse_args()
+    with pd.option_context('display.width', 140, 'display.float_format', '{:.4f}'.format):
+        print(summarize_log(args.log))
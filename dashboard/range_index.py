@@ -0,0 +1,282 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived, register_extender
+
+# Kolom yang memiliki indeks nilai ekstrem
+EXTREMA_COLUMNS = ['TEMP', 'RAIN']
+
+# Jumlah baris per blok. Bagian blok di ujung rentang dipindai langsung,
+# blok utuh di antaranya dijawab oleh sparse table.
+DEFAULT_BLOCK_SIZE = 64
+
+# Melindungi klaim ujung buffer stasiun saat indeks diperluas (lihat RangeExtremaIndex.extended)
+_claim_lock = threading.Lock()
+
+
+def _better(values, a, b, lower):
+    # Memilih posisi dengan nilai lebih ekstrem; jika sama, posisi yang lebih awal
+    va, vb = values[a], values[b]
+    take_b = (vb < va) if lower else (vb > va)
+    take_b = take_b | ((va == vb) & (b < a))
+    return np.where(take_b, b, a)
+
+
+def _write(buffer, keep, values, in_place):
+    # Menulis values mulai posisi keep dan mempertahankan buffer[:keep]. Buffer
+    # baru berkapasitas dua kali lipat dibuat jika ujung buffer lama dipakai objek
+    # lain atau kapasitasnya tidak cukup
+    end = keep + len(values)
+    if buffer is None or not in_place or end > len(buffer):
+        grown = np.empty(end if buffer is None else 2 * end, dtype=values.dtype)
+        if buffer is not None:
+            grown[:keep] = buffer[:keep]
+        buffer = grown
+    buffer[keep:end] = values
+    return buffer
+
+
+class RangeExtrema:
+    """
+    Range minimum/maximum query untuk satu deret nilai.
+
+    Deret dibagi menjadi blok berukuran tetap. Posisi nilai minimum dan maksimum
+    setiap blok disimpan dalam sparse table sehingga ekstrem dari blok-blok utuh
+    pada rentang mana pun didapat dari dua entri tabel. Dua potongan blok di
+    ujung rentang dipindai langsung (paling banyak 2 × block_size nilai), jadi
+    biaya query tidak bergantung pada panjang rentang.
+    """
+
+    def __init__(self, values, block_size=DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self.size = 0
+        self.low = self.high = None
+        self.min_table = self.max_table = []
+        self._append(values, in_place=False)
+
+    def extended(self, values, in_place=False):
+        """
+        Membuat RangeExtrema untuk deret ini ditambah nilai baru di ujungnya.
+
+        Hanya blok terakhir yang belum penuh, blok baru, dan entri sparse table
+        yang mencakupnya yang dihitung. Dengan in_place, nilai dan entri tersebut
+        ditulis setelah bagian yang dibaca objek ini pada buffer yang sama
+        (kapasitasnya digandakan saat penuh), sehingga objek ini tidak berubah.
+        Pemanggil menjamin tidak ada objek lain yang memakai ujung buffer tersebut.
+
+        Parameters:
+        - values (array-like): Nilai baru.
+        - in_place (bool): Pakai ulang ujung buffer objek ini.
+
+        Returns:
+        - RangeExtrema: Objek baru; objek ini tidak diubah.
+        """
+        extended = RangeExtrema.__new__(RangeExtrema)
+        extended.__dict__.update(self.__dict__)
+        extended._append(values, in_place)
+        return extended
+
+    def _append(self, values, in_place):
+        values = np.asarray(values, dtype=np.float64)
+        start = self.size
+        self.size += len(values)
+        # NaN diganti ±inf agar tidak pernah terpilih sebagai ekstrem
+        missing = np.isnan(values)
+        self.low = _write(self.low, start, np.where(missing, np.inf, values), in_place)
+        self.high = _write(self.high, start, np.where(missing, -np.inf, values), in_place)
+        self.min_table = self._extend_table(self.min_table, self.low, start, lower=True, in_place=in_place)
+        self.max_table = self._extend_table(self.max_table, self.high, start, lower=False, in_place=in_place)
+
+    def _extend_table(self, table, values, start, lower, in_place):
+        # Entri yang hanya mencakup blok penuh sebelum posisi start tidak berubah;
+        # entri lain dihitung ulang, level demi level
+        n_blocks = -(-self.size // self.block_size)
+        first = start // self.block_size
+        padded = np.full((n_blocks - first) * self.block_size, np.inf if lower else -np.inf)
+        padded[:self.size - first * self.block_size] = values[first * self.block_size:self.size]
+        blocks = padded.reshape(-1, self.block_size)
+        positions = blocks.argmin(axis=1) if lower else blocks.argmax(axis=1)
+        level = np.minimum(positions + np.arange(first, n_blocks) * self.block_size, max(self.size - 1, 0))
+
+        extended = [_write(table[0] if table else None, first, level, in_place)]
+        width = 1
+        while 2 * width <= n_blocks:
+            k = len(extended)
+            lo = max(first - 2 * width + 1, 0) if k < len(table) else 0
+            idx = np.arange(lo, n_blocks - 2 * width + 1)
+            level = _better(values, extended[-1][idx], extended[-1][idx + width], lower)
+            extended.append(_write(table[k] if k < len(table) else None, lo, level, in_place))
+            width *= 2
+        return extended
+
+    def _scan(self, values, lo, hi, lower):
+        if lo >= hi:
+            return None
+        segment = values[lo:hi]
+        return lo + int(segment.argmin() if lower else segment.argmax())
+
+    def _blocks(self, values, table, first, last, lower):
+        # Ekstrem blok first..last-1 dari dua entri sparse table yang saling tumpang tindih
+        if first >= last:
+            return None
+        k = (last - first).bit_length() - 1
+        return int(_better(values, table[k][first], table[k][last - (1 << k)], lower))
+
+    def query(self, lo, hi, lower):
+        """
+        Mencari posisi nilai minimum atau maksimum pada rentang posisi [lo, hi).
+
+        Parameters:
+        - lo (int): Posisi awal (inklusif).
+        - hi (int): Posisi akhir (eksklusif).
+        - lower (bool): True untuk minimum, False untuk maksimum.
+
+        Returns:
+        - int atau None: Posisi ekstrem pertama, None jika rentang kosong atau
+          seluruh nilainya NaN.
+        """
+        values, table = (self.low, self.min_table) if lower else (self.high, self.max_table)
+        lo, hi = max(int(lo), 0), min(int(hi), self.size)
+        first = -(-lo // self.block_size)
+        last = hi // self.block_size
+        if first >= last:
+            candidates = [self._scan(values, lo, hi, lower)]
+        else:
+            candidates = [
+                self._scan(values, lo, first * self.block_size, lower),
+                self._blocks(values, table, first, last, lower),
+                self._scan(values, last * self.block_size, hi, lower),
+            ]
+        candidates = [pos for pos in candidates if pos is not None]
+        if not candidates:
+            return None
+        sign = 1 if lower else -1
+        best = min(candidates, key=lambda pos: (sign * values[pos], pos))
+        return None if np.isinf(values[best]) else best
+
+
+class RangeExtremaIndex:
+    """
+    Indeks nilai ekstrem per stasiun dan kolom untuk rentang waktu mana pun.
+
+    Baris setiap stasiun sudah terurut berdasarkan 'datetime', sehingga rentang
+    waktu diterjemahkan ke rentang posisi dengan binary search lalu dijawab oleh
+    RangeExtrema tanpa memindai seluruh data.
+    """
+
+    def __init__(self, df, columns=None, block_size=DEFAULT_BLOCK_SIZE):
+        if columns is None:
+            columns = [col for col in EXTREMA_COLUMNS if col in df.columns]
+        self.columns = list(columns)
+        self.block_size = block_size
+        self.stations = {}
+        for station, rows in df.groupby('station', observed=True, sort=True).indices.items():
+            self.stations[station] = self._build_station(df, np.asarray(rows, dtype=np.int64))
+
+    def _build_station(self, df, rows):
+        datetimes = df['datetime'].to_numpy()[rows]
+        return {
+            'datetimes': datetimes,
+            'buffer': datetimes,
+            # Jumlah baris buffer yang sudah dipakai versi indeks mana pun
+            'claimed': [len(rows)],
+            'tables': {col: RangeExtrema(df[col].to_numpy(dtype=np.float64, na_value=np.nan)[rows],
+                                         self.block_size)
+                       for col in self.columns},
+        }
+
+    def extended(self, df, offset):
+        """
+        Membuat indeks untuk df yang berisi dataset lama ditambah baris baru mulai
+        posisi offset.
+
+        Hanya baris baru yang dikelompokkan. Untuk setiap stasiun yang mendapat
+        baris baru, waktu dan nilainya ditulis setelah ujung buffer stasiun dan
+        hanya blok di ujung deret serta entri sparse table yang mencakupnya yang
+        dihitung (lihat RangeExtrema.extended). Perluasan pertama dari suatu versi
+        memakai ulang buffer tersebut; perluasan lain dari versi yang sama menyalin.
+        """
+        index = RangeExtremaIndex.__new__(RangeExtremaIndex)
+        index.columns = self.columns
+        index.block_size = self.block_size
+        index.stations = dict(self.stations)
+        appended = df.iloc[offset:]
+        datetimes = appended['datetime'].to_numpy()
+        values = {col: appended[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in self.columns}
+        for station, rows in appended.groupby('station', observed=True, sort=True).indices.items():
+            rows = np.asarray(rows, dtype=np.int64)
+            entry = self.stations.get(station)
+            if entry is None:
+                index.stations[station] = index._build_station(appended, rows)
+                continue
+            size = len(entry['datetimes'])
+            with _claim_lock:
+                in_place = entry['claimed'][0] == size
+                if in_place:
+                    entry['claimed'][0] = size + len(rows)
+            buffer = _write(entry['buffer'], size, datetimes[rows], in_place)
+            index.stations[station] = {
+                'datetimes': buffer[:size + len(rows)],
+                'buffer': buffer,
+                'claimed': entry['claimed'] if in_place else [size + len(rows)],
+                'tables': {col: table.extended(values[col][rows], in_place)
+                           for col, table in entry['tables'].items()},
+            }
+        index.stations = dict(sorted(index.stations.items()))
+        return index
+
+    def extremes(self, column, start=None, end=None, stations=None):
+        """
+        Nilai minimum dan maksimum per stasiun pada rentang waktu, beserta waktunya.
+
+        Parameters:
+        - column (str): Kolom yang dicari ekstremnya (lihat EXTREMA_COLUMNS).
+        - start (datetime): Awal rentang (inklusif). None berarti sejak awal data.
+        - end (datetime): Akhir rentang (inklusif). None berarti sampai akhir data.
+        - stations (iterable): Stasiun yang dihitung. Kosong atau None berarti semua.
+
+        Returns:
+        - pd.DataFrame: Kolom 'station', 'min', 'min_time', 'max', 'max_time'.
+          Stasiun tanpa data pada rentang tersebut tidak disertakan.
+        """
+        if column not in self.columns:
+            raise KeyError(f"Kolom '{column}' tidak memiliki indeks nilai ekstrem.")
+        selected = [s for s in self.stations if not stations or s in set(stations)]
+
+        records = []
+        for station in selected:
+            entry = self.stations[station]
+            datetimes = entry['datetimes']
+            lo, hi = 0, len(datetimes)
+            if start is not None:
+                lo = int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(start)), side='left'))
+            if end is not None:
+                hi = int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(end)), side='right'))
+            table = entry['tables'][column]
+            low, high = table.query(lo, hi, lower=True), table.query(lo, hi, lower=False)
+            if low is None:
+                continue
+            records.append({
+                'station': station,
+                'min': table.low[low], 'min_time': pd.Timestamp(datetimes[low]),
+                'max': table.high[high], 'max_time': pd.Timestamp(datetimes[high]),
+            })
+        return pd.DataFrame(records, columns=['station', 'min', 'min_time', 'max', 'max_time'])
+
+
+def get_range_index(df):
+    """
+    Mengambil indeks nilai ekstrem untuk dataset, membangunnya sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses dan terurut berdasarkan 'datetime'.
+
+    Returns:
+    - RangeExtremaIndex: Indeks yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'range_extrema', RangeExtremaIndex)
+
+
+register_extender('range_extrema', lambda index, df, offset: index.extended(df, offset))
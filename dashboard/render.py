@@ -0,0 +1,136 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import seaborn as sns
+
+from figure_cache import figure_to_bytes
+from figures import FIGURE_BUILDERS
+
+# Jumlah proses worker render (0 berarti render di thread pemanggil)
+DEFAULT_RENDER_WORKERS = int(os.environ.get(
+    'AIR_QUALITY_RENDER_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def render_images(kind, data, style, palette, context, params=None, formats=('png',), dpi=200):
+    """
+    Membuat satu gambar dan menyimpannya dalam satu atau beberapa format.
+
+    Gambar hanya digambar sekali, lalu di-encode ke setiap format. Gaya, context
+    dan palet seaborn hanya berlaku di dalam blok ini dan dikembalikan setelahnya,
+    sehingga tidak bocor ke gambar berikutnya.
+
+    Parameters:
+    - kind (str): Jenis gambar (kunci figures.FIGURE_BUILDERS).
+    - data (object): Data yang sudah diagregasi untuk gambar tersebut.
+    - style (str): Gaya seaborn.
+    - palette (str): Palet warna seaborn.
+    - context (str): Context seaborn ('paper', 'notebook', 'talk', 'poster').
+    - params (dict): Argumen tambahan untuk fungsi pembuat gambar.
+    - formats (tuple): Format keluaran matplotlib, misalnya ('png', 'svg').
+    - dpi (int): Resolusi untuk format raster.
+
+    Returns:
+    - tuple: (dict format -> bytes, waktu menggambar dalam detik, waktu encoding dalam detik)
+    """
+    start = time.perf_counter()
+    with sns.axes_style(style), sns.plotting_context(context), sns.color_palette(palette):
+        fig = FIGURE_BUILDERS[kind](data, palette, **(params or {}))
+        drawn = time.perf_counter()
+        images = {fmt: figure_to_bytes(fig, fmt, dpi) for fmt in formats}
+    # Figure tidak terdaftar di pyplot; artist dilepas langsung tanpa menunggu GC
+    fig.clear()
+    return images, drawn - start, time.perf_counter() - drawn
+
+
+def render_figure(kind, data, style, palette, context, params=None, dpi=200):
+    """
+    Membuat dan merender satu gambar menjadi PNG bytes (lihat render_images).
+
+    Returns:
+    - tuple: (PNG bytes, waktu menggambar dalam detik, waktu encoding dalam detik)
+    """
+    images, draw_s, encode_s = render_images(kind, data, style, palette, context, params, ('png',), dpi)
+    return images['png'], draw_s, encode_s
+
+
+class RenderPool:
+    """
+    Pool proses untuk merender gambar secara paralel antar sesi.
+
+    Matplotlib dan rcParams seaborn bersifat global per proses, sehingga render
+    paralel dalam thread tidak aman dan tetap terkunci GIL. Setiap worker adalah
+    proses terpisah dengan state matplotlib sendiri. Permintaan gambar yang sama
+    dari beberapa sesi sekaligus digabung menjadi satu pekerjaan render.
+    """
+
+    def __init__(self, workers=DEFAULT_RENDER_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._inflight = {}
+        self._lock = threading.RLock()
+        # Render langsung di proses ini harus berurutan karena rcParams bersifat global
+        self._inline_lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 'spawn' agar worker tidak mewarisi thread server Streamlit lewat fork
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._executor
+
+    def render(self, key, kind, data, style, palette, context, params=None):
+        """
+        Merender gambar di worker dan menunggu hasilnya.
+
+        Parameters:
+        - key (tuple): Kunci cache gambar, dipakai untuk menggabungkan permintaan yang sama.
+        - kind, data, style, palette, context, params: Lihat render_figure.
+
+        Returns:
+        - tuple: (PNG bytes, waktu menggambar, waktu encoding)
+        """
+        if self.workers <= 0:
+            with self._inline_lock:
+                return render_figure(kind, data, style, palette, context, params)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                try:
+                    future = self._get_executor().submit(
+                        render_figure, kind, data, style, palette, context, params)
+                except (BrokenProcessPool, RuntimeError):
+                    self._executor = None
+                    future = self._get_executor().submit(
+                        render_figure, kind, data, style, palette, context, params)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done: self._forget(key, done))
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            # Worker mati (misalnya kehabisan memori): render ulang di proses ini
+            with self._lock:
+                self._executor = None
+            with self._inline_lock:
+                return render_figure(kind, data, style, palette, context, params)
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Pool render bersama untuk semua sesi dalam satu proses server
+render_pool = RenderPool()
+atexit.register(render_pool.shutdown)
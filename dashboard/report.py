@@ -0,0 +1,247 @@
+"""
+Ekspor laporan batch: gambar yang sama dengan dashboard untuk setiap kombinasi
+stasiun × tahun, tanpa server Streamlit.
+
+Contoh:
+    python dashboard/report.py combined_data.csv --output laporan --formats png svg
+    python dashboard/report.py combined_data.csv --stations Changping --years 2015 2016 \\
+        --styles darkgrid whitegrid --figures temperature_stats rainfall
+"""
+import argparse
+import itertools
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+import pandas as pd
+
+from data_loader import DEFAULT_CACHE_DIR, DEFAULT_DATA_URL, attach_dataset, columns_on_disk, load_combined_data
+from dataset import get_dataset
+from filter_engine import FilterSelection, get_filter_index
+from plot import (prepare_aqi_overview, prepare_pm_variation, prepare_pollutant_correlation,
+                  prepare_pollutant_trends, prepare_rainfall, prepare_station_pollutant_avg,
+                  prepare_temperature_stats, prepare_weather_heatmap, prepare_weather_pairplot,
+                  prepare_wind_rose)
+from render import render_images
+from schema import POLLUTANT_COLUMNS
+
+# Gambar yang dapat diekspor: nama -> fungsi prepare_* dari plot.py yang hanya menerima dataset
+REPORT_FIGURES = {
+    'pm_variation': prepare_pm_variation,
+    'weather_heatmap': prepare_weather_heatmap,
+    'weather_pairplot': partial(prepare_weather_pairplot, render_mode='density'),
+    'pollutant_correlation': prepare_pollutant_correlation,
+    'station_pollutant_avg': partial(prepare_station_pollutant_avg, pollutants=POLLUTANT_COLUMNS),
+    'pollutant_trends': partial(prepare_pollutant_trends, pollutant_columns=POLLUTANT_COLUMNS,
+                                frequency='monthly'),
+    'temperature_stats': prepare_temperature_stats,
+    'rainfall': prepare_rainfall,
+    'aqi_overview': prepare_aqi_overview,
+    'wind_rose': partial(prepare_wind_rose, pollutant='PM2.5'),
+}
+
+SUMMARY_COLUMNS = ['station', 'year', 'figure', 'style', 'palette', 'status', 'rows',
+                   'files', 'aggregates', 'prepare_s', 'draw_s', 'encode_s', 'notes']
+
+# Dataset bersama di proses worker, dibuka sekali oleh _init_worker
+_dataset = None
+
+
+def _init_worker(fingerprint, cache_dir):
+    # Worker membuka kolom memory-mapped yang sama dengan proses induk
+    global _dataset
+    _dataset = get_dataset(attach_dataset(fingerprint, cache_dir))
+
+
+def _slug(value):
+    return re.sub(r'[^0-9A-Za-z._-]+', '_', str(value)).strip('_') or 'all'
+
+
+def _aggregate_frames(data):
+    # Data gambar yang berupa tabel ditulis ke CSV; histogram pairplot dilewati
+    parts = data if isinstance(data, tuple) else (data,)
+    return [part for part in parts if isinstance(part, pd.DataFrame)]
+
+
+def _write_aggregates(data, directory, figure):
+    paths = []
+    for i, frame in enumerate(_aggregate_frames(data)):
+        name = f'{figure}.csv' if i == 0 else f'{figure}-{i + 1}.csv'
+        path = os.path.join(directory, name)
+        # Index bermakna (misalnya matriks korelasi) ikut ditulis, RangeIndex tidak
+        frame.to_csv(path, index=not isinstance(frame.index, pd.RangeIndex))
+        paths.append(path)
+    return paths
+
+
+def render_combination(station, year, figures, styles, formats, output_dir, context='notebook', dpi=200):
+    """
+    Merender semua gambar untuk satu kombinasi stasiun × tahun.
+
+    Subset data diambil sekali lewat indeks filter, lalu setiap gambar disiapkan
+    sekali dan digambar untuk setiap pasangan gaya dan palet. Agregat yang
+    mendasari gambar ditulis sebagai CSV di samping gambarnya.
+
+    Parameters:
+    - station (str): Nama stasiun.
+    - year (int): Tahun.
+    - figures (list): Nama gambar (kunci REPORT_FIGURES).
+    - styles (list): Pasangan (gaya seaborn, palet).
+    - formats (tuple): Format gambar, misalnya ('png', 'svg').
+    - output_dir (str): Direktori keluaran laporan.
+    - context (str): Context seaborn.
+    - dpi (int): Resolusi untuk format raster.
+
+    Returns:
+    - list: Satu baris ringkasan (dict, lihat SUMMARY_COLUMNS) per gambar × gaya.
+    """
+    selection = FilterSelection(stations=(station,), years=(year,), seasons=(), start=None, end=None)
+    subset = _dataset.subset(selection)
+    directory = os.path.join(output_dir, _slug(station), _slug(year))
+    os.makedirs(directory, exist_ok=True)
+
+    records = []
+    for figure in figures:
+        base = {'station': station, 'year': year, 'figure': figure, 'rows': len(subset)}
+        start = time.perf_counter()
+        try:
+            if subset.empty:
+                raise ValueError("Tidak ada data untuk kombinasi ini.")
+            kind, data, params, notes = REPORT_FIGURES[figure](subset)
+        except Exception as e:
+            records.append({**base, 'status': f'error: {e}', 'files': 0})
+            continue
+        prepare_s = time.perf_counter() - start
+        aggregates = _write_aggregates(data, directory, figure)
+
+        for style, palette in styles:
+            images, draw_s, encode_s = render_images(
+                kind, data, style, palette, context, params, formats, dpi)
+            for fmt, content in images.items():
+                path = os.path.join(directory, f'{figure}-{_slug(style)}-{_slug(palette)}.{fmt}')
+                with open(path, 'wb') as f:
+                    f.write(content)
+            records.append({
+                **base, 'style': style, 'palette': palette, 'status': 'ok',
+                'files': len(images), 'aggregates': len(aggregates),
+                'prepare_s': prepare_s, 'draw_s': draw_s, 'encode_s': encode_s,
+                'notes': ' | '.join(notes),
+            })
+            # Biaya persiapan hanya dihitung sekali per gambar
+            prepare_s = 0.0
+    return records
+
+
+def _render_task(task):
+    return render_combination(*task)
+
+
+def run_report(source=DEFAULT_DATA_URL, output_dir='report', stations=None, years=None,
+               figures=None, styles=(('darkgrid', 'viridis'),), formats=('png',),
+               workers=None, cache_dir=DEFAULT_CACHE_DIR, context='notebook', dpi=200):
+    """
+    Menjalankan ekspor laporan untuk matriks stasiun × tahun × gaya.
+
+    Dataset dimuat sekali di proses ini; kolomnya sudah berupa file memory-mapped
+    (lihat column_store.py) sehingga setiap worker cukup membuka file yang sama
+    tanpa menyalin atau mem-parsing ulang data. Setiap kombinasi stasiun × tahun
+    menjadi satu pekerjaan di pool proses.
+
+    Parameters:
+    - source (str): Sumber dataset, sama seperti load_combined_data.
+    - output_dir (str): Direktori keluaran.
+    - stations (list): Stasiun yang diekspor. Default semua stasiun.
+    - years (list): Tahun yang diekspor. Default semua tahun.
+    - figures (list): Nama gambar (kunci REPORT_FIGURES). Default semua.
+    - styles (list): Pasangan (gaya seaborn, palet).
+    - formats (tuple): Format gambar.
+    - workers (int): Jumlah proses worker. 0 berarti render di proses ini.
+      Default jumlah core CPU.
+    - cache_dir (str): Direktori cache dataset.
+    - context (str): Context seaborn.
+    - dpi (int): Resolusi untuk format raster.
+
+    Returns:
+    - tuple: (pd.DataFrame ringkasan per gambar × gaya, waktu total dalam detik)
+    """
+    global _dataset
+    start = time.perf_counter()
+    result = load_combined_data(source, cache_dir)
+    _dataset = get_dataset(result.frame)
+    index = get_filter_index(_dataset.frame)
+
+    figures = list(figures or REPORT_FIGURES)
+    unknown = set(figures) - set(REPORT_FIGURES)
+    if unknown:
+        raise ValueError(f"Gambar tidak dikenal: {sorted(unknown)}. Pilih dari {list(REPORT_FIGURES)}.")
+    stations = list(stations or index.values('station'))
+    years = [int(year) for year in (years or index.values('year'))]
+    tasks = [(station, year, figures, list(styles), tuple(formats), output_dir, context, dpi)
+             for station, year in itertools.product(stations, years)]
+    os.makedirs(output_dir, exist_ok=True)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not columns_on_disk(result.fingerprint, cache_dir):
+        # Kolom tidak dapat ditulis ke disk: tidak ada yang bisa dibagi ke worker
+        workers = 0
+
+    batches = None
+    if workers > 0 and len(tasks) > 1:
+        try:
+            # 'spawn' seperti render.py, agar worker tidak mewarisi state proses induk lewat fork
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(result.fingerprint, cache_dir)) as pool:
+                batches = list(pool.map(_render_task, tasks))
+        except BrokenProcessPool:
+            # Worker gagal dimulai: render di proses ini
+            batches = None
+    if batches is None:
+        batches = [_render_task(task) for task in tasks]
+
+    summary = pd.DataFrame([record for batch in batches for record in batch], columns=SUMMARY_COLUMNS)
+    summary.to_csv(os.path.join(output_dir, 'summary.csv'), index=False)
+    return summary, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Mengekspor gambar dashboard per stasiun × tahun ke PNG/SVG beserta CSV agregatnya.')
+    parser.add_argument('source', nargs='?', default=DEFAULT_DATA_URL,
+                        help='URL atau path file CSV, atau direktori dataset Parquet (default: dataset dashboard)')
+    parser.add_argument('--output', default='report', help='Direktori keluaran laporan')
+    parser.add_argument('--stations', nargs='+', help='Stasiun yang diekspor (default: semua)')
+    parser.add_argument('--years', nargs='+', type=int, help='Tahun yang diekspor (default: semua)')
+    parser.add_argument('--figures', nargs='+', choices=list(REPORT_FIGURES),
+                        help='Gambar yang diekspor (default: semua)')
+    parser.add_argument('--styles', nargs='+', default=['darkgrid'], help='Gaya seaborn')
+    parser.add_argument('--palettes', nargs='+', default=['viridis'], help='Palet warna seaborn')
+    parser.add_argument('--formats', nargs='+', default=['png'], choices=['png', 'svg'])
+    parser.add_argument('--context', default='notebook', choices=['paper', 'notebook', 'talk', 'poster'])
+    parser.add_argument('--dpi', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Jumlah proses worker, 0 untuk render di proses ini (default: jumlah core CPU)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_DIR, help='Direktori cache dataset')
+    args = parser.parse_args()
+
+    summary, elapsed = run_report(
+        args.source, args.output, args.stations, args.years, args.figures,
+        list(itertools.product(args.styles, args.palettes)), args.formats,
+        args.workers, args.cache, args.context, args.dpi)
+
+    rendered = summary[summary['status'] == 'ok']
+    failed = summary[summary['status'] != 'ok']
+    with pd.option_context('display.width', 120, 'display.max_colwidth', 60):
+        if not failed.empty:
+            print(failed[['station', 'year', 'figure', 'status']].to_string(index=False))
+    print(f"\n{len(rendered)} gambar ({int(rendered['files'].sum())} file) dalam {elapsed:.2f} detik "
+          f"({len(rendered) / elapsed:,.2f} gambar/detik) -> {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived, register_extender
+from schema import MEASUREMENT_COLUMNS, SEASON_BY_MONTH
+
+# Dimensi kubus agregat
+CUBE_KEYS = ['station', 'month_year', 'hour', 'season']
+CUBE_STATS = ['count', 'sum', 'min', 'max']
+
+
+class RollupCube:
+    """
+    Kubus agregat count/sum/min/max per stasiun × bulan × jam × musim.
+
+    Kubus dibangun sekali per versi dataset. Pertanyaan agregat berikutnya
+    (rata-rata bulanan, rata-rata per stasiun, nilai ekstrem) dijawab dengan
+    menggabungkan sel kubus sehingga biayanya sebanding dengan jumlah sel,
+    bukan jumlah baris data per jam.
+    """
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def from_frame(cls, df, columns=None, month_year=None):
+        """
+        Membangun kubus dari DataFrame data per jam.
+
+        Parameters:
+        - df (pd.DataFrame): DataFrame dengan kolom 'station', 'datetime' dan 'hour'.
+        - columns (list): Kolom numerik yang diagregasi. Default semua kolom pengukuran.
+        - month_year (np.ndarray): Awal bulan setiap baris jika sudah dihitung
+          (lihat dataset.AirQualityDataset). Default dihitung dari 'datetime'.
+
+        Returns:
+        - RollupCube: Kubus agregat.
+        """
+        if columns is None:
+            columns = [col for col in MEASUREMENT_COLUMNS if col in df.columns]
+
+        if month_year is None:
+            month_year = df['datetime'].to_numpy().astype('datetime64[M]')
+        month_year = pd.Series(month_year, index=df.index, name='month_year', copy=False)
+        if 'season' in df.columns:
+            season = df['season']
+        else:
+            season = df['datetime'].dt.month.map(SEASON_BY_MONTH).rename('season')
+
+        grouped = df[columns].groupby(
+            [df['station'], month_year, df['hour'], season], observed=True, sort=True)
+        cells = grouped.agg(CUBE_STATS)
+        # Jumlah disimpan dalam float64 agar penggabungan sel tetap presisi
+        sum_cols = [(col, 'sum') for col in columns]
+        cells[sum_cols] = cells[sum_cols].astype('float64')
+        return cls(cells)
+
+    def extended(self, appended):
+        """
+        Menggabungkan baris baru ke kubus tanpa menghitung ulang dari data per jam.
+
+        Parameters:
+        - appended (pd.DataFrame): Baris baru dengan kolom yang sama dengan data sumber kubus.
+
+        Returns:
+        - RollupCube: Kubus baru; kubus lama tidak diubah.
+        """
+        if not len(appended):
+            return self
+        update = RollupCube.from_frame(appended, self.columns).cells
+        # Sel yang sama digabungkan: count/sum dijumlahkan, min/max diambil ekstremnya
+        combine = {(col, stat): 'sum' if stat in ('count', 'sum') else stat
+                   for col, stat in self.cells.columns}
+        cells = pd.concat([self.cells, update]).groupby(
+            level=list(range(self.cells.index.nlevels)), observed=True, sort=True).agg(combine)
+        return RollupCube(cells[self.cells.columns])
+
+    @property
+    def columns(self):
+        return list(self.cells.columns.get_level_values(0).unique())
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _grouped(self, by, columns, stat):
+        subset = self.cells[[(col, stat) for col in columns]]
+        subset.columns = columns
+        if not by:
+            return subset.groupby(np.zeros(len(subset), dtype=np.int8))
+        return subset.groupby(level=by, observed=True, sort=True)
+
+    def mean(self, by, columns):
+        """
+        Menghitung rata-rata kolom untuk setiap kombinasi dimensi `by`.
+
+        Parameters:
+        - by (list): Dimensi kubus untuk pengelompokan (subset dari CUBE_KEYS).
+        - columns (list): Kolom numerik yang dihitung.
+
+        Returns:
+        - pd.DataFrame: Rata-rata per kelompok dengan dimensi sebagai kolom biasa.
+        """
+        sums = self._grouped(by, columns, 'sum').sum()
+        counts = self._grouped(by, columns, 'count').sum()
+        means = sums / counts.where(counts > 0)
+        return means.reset_index() if by else means
+
+    def count(self, by, columns):
+        """
+        Menghitung jumlah nilai valid (bukan NaN) untuk setiap kelompok.
+        """
+        counts = self._grouped(by, columns, 'count').sum()
+        return counts.reset_index() if by else counts
+
+    def min(self, by, columns):
+        """
+        Menghitung nilai minimum kolom untuk setiap kelompok.
+        """
+        mins = self._grouped(by, columns, 'min').min()
+        return mins.reset_index() if by else mins
+
+    def max(self, by, columns):
+        """
+        Menghitung nilai maksimum kolom untuk setiap kelompok.
+        """
+        maxs = self._grouped(by, columns, 'max').max()
+        return maxs.reset_index() if by else maxs
+
+
+def get_rollup(df, month_year=None):
+    """
+    Mengambil kubus agregat untuk dataset, membangunnya sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses.
+    - month_year (np.ndarray): Kunci awal bulan per baris yang sudah dihitung,
+      dipakai hanya saat kubus pertama kali dibangun.
+
+    Returns:
+    - RollupCube: Kubus agregat yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'rollup', lambda frame: RollupCube.from_frame(frame, month_year=month_year))
+
+
+register_extender('rollup', lambda cube, df, offset: cube.extended(df.iloc[offset:]))
@@ -0,0 +1,124 @@
+import sys
+
+import pandas as pd
+
+# Kolom kalender cukup disimpan sebagai integer kecil
+CALENDAR_DTYPES = {
+    'No': 'int32',
+    'year': 'int16',
+    'month': 'int8',
+    'day': 'int8',
+    'hour': 'int8',
+}
+
+POLLUTANT_COLUMNS = ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3']
+WEATHER_COLUMNS = ['TEMP', 'PRES', 'DEWP', 'RAIN', 'WSPM']
+MEASUREMENT_COLUMNS = POLLUTANT_COLUMNS + WEATHER_COLUMNS
+
+# 16 arah mata angin yang dipakai dataset PRSA, searah jarum jam dari utara
+WIND_DIRECTIONS = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+                   'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
+
+# Musim berdasarkan bulan, mengikuti kolom 'season' pada combined_data.csv
+SEASON_BY_MONTH = {
+    12: 'Winter', 1: 'Winter', 2: 'Winter',
+    3: 'Spring', 4: 'Spring', 5: 'Spring',
+    6: 'Summer', 7: 'Summer', 8: 'Summer',
+    9: 'Autumn', 10: 'Autumn', 11: 'Autumn',
+}
+
+# Nama bulan untuk label dan teks di dashboard, indeks 0 adalah Januari
+MONTH_NAMES = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+               'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
+
+CATEGORICAL_DTYPES = {
+    'station': 'category',
+    'wd': pd.CategoricalDtype(WIND_DIRECTIONS),
+    'season': 'category',
+}
+
+# Skema lengkap kolom PRSA (kolom 'datetime' diparsing terpisah)
+COLUMN_DTYPES = {
+    **CALENDAR_DTYPES,
+    **{col: 'float32' for col in MEASUREMENT_COLUMNS},
+    **CATEGORICAL_DTYPES,
+}
+
+
+def read_dtypes(columns):
+    """
+    Mengambil bagian skema yang relevan untuk dipakai pd.read_csv(dtype=...).
+
+    Parameters:
+    - columns (iterable): Nama kolom yang ada di file CSV.
+
+    Returns:
+    - dict: Pemetaan nama kolom ke dtype.
+    """
+    return {col: COLUMN_DTYPES[col] for col in columns if col in COLUMN_DTYPES}
+
+
+def read_csv_typed(path, **kwargs):
+    """
+    Membaca file CSV PRSA dengan skema yang diterapkan saat parsing.
+
+    Parameters:
+    - path (str): Path ke file CSV.
+    - **kwargs: Argumen tambahan untuk pd.read_csv.
+
+    Returns:
+    - pd.DataFrame: DataFrame dengan dtype sesuai skema.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    return pd.read_csv(path, dtype=read_dtypes(header), **kwargs)
+
+
+def apply_schema(df):
+    """
+    Mengubah dtype kolom DataFrame agar sesuai skema.
+
+    Dipakai untuk data yang tidak melewati read_csv_typed, misalnya snapshot lama
+    atau DataFrame yang dibuat di memori.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang akan dikonversi.
+
+    Returns:
+    - pd.DataFrame: DataFrame baru dengan dtype sesuai skema.
+    """
+    dtypes = {col: dtype for col, dtype in read_dtypes(df.columns).items()
+              if df[col].dtype != dtype}
+    return df.astype(dtypes) if dtypes else df
+
+
+def memory_report(before, after):
+    """
+    Membandingkan penggunaan memori per kolom sebelum dan sesudah skema diterapkan.
+
+    Parameters:
+    - before (pd.DataFrame): DataFrame dengan dtype hasil inferensi pandas.
+    - after (pd.DataFrame): DataFrame dengan dtype sesuai skema.
+
+    Returns:
+    - pd.DataFrame: Ukuran memori (bytes) per kolom, total, dan rasio penghematan.
+    """
+    report = pd.DataFrame({
+        'dtype_sebelum': before.dtypes.astype(str),
+        'bytes_sebelum': before.memory_usage(index=False, deep=True),
+        'dtype_sesudah': after.dtypes.astype(str),
+        'bytes_sesudah': after.memory_usage(index=False, deep=True),
+    })
+    report.loc['TOTAL'] = ['', report['bytes_sebelum'].sum(),
+                           '', report['bytes_sesudah'].sum()]
+    report['rasio'] = report['bytes_sebelum'] / report['bytes_sesudah']
+    return report
+
+
+if __name__ == '__main__':
+    # Contoh: python dashboard/schema.py dashboard/combined_data.csv
+    if len(sys.argv) != 2:
+        sys.exit('Penggunaan: python schema.py <file_csv>')
+    raw = pd.read_csv(sys.argv[1], parse_dates=['datetime'])
+    typed = read_csv_typed(sys.argv[1], parse_dates=['datetime'])
+    with pd.option_context('display.width', 120):
+        print(memory_report(raw, typed))
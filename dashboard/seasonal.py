@@ -0,0 +1,286 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DEFAULT_CACHE_DIR, attach_dataset, columns_on_disk, dataset_fingerprint, get_derived
+from schema import POLLUTANT_COLUMNS
+from timeseries import get_resample_cache
+
+# Panjang siklus musiman dalam hari (29 Februari digabung dengan 28 Februari)
+SEASON_DAYS = 365
+
+# Jendela rata-rata bergerak terpusat untuk tren (hari); tepi deret memakai
+# jendela yang terpotong selama jumlah nilainya paling sedikit TREND_MIN_DAYS
+TREND_WINDOW = 365
+TREND_MIN_DAYS = 90
+
+# Jendela penghalusan melingkar untuk komponen musiman (hari)
+SEASONAL_SMOOTHING = 31
+
+# Skor z robust (berbasis median dan MAD) di atas batas ini dianggap anomali
+ANOMALY_THRESHOLD = 3.5
+
+# Jumlah proses worker analisis musiman (0 atau 1 berarti dihitung di proses ini)
+DEFAULT_SEASONAL_WORKERS = int(os.environ.get('AIR_QUALITY_SEASONAL_WORKERS', os.cpu_count() or 1))
+
+# Jumlah deret stasiun × polutan minimum sebelum pool proses dipakai. Satu deret
+# dianalisis dalam 2-5 ms, sedangkan memulai worker 'spawn' dan membuka dataset
+# memakan 1-6 detik (benchmarks/bench_dashboard.py, langkah seasonal.workers_*):
+# dataset 12 stasiun (72 deret) selesai dalam 0,2 detik di proses ini
+PARALLEL_MIN_TASKS = int(os.environ.get('AIR_QUALITY_SEASONAL_MIN_TASKS', 1000))
+
+# Bulan untuk setiap hari pada kalender 365 hari, dimulai 1 Januari
+MONTH_OF_DAY = pd.date_range('2001-01-01', periods=SEASON_DAYS, freq='D').month.to_numpy()
+
+SUMMARY_COLUMNS = ['station', 'pollutant', 'days', 'amplitude', 'strength', 'peak_month', 'trough_month',
+                   'anomaly_days', 'episodes']
+EPISODE_COLUMNS = ['station', 'pollutant', 'start', 'end', 'days', 'peak_date', 'peak_value', 'peak_score']
+
+
+def _moving_mean(values, window, min_count, circular=False):
+    # Rata-rata bergerak terpusat yang mengabaikan NaN, lewat jumlah kumulatif
+    half = window // 2
+    if circular:
+        values = np.concatenate([values[-half:], values, values[:half]])
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    n = len(values)
+    lo = np.clip(np.arange(n) - half, 0, n)
+    hi = np.clip(np.arange(n) + half + 1, 0, n)
+    total, count = sums[hi] - sums[lo], counts[hi] - counts[lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(count >= min_count, total / count, np.nan)
+    return means[half:n - half] if circular else means
+
+
+def _day_of_season(dates):
+    # Posisi hari pada kalender 365 hari; 29 Februari memakai posisi 28 Februari
+    years = dates.astype('datetime64[Y]')
+    day = (dates - years.astype('datetime64[D]')).astype(np.int64)
+    year = years.astype(np.int64) + 1970
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    return np.where(leap & (day >= 59), day - 1, day)
+
+
+def decompose(dates, values):
+    """
+    Dekomposisi aditif deret harian menjadi tren, musiman tahunan dan residual.
+
+    Tren adalah rata-rata bergerak terpusat TREND_WINDOW hari. Komponen musiman
+    adalah rata-rata nilai tanpa tren untuk setiap hari dalam setahun, dihaluskan
+    secara melingkar dan dipusatkan ke nol. Residual adalah sisanya.
+
+    Parameters:
+    - dates (np.ndarray): Tanggal harian (datetime64[D]) yang berurutan tanpa celah.
+    - values (np.ndarray): Nilai rata-rata harian, boleh berisi NaN.
+
+    Returns:
+    - dict: 'trend', 'seasonal', 'residual' (sepanjang deret) dan 'profile'
+      (komponen musiman untuk setiap hari pada kalender SEASON_DAYS hari).
+    """
+    trend = _moving_mean(values, TREND_WINDOW, TREND_MIN_DAYS)
+    detrended = values - trend
+    day = _day_of_season(dates)
+    valid = ~np.isnan(detrended)
+    sums = np.bincount(day[valid], weights=detrended[valid], minlength=SEASON_DAYS)
+    counts = np.bincount(day[valid], minlength=SEASON_DAYS)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = np.where(counts > 0, sums / counts, np.nan)
+    profile = _moving_mean(profile, SEASONAL_SMOOTHING, 1, circular=True)
+    profile -= np.nanmean(profile) if np.isfinite(profile).any() else 0.0
+    seasonal = profile[day]
+    return {'trend': trend, 'seasonal': seasonal, 'residual': values - trend - seasonal, 'profile': profile}
+
+
+def robust_scores(residual):
+    """
+    Skor z robust residual: (r - median) / (1.4826 × MAD).
+
+    Median dan MAD tidak terpengaruh oleh episode ekstrem itu sendiri, berbeda
+    dengan rata-rata dan simpangan baku. Skor NaN jika MAD nol atau residual kosong.
+    """
+    valid = residual[~np.isnan(residual)]
+    if not len(valid):
+        return np.full(len(residual), np.nan)
+    median = np.median(valid)
+    mad = np.median(np.abs(valid - median)) * 1.4826
+    if mad == 0:
+        return np.full(len(residual), np.nan)
+    return (residual - median) / mad
+
+
+def find_episodes(dates, values, scores, threshold=ANOMALY_THRESHOLD):
+    """
+    Menggabungkan hari anomali positif yang berurutan menjadi episode polusi.
+
+    Returns:
+    - list: Satu dict per episode (lihat EPISODE_COLUMNS tanpa station/pollutant).
+    """
+    flagged = np.nan_to_num(scores, nan=-np.inf) > threshold
+    if not flagged.any():
+        return []
+    edges = np.diff(np.concatenate([[0], flagged.astype(np.int8), [0]]))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    episodes = []
+    for lo, hi in zip(starts, ends):
+        peak = lo + int(np.nanargmax(scores[lo:hi]))
+        episodes.append({
+            'start': dates[lo], 'end': dates[hi - 1], 'days': int(hi - lo),
+            'peak_date': dates[peak], 'peak_value': float(values[peak]), 'peak_score': float(scores[peak]),
+        })
+    return episodes
+
+
+def analyze_series(dates, values):
+    """
+    Dekomposisi dan penilaian anomali satu deret harian stasiun × polutan.
+
+    Parameters:
+    - dates (np.ndarray): Awal hari (datetime64) untuk hari yang memiliki data, terurut.
+    - values (np.ndarray): Rata-rata harian.
+
+    Returns:
+    - dict: 'summary' (ringkasan, lihat SUMMARY_COLUMNS), 'episodes' (daftar
+      episode) dan 'profile' (komponen musiman SEASON_DAYS hari).
+    """
+    dates = np.asarray(dates).astype('datetime64[D]')
+    if not len(dates):
+        return {'summary': {'days': 0}, 'episodes': [], 'profile': np.full(SEASON_DAYS, np.nan)}
+    # Hari tanpa data diisi NaN agar jendela bergerak sesuai kalender
+    full = np.arange(dates[0], dates[-1] + 1, dtype='datetime64[D]')
+    series = np.full(len(full), np.nan)
+    series[(dates - dates[0]).astype(np.int64)] = values
+
+    parts = decompose(full, series)
+    scores = robust_scores(parts['residual'])
+    episodes = find_episodes(full, series, scores)
+    profile = parts['profile']
+
+    # Kekuatan musiman: 1 - Var(residual) / Var(musiman + residual), 0 jika tidak ada pola
+    both = ~np.isnan(parts['residual'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        strength = 1 - np.var(parts['residual'][both]) / np.var((parts['seasonal'] + parts['residual'])[both])
+    has_profile = np.isfinite(profile).any()
+    summary = {
+        'days': int((~np.isnan(series)).sum()),
+        'amplitude': float(np.nanmax(profile) - np.nanmin(profile)) if has_profile else np.nan,
+        'strength': float(max(0.0, strength)) if np.isfinite(strength) else np.nan,
+        'peak_month': int(MONTH_OF_DAY[np.nanargmax(profile)]) if has_profile else None,
+        'trough_month': int(MONTH_OF_DAY[np.nanargmin(profile)]) if has_profile else None,
+        'anomaly_days': int(sum(episode['days'] for episode in episodes)),
+        'episodes': len(episodes),
+    }
+    return {'summary': summary, 'episodes': episodes, 'profile': profile}
+
+
+# Dataset di proses worker, dibuka sekali oleh _init_worker
+_frame = None
+
+
+def _init_worker(fingerprint, cache_dir):
+    # Worker membuka kolom memory-mapped yang sama dengan proses induk
+    global _frame
+    _frame = attach_dataset(fingerprint, cache_dir)
+
+
+def _analyze_task(task, frame=None):
+    station, pollutant = task
+    dates, values = get_resample_cache(_frame if frame is None else frame).series(station, pollutant, 'daily')
+    return analyze_series(dates, values)
+
+
+class SeasonalAnalysis:
+    """
+    Hasil dekomposisi musiman dan episode polusi untuk setiap stasiun × polutan.
+
+    Atribut:
+    - summary (pd.DataFrame): Satu baris per stasiun × polutan (SUMMARY_COLUMNS).
+    - episodes (pd.DataFrame): Satu baris per episode polusi (EPISODE_COLUMNS).
+    - profiles (pd.DataFrame): Kolom 'station', 'pollutant', 'day' (1-365) dan
+      'seasonal' (komponen musiman).
+    - seconds (float): Waktu analisis.
+    - workers (int): Jumlah proses worker yang dipakai (0 berarti di proses ini).
+    """
+
+    def __init__(self, tasks, results, seconds, workers):
+        self.seconds = seconds
+        self.workers = workers
+        self.summary = pd.DataFrame(
+            [{'station': station, 'pollutant': pollutant, **result['summary']}
+             for (station, pollutant), result in zip(tasks, results)], columns=SUMMARY_COLUMNS)
+        self.episodes = pd.DataFrame(
+            [{'station': station, 'pollutant': pollutant, **episode}
+             for (station, pollutant), result in zip(tasks, results) for episode in result['episodes']],
+            columns=EPISODE_COLUMNS)
+        self.profiles = pd.DataFrame({
+            'station': np.repeat([station for station, _ in tasks], SEASON_DAYS),
+            'pollutant': np.repeat([pollutant for _, pollutant in tasks], SEASON_DAYS),
+            'day': np.tile(np.arange(1, SEASON_DAYS + 1), len(tasks)),
+            'seasonal': np.concatenate([result['profile'] for result in results]) if results else [],
+        })
+
+
+def run_seasonal_analysis(df, pollutants=POLLUTANT_COLUMNS, workers=None, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Menjalankan analisis musiman untuk setiap stasiun × polutan.
+
+    Setiap deret menjadi satu pekerjaan di pool proses, sehingga waktu analisis
+    turun sebanding jumlah core saat stasiun bertambah. Worker membuka kolom
+    memory-mapped dataset yang sama (lihat data_loader.attach_dataset) tanpa
+    menyalin data. Dataset yang kolomnya tidak ada di disk (misalnya setelah
+    data live ditambahkan) dianalisis di proses ini.
+
+    Parameters:
+    - df (pd.DataFrame): Dataset bersama hasil load_combined_data.
+    - pollutants (list): Polutan yang dianalisis.
+    - workers (int): Jumlah proses worker. Default DEFAULT_SEASONAL_WORKERS, atau
+      dihitung di proses ini jika deretnya kurang dari PARALLEL_MIN_TASKS.
+    - cache_dir (str): Direktori cache dataset.
+
+    Returns:
+    - SeasonalAnalysis: Hasil analisis.
+    """
+    start = time.perf_counter()
+    stations = get_resample_cache(df).stations
+    tasks = [(station, pollutant) for station in stations for pollutant in pollutants]
+    if workers is None:
+        workers = DEFAULT_SEASONAL_WORKERS if len(tasks) >= PARALLEL_MIN_TASKS else 0
+    workers = min(workers, len(tasks))
+
+    fingerprint = dataset_fingerprint(df)
+    results = None
+    if workers > 1 and columns_on_disk(fingerprint, cache_dir):
+        try:
+            # 'spawn' agar worker tidak mewarisi thread server Streamlit lewat fork
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker, initargs=(fingerprint, cache_dir)) as pool:
+                results = list(pool.map(_analyze_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+        except BrokenProcessPool:
+            # Worker gagal dimulai (misalnya kolom terhapus dari cache): hitung di proses ini
+            results = None
+    if results is None:
+        workers = 0
+        results = [_analyze_task(task, df) for task in tasks]
+    return SeasonalAnalysis(tasks, results, time.perf_counter() - start, workers)
+
+
+def get_seasonal_analysis(df):
+    """
+    Mengambil hasil analisis musiman untuk dataset, dihitung sekali per versi dataset.
+
+    Tidak ada extender untuk data live: tren dan komponen musiman bergantung pada
+    seluruh deret, sehingga versi dataset baru dianalisis ulang.
+
+    Parameters:
+    - df (pd.DataFrame): Dataset bersama hasil load_combined_data atau extend_dataset.
+
+    Returns:
+    - SeasonalAnalysis: Hasil yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'seasonal', run_seasonal_analysis)
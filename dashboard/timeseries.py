@@ -0,0 +1,170 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived
+
+# Resolusi waktu yang tersedia, dari yang paling rinci
+FREQUENCIES = ['hourly', 'daily', 'weekly', 'monthly']
+FREQUENCY_LABELS = {'hourly': 'Per Jam', 'daily': 'Harian', 'weekly': 'Mingguan', 'monthly': 'Bulanan'}
+
+# Jumlah titik maksimum per garis setelah downsampling
+DEFAULT_LINE_POINTS = 1000
+
+
+def _bin_starts(datetimes, frequency):
+    # Awal periode setiap baris sebagai datetime64[ns]
+    if frequency == 'daily':
+        return datetimes.astype('datetime64[D]').astype('datetime64[ns]')
+    if frequency == 'weekly':
+        # Minggu dimulai hari Senin; 1970-01-01 jatuh pada hari Kamis
+        days = datetimes.astype('datetime64[D]').astype(np.int64)
+        return ((days + 3) // 7 * 7 - 3).astype('datetime64[D]').astype('datetime64[ns]')
+    if frequency == 'monthly':
+        return datetimes.astype('datetime64[M]').astype('datetime64[ns]')
+    raise ValueError(f"Resolusi '{frequency}' tidak dikenal. Pilih salah satu dari {FREQUENCIES}.")
+
+
+def lttb(x, y, threshold):
+    """
+    Downsampling Largest-Triangle-Three-Buckets.
+
+    Titik pertama dan terakhir selalu dipertahankan. Titik di antaranya dibagi
+    menjadi threshold - 2 ember, dan dari setiap ember dipilih titik yang
+    membentuk segitiga terbesar dengan titik terpilih sebelumnya dan rata-rata
+    ember berikutnya, sehingga puncak dan lembah tetap terlihat.
+
+    Parameters:
+    - x (np.ndarray): Koordinat x (numerik, terurut).
+    - y (np.ndarray): Nilai y tanpa NaN.
+    - threshold (int): Jumlah titik hasil.
+
+    Returns:
+    - np.ndarray: Posisi titik yang dipertahankan, terurut.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Rata-rata ember berikutnya (atau titik terakhir untuk ember terakhir)
+        next_lo, next_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        # Dua kali luas segitiga (titik sebelumnya, kandidat, rata-rata ember berikutnya)
+        area = np.abs((x[previous] - avg_x) * (y[lo:hi] - y[previous])
+                      - (x[previous] - x[lo:hi]) * (avg_y - y[previous]))
+        previous = lo + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+
+class ResampleCache:
+    """
+    Deret waktu per stasiun pada beberapa resolusi.
+
+    Setiap kombinasi (stasiun, kolom, resolusi) dihitung sekali saat pertama
+    diminta dengan np.add.reduceat pada baris stasiun yang sudah terurut, lalu
+    disimpan. Resolusi 'hourly' memakai nilai per jam apa adanya.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.station_rows = {
+            station: np.asarray(rows, dtype=np.int64)
+            for station, rows in df.groupby('station', observed=True, sort=True).indices.items()}
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @property
+    def stations(self):
+        return list(self.station_rows)
+
+    def series(self, station, column, frequency):
+        """
+        Mengambil deret waktu rata-rata satu kolom untuk satu stasiun.
+
+        Parameters:
+        - station (str): Nama stasiun.
+        - column (str): Kolom numerik.
+        - frequency (str): Salah satu FREQUENCIES.
+
+        Returns:
+        - tuple: (array datetime64[ns] awal periode, array nilai rata-rata float64)
+        """
+        key = (station, column, frequency)
+        with self._lock:
+            cached = self._series.get(key)
+        if cached is not None:
+            return cached
+
+        rows = self.station_rows[station]
+        datetimes = self.df['datetime'].to_numpy()[rows].astype('datetime64[ns]')
+        values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+        if frequency == 'hourly' or not len(rows):
+            result = (datetimes, values)
+        else:
+            bins = _bin_starts(datetimes, frequency)
+            first = np.flatnonzero(np.concatenate([[True], bins[1:] != bins[:-1]]))
+            valid = ~np.isnan(values)
+            sums = np.add.reduceat(np.where(valid, values, 0.0), first)
+            counts = np.add.reduceat(valid.astype(np.int64), first)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = (bins[first], np.where(counts > 0, sums / counts, np.nan))
+
+        with self._lock:
+            self._series[key] = result
+        return result
+
+    def window(self, station, column, frequency, start=None, end=None, max_points=DEFAULT_LINE_POINTS):
+        """
+        Mengambil bagian deret yang terlihat dan mengecilkannya ke batas jumlah titik.
+
+        Rentang dicari dengan binary search dan LTTB hanya dijalankan pada titik di
+        dalam rentang, sehingga biayanya bergantung pada lebar rentang, bukan
+        ukuran dataset.
+
+        Parameters:
+        - station, column, frequency: Lihat series.
+        - start, end (datetime): Rentang waktu yang terlihat (inklusif). Periode yang
+          memuat start ikut diambil. None berarti tanpa batas.
+        - max_points (int): Jumlah titik maksimum.
+
+        Returns:
+        - pd.DataFrame: Kolom 'datetime' dan column.
+        """
+        datetimes, values = self.series(station, column, frequency)
+        lo, hi = 0, len(datetimes)
+        if start is not None:
+            # Periode yang memuat start ikut ditampilkan: start dibulatkan ke awal periodenya
+            first = np.array([np.datetime64(pd.Timestamp(start), 'ns')])
+            first = first.astype('datetime64[h]') if frequency == 'hourly' else _bin_starts(first, frequency)
+            lo = int(np.searchsorted(datetimes, first[0].astype('datetime64[ns]'), side='left'))
+        if end is not None:
+            hi = int(np.searchsorted(datetimes, np.datetime64(pd.Timestamp(end), 'ns'), side='right'))
+        datetimes, values = datetimes[lo:hi], values[lo:hi]
+        valid = ~np.isnan(values)
+        datetimes, values = datetimes[valid], values[valid]
+        keep = lttb(datetimes.astype(np.int64), values, max_points)
+        return pd.DataFrame({'datetime': datetimes[keep], column: values[keep]})
+
+
+def get_resample_cache(df):
+    """
+    Mengambil cache deret waktu untuk dataset, dibuat sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses dan terurut berdasarkan 'datetime'.
+
+    Returns:
+    - ResampleCache: Cache yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'resample_cache', ResampleCache)
@@ -0,0 +1,154 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data_loader import get_derived, register_extender
+from filter_engine import get_filter_index
+from schema import WIND_DIRECTIONS
+
+# Batas bawah setiap kelas kecepatan angin (m/s); kelas terakhir tanpa batas atas
+SPEED_EDGES = [0.0, 1.0, 2.0, 3.0, 5.0, 8.0]
+SPEED_BANDS = ['0-1', '1-2', '2-3', '3-5', '5-8', '≥8']
+
+# Jumlah hasil per filter yang disimpan untuk setiap dataset
+MAX_CACHED_SELECTIONS = 32
+
+
+def _direction_codes(wd):
+    # Kode arah sesuai urutan WIND_DIRECTIONS, -1 untuk arah kosong atau tidak dikenal
+    if isinstance(wd.dtype, pd.CategoricalDtype) and list(wd.cat.categories) == WIND_DIRECTIONS:
+        return wd.array.codes
+    return pd.Categorical(wd, categories=WIND_DIRECTIONS).codes
+
+
+def _speed_band(speeds):
+    # Kode kelas kecepatan per baris, -1 untuk kecepatan kosong atau negatif
+    speeds = np.asarray(speeds, dtype=np.float64)
+    band = np.searchsorted(SPEED_EDGES, speeds, side='right') - 1
+    band[np.isnan(speeds) | (speeds < 0)] = -1
+    return band
+
+
+class WindRose:
+    """
+    Jumlah jam dan rata-rata polutan per stasiun × arah angin × kelas kecepatan.
+
+    Setiap baris diberi satu kode sel (stasiun, arah, kelas kecepatan) dari kode
+    kategori 'station' dan 'wd' sekali saat dibangun. Agregasi untuk filter apa
+    pun cukup satu np.bincount atas kode sel baris yang lolos filter (dengan bobot
+    nilai polutan untuk jumlahnya), lalu hasilnya disimpan per filter.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self.stations = list(df['station'].cat.categories)
+        self.cells = self._cell_codes(df)
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cells_per_station(self):
+        return len(WIND_DIRECTIONS) * len(SPEED_BANDS)
+
+    def _cell_codes(self, df):
+        # Stasiun berada di posisi paling luar, sehingga kode baris lama tetap
+        # berlaku saat kategori stasiun baru ditambahkan di akhir
+        station = df['station'].array.codes.astype(np.int64)
+        direction = _direction_codes(df['wd']).astype(np.int64)
+        band = _speed_band(df['WSPM'].to_numpy(dtype=np.float64, na_value=np.nan))
+        cells = (station * self.cells_per_station + direction * len(SPEED_BANDS) + band).astype(np.int32)
+        cells[(station < 0) | (direction < 0) | (band < 0)] = -1
+        cells.flags.writeable = False
+        return cells
+
+    def extended(self, df, offset):
+        """
+        Membuat agregat untuk df yang berisi dataset lama ditambah baris baru mulai
+        posisi offset. Hanya kode sel baris baru yang dihitung.
+        """
+        rose = WindRose.__new__(WindRose)
+        rose.df = df
+        rose.stations = list(df['station'].cat.categories)
+        cells = np.concatenate([self.cells, rose._cell_codes(df.iloc[offset:])])
+        cells.flags.writeable = False
+        rose.cells = cells
+        rose._results = OrderedDict()
+        rose._lock = threading.Lock()
+        return rose
+
+    def aggregate(self, pollutant, selection=None):
+        """
+        Menghitung jumlah jam dan rata-rata polutan per stasiun, arah dan kelas kecepatan.
+
+        Parameters:
+        - pollutant (str): Kolom polutan yang dirata-ratakan.
+        - selection (FilterSelection): Filter dari display_filtered_dataframe.
+          None berarti seluruh data.
+
+        Returns:
+        - pd.DataFrame: Kolom 'station', 'direction', 'band', 'hours' (jumlah jam),
+          'measured' (jumlah jam dengan nilai polutan) dan 'mean', satu baris per
+          sel untuk stasiun yang memiliki data angin.
+        """
+        key = (pollutant, selection)
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                return cached
+
+        if selection is None:
+            rows = slice(None)
+        else:
+            result = get_filter_index(self.df).query(selection)
+            rows = result.rows if isinstance(result.rows, slice) else result.positions
+        cells = self.cells[rows]
+        values = self.df[pollutant].to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+
+        size = len(self.stations) * self.cells_per_station
+        valid = cells >= 0
+        hours = np.bincount(cells[valid], minlength=size)
+        measured = valid & ~np.isnan(values)
+        sums = np.bincount(cells[measured], weights=values[measured], minlength=size)
+        counts = np.bincount(cells[measured], minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.nan)
+
+        shape = (len(self.stations), len(WIND_DIRECTIONS), len(SPEED_BANDS))
+        station_idx, direction_idx, band_idx = np.unravel_index(np.arange(size), shape)
+        table = pd.DataFrame({
+            'station': np.asarray(self.stations, dtype=object)[station_idx],
+            'direction': np.asarray(WIND_DIRECTIONS, dtype=object)[direction_idx],
+            'band': np.asarray(SPEED_BANDS, dtype=object)[band_idx],
+            'hours': hours,
+            'measured': counts,
+            'mean': means,
+        })
+        # Stasiun tanpa data angin pada filter ini tidak disertakan
+        station_hours = hours.reshape(len(self.stations), -1).sum(axis=1)
+        table = table[station_hours[station_idx] > 0].reset_index(drop=True)
+
+        with self._lock:
+            self._results[key] = table
+            while len(self._results) > MAX_CACHED_SELECTIONS:
+                self._results.popitem(last=False)
+        return table
+
+
+def get_wind_rose(df):
+    """
+    Mengambil agregat arah angin untuk dataset, dibuat sekali per versi dataset.
+
+    Parameters:
+    - df (pd.DataFrame): DataFrame yang telah diproses, dengan kolom 'wd' dan
+      'station' bertipe kategori.
+
+    Returns:
+    - WindRose: Agregat yang dipakai bersama oleh semua sesi.
+    """
+    return get_derived(df, 'wind_rose', WindRose)
+
+
+register_extender('wind_rose', lambda rose, df, offset: rose.extended(df, offset))
@@ -0,0 +1,102 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Modul dashboard diimpor dengan nama datar, sama seperti saat dashboard.py dijalankan
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dashboard'))
+
+from schema import SEASON_BY_MONTH, WIND_DIRECTIONS, apply_schema  # noqa: E402
+
+STATIONS = ['Aotizhongxin', 'Changping', 'Dingling']
+
+
+def make_frame(start='2014-01-01', days=730, seed=0):
+    """
+    Membuat dataset kecil berbentuk combined_data.csv untuk pengujian.
+
+    Data berisi NaN di setiap kolom pengukuran dan celah beberapa hari pada satu
+    stasiun, sehingga jendela berbasis waktu dan penanganan nilai hilang ikut diuji.
+
+    Parameters:
+    - start (str): Waktu awal data.
+    - days (int): Panjang data dalam hari.
+    - seed (int): Seed generator acak.
+
+    Returns:
+    - pd.DataFrame: Dataset dengan skema dashboard, terurut berdasarkan datetime.
+    """
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=days * 24, freq='h')
+    datetime = np.repeat(times.to_numpy(), len(STATIONS))
+    station = np.tile(STATIONS, len(times))
+    n = len(datetime)
+    month = pd.DatetimeIndex(datetime).month.to_numpy()
+    winter = np.cos((month - 1) / 12 * 2 * np.pi)
+
+    pm25 = np.clip(70 * (1 + 0.5 * winter) + rng.gamma(2, 25, n), 2, None)
+    df = pd.DataFrame({
+        'datetime': datetime,
+        'year': pd.DatetimeIndex(datetime).year,
+        'month': month,
+        'day': pd.DatetimeIndex(datetime).day,
+        'hour': pd.DatetimeIndex(datetime).hour,
+        'PM2.5': pm25,
+        'PM10': pm25 * rng.uniform(1.1, 1.6, n),
+        'SO2': np.clip(15 * (1 + winter) + rng.normal(0, 5, n), 1, None),
+        'NO2': np.clip(50 + rng.normal(0, 15, n), 2, None),
+        'CO': np.clip(1200 * (1 + 0.6 * winter) + rng.normal(0, 300, n), 100, None),
+        'O3': np.clip(60 * (1 - 0.6 * winter) + rng.normal(0, 20, n), 1, None),
+        'TEMP': 13 - 15 * winter + rng.normal(0, 3, n),
+        'PRES': 1012 + 10 * winter + rng.normal(0, 4, n),
+        'DEWP': 2 - 15 * winter + rng.normal(0, 4, n),
+        'RAIN': np.where(rng.random(n) < 0.04, rng.exponential(2, n), 0.0),
+        'wd': rng.choice(WIND_DIRECTIONS, n),
+        'WSPM': rng.gamma(2, 1.2, n),
+        'station': station,
+        'season': [SEASON_BY_MONTH[m] for m in month],
+    })
+    for col in ['PM2.5', 'PM10', 'SO2', 'NO2', 'CO', 'O3', 'TEMP', 'RAIN', 'WSPM']:
+        df.loc[rng.random(n) < 0.05, col] = np.nan
+    df.loc[rng.random(n) < 0.02, 'wd'] = np.nan
+
+    # Celah tiga hari pada satu stasiun: jam yang hilang tidak boleh menggeser jendela
+    gap = (df['station'] == STATIONS[1]) & df['datetime'].between('2014-03-10', '2014-03-12 23:00')
+    df = df[~gap].reset_index(drop=True)
+    return apply_schema(df)
+
+
+def selection_mask(df, selection):
+    # Filter yang sama dengan FilterIndex.query, ditulis dengan mask boolean pandas
+    mask = pd.Series(True, index=df.index)
+    if selection.stations:
+        mask &= df['station'].isin(selection.stations)
+    if selection.years:
+        mask &= df['year'].isin(selection.years)
+    if selection.seasons:
+        mask &= df['season'].isin(selection.seasons)
+    if selection.start is not None:
+        mask &= df['datetime'] >= selection.start
+    if selection.end is not None:
+        mask &= df['datetime'] <= selection.end
+    return mask.to_numpy()
+
+
+def station_series(df, station, column):
+    # Deret per jam satu stasiun sebagai pd.Series float64 berindeks waktu
+    rows = df[df['station'] == station]
+    return pd.Series(rows[column].to_numpy(dtype='float64'), index=rows['datetime'])
+
+
+@pytest.fixture(scope='session')
+def frame():
+    return make_frame()
+
+
+@pytest.fixture(scope='session')
+def frame64(frame):
+    # Salinan float64 sebagai pembanding pandas, agar selisih presisi float32 tidak ikut diuji
+    measurements = frame.select_dtypes('float32').columns
+    return frame.astype({col: 'float64' for col in measurements})
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aqi import EXCEEDANCE_LIMITS, MIN_PERIODS, ROLLING_WINDOWS, RollingAQI
+from tests.conftest import STATIONS, station_series
+
+
+@pytest.fixture(scope='module')
+def rolling(frame):
+    return RollingAQI(frame)
+
+
+def pandas_rolling(frame, station, pollutant, stat='mean'):
+    window = ROLLING_WINDOWS[pollutant]
+    min_periods = MIN_PERIODS[window] if stat == 'mean' else 1
+    return getattr(station_series(frame, station, pollutant).rolling(f'{window}h', min_periods=min_periods), stat)()
+
+
+def in_range(series, start, end):
+    # Timestamp, bukan string: string '2015-02-01' di pandas berarti sepanjang hari itu
+    if start is None:
+        return series
+    return series[(series.index >= pd.Timestamp(start)) & (series.index <= pd.Timestamp(end))]
+
+
+@pytest.mark.parametrize('pollutant', ['PM2.5', 'O3'])
+def test_rolling_windows_match_pandas(frame, rolling, pollutant):
+    for number, station in enumerate(rolling.stations):
+        lo, hi = rolling.bounds[number], rolling.bounds[number + 1]
+        means = pandas_rolling(frame, station, pollutant)
+        np.testing.assert_array_equal(rolling.datetimes[lo:hi], means.index.to_numpy())
+        np.testing.assert_allclose(rolling.means[pollutant][lo:hi], means.to_numpy(), rtol=1e-5)
+        maxima = pandas_rolling(frame, station, pollutant, 'max')
+        np.testing.assert_allclose(rolling.maxima[pollutant][lo:hi], maxima.to_numpy(), rtol=1e-6)
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2014-03-08', '2014-03-20 12:00'),
+                                        ('2015-01-01', '2015-02-01')])
+def test_exceedances_match_pandas(frame, rolling, start, end):
+    result = rolling.exceedances('PM2.5', EXCEEDANCE_LIMITS['PM2.5'], start, end).set_index('station')
+    for station in STATIONS:
+        means = in_range(pandas_rolling(frame, station, 'PM2.5'), start, end)
+        hourly = in_range(station_series(frame, station, 'PM2.5'), start, end)
+        row = result.loc[station]
+        assert row['jam_di_atas_ambang'] == (means > EXCEEDANCE_LIMITS['PM2.5']).sum()
+        assert row['jam_valid'] == means.notna().sum()
+        assert row['rata_rata_tertinggi'] == pytest.approx(means.max(), rel=1e-5)
+        assert row['waktu_tertinggi'] == means.idxmax()
+        # Nilai per jam tertinggi hanya diambil dari jam di dalam rentang
+        assert row['nilai_per_jam_tertinggi'] == pytest.approx(hourly.max(), rel=1e-6)
+
+
+def test_exceedances_ignore_peak_before_range(frame):
+    # Puncak satu jam sebelum rentang masih berada di jendela 24 jam, tetapi bukan nilai di dalam rentang
+    spiked = frame.copy()
+    spiked.loc[(spiked['station'] == STATIONS[0]) & (spiked['datetime'] == '2014-03-07 23:00'), 'PM2.5'] = 5000
+    engine = RollingAQI(spiked)
+    result = engine.exceedances('PM2.5', 75, '2014-03-08', '2014-03-09', [STATIONS[0]])
+    hourly = station_series(spiked, STATIONS[0], 'PM2.5')['2014-03-08 00:00':'2014-03-09 00:00']
+    assert result['nilai_per_jam_tertinggi'].iloc[0] == pytest.approx(hourly.max(), rel=1e-6)
+    # Rata-rata dan maksimum bergerak di awal rentang tetap memuat puncak tersebut
+    assert result['rata_rata_tertinggi'].iloc[0] > 5000 / 24
+    stats = engine.window_stats('PM2.5', '2014-03-08', '2014-03-09', [STATIONS[0]])
+    assert stats['datetime'].iloc[0] == pd.Timestamp('2014-03-08')
+    assert stats['maksimum'].iloc[0] == 5000
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2014-03-08 05:00', '2014-04-20 12:00')])
+def test_daily_max_mean_matches_pandas(frame, rolling, start, end):
+    # Rata-rata 8 jam O3 maksimum harian (MDA8)
+    result = rolling.daily_max_mean('O3', start, end, [STATIONS[1]])
+    means = in_range(pandas_rolling(frame, STATIONS[1], 'O3'), start, end)
+    expected = means.groupby(means.index.floor('D')).max()
+    np.testing.assert_array_equal(result['date'].to_numpy(), expected.index.to_numpy().astype('datetime64[D]'))
+    np.testing.assert_allclose(result['O3'].to_numpy(), expected.to_numpy(), rtol=1e-5)
+
+
+def test_daily_max_matches_groupby(rolling):
+    result = rolling.daily_max(stations=[STATIONS[0]])
+    number = rolling.stations.index(STATIONS[0])
+    lo, hi = rolling.bounds[number], rolling.bounds[number + 1]
+    aqi = pd.Series(rolling.aqi[lo:hi], index=rolling.datetimes[lo:hi])
+    expected = aqi.groupby(aqi.index.floor('D')).max()
+    np.testing.assert_array_equal(result['AQI'].to_numpy(), expected.to_numpy())
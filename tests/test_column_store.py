@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from column_store import memory_usage
+from data_loader import columns_on_disk, dataset_fingerprint, extend_dataset, load_combined_data
+from tests.conftest import make_frame
+
+
+@pytest.fixture(scope='module')
+def loaded(tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp('cache')
+    path = cache_dir / 'combined_data.csv'
+    make_frame(days=60).to_csv(path, index=False)
+    return load_combined_data(str(path), cache_dir=str(cache_dir), offline=False), str(cache_dir)
+
+
+def next_hours(df, hours):
+    # Baris jam terakhir, digeser beberapa jam ke depan
+    last = df[df['datetime'] == df['datetime'].iloc[-1]]
+    return pd.concat([last.assign(datetime=last['datetime'] + pd.Timedelta(hours=h)) for h in range(1, hours + 1)])
+
+
+def test_loaded_frame_is_mapped_and_read_only(loaded):
+    result, _ = loaded
+    assert memory_usage(result.frame)['heap'] == 0
+    with pytest.raises(ValueError):
+        result.frame['PM2.5'].to_numpy()[0] = 1.0
+
+
+def test_live_version_stays_mapped_but_private(loaded):
+    # Versi live memory-mapped di proses ini saja: tidak ada di store kolom dan tidak ada file tersisa
+    result, cache_dir = loaded
+    first = extend_dataset(result.frame, next_hours(result.frame, 2))
+    second = extend_dataset(first, next_hours(first, 3))
+    for df in (first, second):
+        assert memory_usage(df)['heap'] == 0
+        assert not columns_on_disk(dataset_fingerprint(df), cache_dir)
+        with pytest.raises(ValueError):
+            df['PM2.5'].to_numpy()[0] = 1.0
+    assert np.shares_memory(first['TEMP'].to_numpy(), second['TEMP'].to_numpy())
+    assert not [name for name in os.listdir(os.path.join(cache_dir, 'columns')) if name.startswith('.live-')]
+    pd.testing.assert_frame_equal(second.iloc[:len(result.frame)], result.frame)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from corr_stats import CorrelationStats
+from filter_engine import FilterSelection
+from tests.conftest import STATIONS, selection_mask
+
+COLUMNS = ['PM2.5', 'NO2', 'TEMP', 'RAIN']
+
+SELECTIONS = [
+    FilterSelection((), (), (), None, None),
+    FilterSelection((STATIONS[0], STATIONS[2]), (), (), None, None),
+    FilterSelection((), (2014,), ('Winter', 'Spring'), None, None),
+    FilterSelection((), (), (), pd.Timestamp('2014-02-14 07:00'), pd.Timestamp('2014-06-20 18:00')),
+    FilterSelection((STATIONS[1],), (2014, 2015), ('Winter',),
+                    pd.Timestamp('2014-02-14 07:00'), pd.Timestamp('2015-01-09 12:00')),
+    # Rentang tepat di batas bulan: tidak ada bulan terpotong yang boleh dihitung dua kali
+    FilterSelection((), (), (), pd.Timestamp('2014-03-01'), pd.Timestamp('2014-04-30 23:00')),
+]
+
+
+@pytest.mark.parametrize('selection', SELECTIONS)
+def test_correlation_matches_pandas(frame, frame64, selection):
+    result = CorrelationStats(frame, columns=COLUMNS).correlation(selection)
+    expected = frame64.loc[selection_mask(frame, selection), COLUMNS].corr()
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-9)
@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api import _selection, export_url, parse_params
+from export import MAX_EXPORT_FILES, export_path, export_to_file, iter_csv, open_export
+from filter_engine import FilterIndex, FilterSelection
+from tests.conftest import STATIONS
+
+SELECTION = FilterSelection((STATIONS[0],), (), ('Winter',), pd.Timestamp('2014-01-15'), pd.Timestamp('2015-02-01'))
+
+
+@pytest.fixture
+def result(frame):
+    return FilterIndex(frame).query(SELECTION)
+
+
+def test_csv_export_roundtrip(result, tmp_path):
+    stats = export_to_file(result, SELECTION, 'csv', cache_dir=str(tmp_path), chunk_rows=1000)
+    assert stats.rows == len(result)
+    exported = pd.read_csv(stats.path, parse_dates=['datetime'])
+    expected = result.frame().reset_index(drop=True)
+    pd.testing.assert_frame_equal(exported, expected, check_dtype=False, check_categorical=False, rtol=1e-6)
+
+
+def test_parquet_export_roundtrip(result, tmp_path):
+    stats = export_to_file(result, SELECTION, 'parquet', cache_dir=str(tmp_path), chunk_rows=1000)
+    exported = pd.read_parquet(stats.path)
+    expected = result.frame().reset_index(drop=True)
+    pd.testing.assert_frame_equal(exported, expected, check_categorical=False)
+
+
+def test_export_reuses_file(result, tmp_path):
+    first = export_to_file(result, SELECTION, 'csv', cache_dir=str(tmp_path))
+    second = export_to_file(result, SELECTION, 'csv', cache_dir=str(tmp_path))
+    assert second.path == first.path and second.seconds == 0.0
+
+
+def test_concurrent_exports_of_same_filter(result, tmp_path):
+    # Dua sesi mengekspor filter yang sama bersamaan; potongan keduanya saling berselang
+    barrier = threading.Barrier(2)
+    stats, errors = [], []
+
+    def progress(done, total, seconds):
+        if done < total:
+            barrier.wait(timeout=10)
+
+    def run():
+        try:
+            stats.append(export_to_file(result, SELECTION, 'csv', cache_dir=str(tmp_path),
+                                        chunk_rows=500, progress=progress))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    assert stats[0].path == stats[1].path and stats[0].rows == stats[1].rows == len(result)
+    assert len(pd.read_csv(stats[0].path)) == len(result)
+    assert not [name for name in os.listdir(os.path.dirname(stats[0].path)) if name.endswith('.part')]
+
+
+def test_prune_keeps_recent_exports(frame, tmp_path):
+    # File di luar MAX_EXPORT_FILES terbaru hanya dihapus setelah masa tenggang
+    index = FilterIndex(frame)
+    selections = [FilterSelection((), (), (), pd.Timestamp('2014-01-01') + pd.Timedelta(days=day),
+                                  pd.Timestamp('2014-01-01') + pd.Timedelta(days=day, hours=5))
+                  for day in range(MAX_EXPORT_FILES + 2)]
+    paths = [export_to_file(index.query(selection), selection, 'csv', cache_dir=str(tmp_path)).path
+             for selection in selections[:MAX_EXPORT_FILES + 1]]
+    assert all(os.path.exists(path) for path in paths)
+
+    old = time.time() - 3600
+    os.utime(paths[0], (old, old))
+    export_to_file(index.query(selections[-1]), selections[-1], 'csv', cache_dir=str(tmp_path))
+    assert not os.path.exists(paths[0])
+    assert all(os.path.exists(path) for path in paths[1:])
+
+
+def test_export_url_serves_prepared_file(frame, result, tmp_path):
+    # Tautan unduhan dashboard menghasilkan filter dan file yang sama di endpoint /export
+    stats = export_to_file(result, SELECTION, 'parquet', cache_dir=str(tmp_path))
+    url = urlsplit(export_url(SELECTION, 'parquet', 'http://127.0.0.1:8502/'))
+    assert url.path == '/export'
+    params = parse_params(url.query)
+    selection = _selection(params)
+    served = FilterIndex(frame).query(selection)
+    np.testing.assert_array_equal(served.positions, result.positions)
+    assert export_path(served, selection, params['format'], str(tmp_path)) == stats.path
+
+    chunks = open_export(served, selection, params['format'], str(tmp_path), chunk_bytes=4096)
+    with open(stats.path, 'rb') as f:
+        assert b''.join(data for data, _ in chunks) == f.read()
+    assert open_export(served, selection, 'csv', str(tmp_path)) is None
+
+
+def test_empty_csv_export_has_header(frame):
+    empty = FilterIndex(frame).query(FilterSelection((), (), (), pd.Timestamp('2016-06-01'), None))
+    chunks = list(iter_csv(empty))
+    assert chunks[-1][1] == 0
+    assert b''.join(data for data, _ in chunks).decode('utf-8').strip() == ','.join(frame.columns)
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_engine import FilterIndex, FilterSelection
+from tests.conftest import STATIONS, selection_mask
+
+SELECTIONS = [
+    FilterSelection((), (), (), None, None),
+    FilterSelection((STATIONS[0], STATIONS[2]), (), (), None, None),
+    FilterSelection((), (2014,), ('Winter', 'Spring'), None, None),
+    FilterSelection((), (), (), pd.Timestamp('2014-02-14 07:00'), pd.Timestamp('2014-06-20 18:00')),
+    FilterSelection((STATIONS[1],), (2014, 2015), ('Winter',),
+                    pd.Timestamp('2014-02-14 07:00'), pd.Timestamp('2015-01-09 12:00')),
+]
+
+
+@pytest.mark.parametrize('selection', SELECTIONS)
+def test_filter_index_matches_mask(frame, selection):
+    result = FilterIndex(frame).query(selection)
+    expected = np.flatnonzero(selection_mask(frame, selection))
+    np.testing.assert_array_equal(result.positions, expected)
+    assert len(result) == len(expected)
+    pd.testing.assert_frame_equal(result.page(1, 100), frame.iloc[expected[100:200]])
+
+
+def test_filter_index_empty_range(frame):
+    selection = FilterSelection((), (), (), pd.Timestamp('2015-06-01'), pd.Timestamp('2015-05-01'))
+    assert len(FilterIndex(frame).query(selection)) == 0
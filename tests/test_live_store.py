@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import extend_dataset
+from filter_engine import FilterIndex
+from live_store import LiveStore, live_status, sync_live_data
+from tests.conftest import STATIONS
+
+CUT = pd.Timestamp('2015-12-31 10:00')
+HOUR = pd.Timedelta(hours=1)
+
+
+def test_extend_dataset_matches_concat(frame):
+    offset = len(frame) - 900
+    df = frame.iloc[:offset]
+    for size in (1, 299, 600):
+        df = extend_dataset(df, frame.iloc[len(df):len(df) + size])
+    pd.testing.assert_frame_equal(df, frame.reset_index(drop=True))
+    assert not df['PM2.5'].to_numpy().flags.writeable
+
+
+def test_extend_dataset_adds_categories(frame):
+    new_station = frame.iloc[-3:].assign(station='Dongsi', datetime=frame['datetime'].iloc[-1] + HOUR)
+    extended = extend_dataset(frame, new_station)
+    assert list(extended['station'].cat.categories) == [*frame['station'].cat.categories, 'Dongsi']
+    assert (extended['station'].iloc[-3:] == 'Dongsi').all()
+    assert (extended['station'].iloc[:len(frame)].astype(str) == frame['station'].astype(str)).all()
+
+
+def test_extend_dataset_writes_after_previous_version(frame):
+    # Versi baru memakai buffer yang sama; versi lama dan cabang lain tidak berubah
+    offset = len(frame) - 600
+    first = extend_dataset(frame.iloc[:offset - 100], frame.iloc[offset - 100:offset])
+    second = extend_dataset(first, frame.iloc[offset:offset + 300])
+    assert np.shares_memory(first['PM2.5'].to_numpy(), second['PM2.5'].to_numpy())
+
+    branch = extend_dataset(first, frame.iloc[offset:offset + 300].assign(**{'PM2.5': -1.0}))
+    assert not np.shares_memory(second['PM2.5'].to_numpy(), branch['PM2.5'].to_numpy())
+    pd.testing.assert_frame_equal(second, frame.iloc[:offset + 300].reset_index(drop=True))
+    assert (branch['PM2.5'].iloc[offset:] == -1.0).all()
+    assert len(first) == offset
+
+
+def live_rows(frame, station, start, hours):
+    times = pd.date_range(start, periods=hours, freq='h')
+    rows = frame[(frame['station'] == STATIONS[0]) & frame['datetime'].isin(times)]
+    return rows.assign(station=station).astype({'station': str, 'season': str, 'wd': object})
+
+
+def test_sync_live_data_keeps_rows_in_order(frame, tmp_path):
+    base = frame[frame['datetime'] < CUT].reset_index(drop=True)
+    store = LiveStore(str(tmp_path))
+    a, b, c = STATIONS
+
+    store.append(pd.concat([live_rows(frame, a, CUT, 3), live_rows(frame, b, CUT, 1)]))
+    df = sync_live_data(base, str(tmp_path))
+    # Stasiun b baru sampai CUT: baris a setelahnya menunggu
+    assert df['datetime'].iloc[-1] == CUT
+    assert live_status(base, str(tmp_path))[1:] == (2, 2, 0, 0)
+
+    store.append(live_rows(frame, b, CUT + HOUR, 3))
+    df = sync_live_data(base, str(tmp_path))
+    assert df['datetime'].iloc[-1] == CUT + 2 * HOUR
+    assert live_status(base, str(tmp_path))[1:] == (6, 1, 0, 0)
+
+    # c datang terlambat untuk dua jam pertamanya; Dongsi tertinggal jauh dan
+    # barisnya sudah tercakup snapshot
+    store.append(pd.concat([live_rows(frame, c, CUT, 3), live_rows(frame, 'Dongsi', CUT - 10 * HOUR, 1)]))
+    df = sync_live_data(base, str(tmp_path))
+    assert live_status(base, str(tmp_path))[1:] == (7, 1, 1, 2)
+
+    tail = df.iloc[len(base):]
+    expected = sorted([(CUT + h * HOUR, station) for station in (a, b) for h in range(3)] + [(CUT + 2 * HOUR, c)])
+    assert list(zip(tail['datetime'], tail['station'].astype(str))) == expected
+    FilterIndex(df)
+    assert sync_live_data(base, str(tmp_path)) is df
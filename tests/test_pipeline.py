@@ -0,0 +1,35 @@
+import os
+
+import pandas as pd
+
+from pipeline import Pipeline
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def test_unchanged_run_writes_nothing(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for name in sorted(os.listdir(DATA_DIR)):
+        pd.read_csv(os.path.join(DATA_DIR, name), nrows=24 * 20).to_csv(data_dir / name, index=False)
+
+    first_log, second_log = [], []
+    outputs = Pipeline(str(tmp_path / 'cache'), log=first_log.append).run(str(data_dir), workers=0)
+    assert '[run ] aggregates' in '\n'.join(first_log)
+    written = os.stat(outputs['aggregates']).st_mtime_ns
+
+    pipeline = Pipeline(str(tmp_path / 'cache'), log=second_log.append)
+    assert pipeline.run(str(data_dir), workers=0) == outputs
+    assert pipeline.summary['run'] == 0
+    assert '[skip] aggregates: tidak berubah' in second_log
+    assert os.stat(outputs['aggregates']).st_mtime_ns == written
+
+    # Perubahan satu file stasiun menulis ulang kubus gabungan
+    name = sorted(os.listdir(data_dir))[0]
+    rows = pd.read_csv(data_dir / name)
+    rows.loc[0, 'PM2.5'] = 999.0
+    rows.to_csv(data_dir / name, index=False)
+    third_log = []
+    Pipeline(str(tmp_path / 'cache'), log=third_log.append).run(str(data_dir), workers=0)
+    assert any(line.startswith('[run ] aggregates') for line in third_log)
+    assert pd.read_parquet(outputs['aggregates'])['PM2.5|max'].max() == 999.0
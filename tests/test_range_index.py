@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from range_index import RangeExtremaIndex
+
+
+@pytest.mark.parametrize('column', ['TEMP', 'RAIN'])
+@pytest.mark.parametrize('start, end', [(None, None), ('2014-05-03 05:00', '2014-05-03 09:00'),
+                                        ('2014-02-11 13:00', '2015-08-30 02:00')])
+def test_range_extremes_match_groupby(frame, column, start, end):
+    result = RangeExtremaIndex(frame, block_size=16).extremes(column, start, end).set_index('station')
+    window = frame
+    if start is not None:
+        window = window[window['datetime'].between(start, end)]
+    grouped = window.groupby('station', observed=True)[column]
+    np.testing.assert_allclose(result['min'], grouped.min().reindex(result.index))
+    np.testing.assert_allclose(result['max'], grouped.max().reindex(result.index))
+
+    # Waktu ekstrem harus menunjuk ke baris yang memang bernilai ekstrem
+    for station, row in result.iterrows():
+        rows = window[window['station'] == station].set_index('datetime')[column]
+        assert rows[row['min_time']] == row['min']
+        assert rows[row['max_time']] == row['max']
+
+
+def test_range_extremes_unknown_column(frame):
+    with pytest.raises(KeyError):
+        RangeExtremaIndex(frame).extremes('PM2.5')
+
+
+def extremes_table(index, start=None, end=None):
+    return {column: index.extremes(column, start, end).set_index('station') for column in index.columns}
+
+
+@pytest.mark.parametrize('chunks', [[1, 2, 61, 700], [5000]])
+def test_range_index_extended_matches_rebuild(frame, chunks):
+    # Baris baru ditambahkan bertahap; setiap versi harus sama dengan indeks yang dibangun ulang
+    offset = len(frame) - sum(chunks)
+    index = RangeExtremaIndex(frame.iloc[:offset], block_size=16)
+    versions = []
+    for size in chunks:
+        index = index.extended(frame.iloc[:offset + size], offset)
+        offset += size
+        versions.append((offset, index))
+    for rows, index in versions:
+        expected = RangeExtremaIndex(frame.iloc[:rows], block_size=16)
+        for start, end in [(None, None), ('2015-12-29 05:00', None), ('2015-12-31 20:00', '2015-12-31 23:00')]:
+            result, rebuilt = extremes_table(index, start, end), extremes_table(expected, start, end)
+            for column in index.columns:
+                pd.testing.assert_frame_equal(result[column], rebuilt[column])
+
+
+def test_range_index_extended_twice_from_same_version(frame):
+    # Dua perluasan dari versi yang sama tidak boleh saling menimpa buffer
+    offset = len(frame) - 300
+    # Versi hasil perluasan memiliki kapasitas buffer lebih, sehingga keduanya dapat menulis di tempat
+    base = RangeExtremaIndex(frame.iloc[:offset - 100], block_size=16).extended(frame.iloc[:offset], offset - 100)
+    first = base.extended(frame.iloc[:offset + 200], offset)
+    spiked = frame.iloc[:offset + 200].copy()
+    spiked.loc[spiked.index[offset:], 'TEMP'] = 99.0
+    second = base.extended(spiked, offset)
+    assert (second.extremes('TEMP')['max'] == 99.0).all()
+    pd.testing.assert_frame_equal(extremes_table(first)['TEMP'],
+                                  extremes_table(RangeExtremaIndex(frame.iloc[:offset + 200], block_size=16))['TEMP'])
+    pd.testing.assert_frame_equal(extremes_table(base)['TEMP'],
+                                  extremes_table(RangeExtremaIndex(frame.iloc[:offset], block_size=16))['TEMP'])
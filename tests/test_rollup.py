@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rollup import RollupCube
+from schema import SEASON_BY_MONTH
+
+COLUMNS = ['PM2.5', 'NO2', 'TEMP', 'RAIN']
+
+
+@pytest.mark.parametrize('by', [['station'], ['month_year'], ['hour', 'season'], ['station', 'month_year']])
+def test_rollup_matches_groupby(frame, frame64, by):
+    cube = RollupCube.from_frame(frame, columns=COLUMNS)
+    keys = frame64.assign(month_year=frame64['datetime'].to_numpy().astype('datetime64[M]'))
+    grouped = keys.groupby(by, observed=True, sort=True)[COLUMNS]
+
+    for stat, rtol in (('mean', 1e-6), ('min', 0), ('max', 0)):
+        expected = getattr(grouped, stat)().reset_index()
+        result = getattr(cube, stat)(by, COLUMNS)
+        assert list(result[by].astype(str).itertuples(index=False)) == \
+            list(expected[by].astype(str).itertuples(index=False))
+        np.testing.assert_allclose(result[COLUMNS].to_numpy(dtype='float64'),
+                                   expected[COLUMNS].to_numpy(), rtol=rtol)
+
+
+def test_rollup_extended_matches_rebuild(frame):
+    offset = len(frame) - 500
+    cube = RollupCube.from_frame(frame.iloc[:offset], columns=COLUMNS).extended(frame.iloc[offset:])
+    rebuilt = RollupCube.from_frame(frame, columns=COLUMNS)
+    pd.testing.assert_frame_equal(cube.mean(['station', 'month_year'], COLUMNS),
+                                  rebuilt.mean(['station', 'month_year'], COLUMNS))
+
+
+def test_rollup_derives_season_when_missing(frame):
+    cube = RollupCube.from_frame(frame.drop(columns='season'), columns=['PM2.5'])
+    result = cube.count(['season'], ['PM2.5']).set_index('season')['PM2.5']
+    seasons = frame['datetime'].dt.month.map(SEASON_BY_MONTH)
+    expected = frame['PM2.5'].groupby(seasons).count()
+    assert result.sort_index().to_dict() == expected.sort_index().to_dict()
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import columns_on_disk, dataset_fingerprint, extend_dataset, load_combined_data
+from seasonal import analyze_series, robust_scores, run_seasonal_analysis
+from tests.conftest import make_frame
+
+
+def daily_series(days=3 * 365, seed=0):
+    # Deret harian dengan puncak pertengahan Februari, tren naik dan noise kecil
+    rng = np.random.default_rng(seed)
+    dates = np.arange(np.datetime64('2013-07-01'), np.datetime64('2013-07-01') + days)
+    day_of_year = (dates - dates.astype('datetime64[Y]')).astype(np.int64)
+    values = (100 + 40 * np.cos(2 * np.pi * (day_of_year - 45) / 365.25)
+              + 0.01 * np.arange(days) + rng.normal(0, 4, days))
+    return dates, values
+
+
+def test_analyze_series_finds_seasonal_peak():
+    dates, values = daily_series()
+    result = analyze_series(dates, values)
+    assert result['summary']['peak_month'] == 2
+    assert result['summary']['trough_month'] == 8
+    assert result['summary']['strength'] > 0.8
+    assert result['summary']['amplitude'] == pytest.approx(80, rel=0.15)
+    assert result['episodes'] == []
+
+
+def test_analyze_series_detects_injected_episode():
+    dates, values = daily_series()
+    values[500:504] += 150
+    result = analyze_series(dates, values)
+    assert len(result['episodes']) == 1
+    episode = result['episodes'][0]
+    assert episode['start'] == dates[500] and episode['end'] == dates[503]
+    assert episode['days'] == 4
+
+
+def test_analyze_series_keeps_calendar_gaps():
+    # Hari tanpa data tidak boleh menggeser tanggal episode
+    dates, values = daily_series()
+    values[500:504] += 150
+    keep = np.ones(len(dates), dtype=bool)
+    keep[300:330] = False
+    result = analyze_series(dates[keep], values[keep])
+    assert result['summary']['days'] == keep.sum()
+    assert result['episodes'][0]['start'] == dates[500]
+
+
+def test_robust_scores_constant_residual():
+    assert np.isnan(robust_scores(np.ones(10))).all()
+    assert np.isnan(robust_scores(np.array([]))).all()
+
+
+@pytest.fixture(scope='module')
+def loaded(tmp_path_factory):
+    cache_dir = tmp_path_factory.mktemp('cache')
+    path = cache_dir / 'combined_data.csv'
+    make_frame(days=400).to_csv(path, index=False)
+    return load_combined_data(str(path), cache_dir=str(cache_dir), offline=False), str(cache_dir)
+
+
+def test_columns_on_disk(loaded, tmp_path):
+    result, cache_dir = loaded
+    assert columns_on_disk(result.fingerprint, cache_dir)
+    assert not columns_on_disk(result.fingerprint, str(tmp_path))
+    assert not columns_on_disk(dataset_fingerprint(make_frame(days=10)), cache_dir)
+
+
+def test_small_dataset_runs_in_process(loaded):
+    # 3 stasiun × 2 polutan jauh di bawah PARALLEL_MIN_TASKS
+    result, cache_dir = loaded
+    assert run_seasonal_analysis(result.frame, ['PM2.5', 'O3'], cache_dir=cache_dir).workers == 0
+
+
+def test_seasonal_workers_match_serial(loaded):
+    result, cache_dir = loaded
+    serial = run_seasonal_analysis(result.frame, ['PM2.5', 'O3'], workers=0, cache_dir=cache_dir)
+    parallel = run_seasonal_analysis(result.frame, ['PM2.5', 'O3'], workers=2, cache_dir=cache_dir)
+    assert serial.workers == 0 and parallel.workers == 2
+    pd.testing.assert_frame_equal(serial.summary, parallel.summary)
+    pd.testing.assert_frame_equal(serial.episodes, parallel.episodes)
+
+
+def test_seasonal_extended_frame_runs_in_process(loaded):
+    # Dataset hasil extend_dataset hanya dapat dibuka proses ini, bukan oleh worker
+    result, cache_dir = loaded
+    df = result.frame
+    last_day = df[df['datetime'] >= df['datetime'].iloc[-1].floor('D')]
+    appended = last_day.assign(datetime=last_day['datetime'] + pd.Timedelta(days=1))
+    extended = extend_dataset(df, appended)
+    assert not columns_on_disk(dataset_fingerprint(extended), cache_dir)
+
+    base = run_seasonal_analysis(df, ['PM2.5'], workers=0, cache_dir=cache_dir)
+    analysis = run_seasonal_analysis(extended, ['PM2.5'], workers=2, cache_dir=cache_dir)
+    assert analysis.workers == 0
+    np.testing.assert_array_equal(analysis.summary['days'], base.summary['days'] + 1)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import STATIONS, station_series
+from timeseries import ResampleCache, lttb
+
+# Aturan resample pandas yang setara dengan setiap resolusi ResampleCache
+RESAMPLE_RULES = {'daily': 'D', 'weekly': 'W-MON', 'monthly': 'MS'}
+
+
+@pytest.mark.parametrize('frequency', list(RESAMPLE_RULES))
+@pytest.mark.parametrize('station', STATIONS)
+def test_resample_matches_pandas(frame, station, frequency):
+    datetimes, values = ResampleCache(frame).series(station, 'PM2.5', frequency)
+    expected = station_series(frame, station, 'PM2.5').resample(
+        RESAMPLE_RULES[frequency], closed='left', label='left').mean()
+    # pandas juga mengeluarkan periode tanpa baris sama sekali; ResampleCache tidak
+    expected = expected.reindex(pd.DatetimeIndex(datetimes).as_unit(expected.index.unit))
+    np.testing.assert_allclose(values, expected.to_numpy(), rtol=1e-6)
+
+
+def test_resample_hourly_is_raw_series(frame):
+    datetimes, values = ResampleCache(frame).series(STATIONS[1], 'TEMP', 'hourly')
+    expected = station_series(frame, STATIONS[1], 'TEMP')
+    np.testing.assert_array_equal(datetimes, expected.index.to_numpy().astype('datetime64[ns]'))
+    np.testing.assert_array_equal(values, expected.to_numpy())
+
+
+@pytest.mark.parametrize('frequency, start, first', [
+    ('hourly', '2014-06-10 10:30', '2014-06-10 10:00'),
+    ('daily', '2014-06-10 10:30', '2014-06-10'),
+    ('weekly', '2014-06-12 10:30', '2014-06-09'),
+    ('monthly', '2014-06-15', '2014-06-01'),
+])
+def test_window_includes_period_containing_start(frame, frequency, start, first):
+    window = ResampleCache(frame).window(STATIONS[0], 'TEMP', frequency, start=start,
+                                         end='2014-08-01', max_points=10_000)
+    assert window['datetime'].iloc[0] == pd.Timestamp(first)
+    assert window['datetime'].iloc[-1] <= pd.Timestamp('2014-08-01')
+
+
+def test_window_downsamples_to_max_points(frame):
+    cache = ResampleCache(frame)
+    window = cache.window(STATIONS[2], 'PM2.5', 'hourly', max_points=500)
+    datetimes, values = cache.series(STATIONS[2], 'PM2.5', 'hourly')
+    valid = ~np.isnan(values)
+    assert len(window) == 500
+    assert window['datetime'].iloc[0] == datetimes[valid][0]
+    assert window['datetime'].iloc[-1] == datetimes[valid][-1]
+    assert window['datetime'].is_monotonic_increasing
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(1)
+    y = rng.normal(0, 1, 5000)
+    y[2500] = 50.0
+    keep = lttb(np.arange(len(y)), y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert (np.diff(keep) > 0).all()
+    assert 2500 in keep
+
+
+def test_lttb_short_series_unchanged():
+    np.testing.assert_array_equal(lttb(np.arange(10), np.ones(10), 20), np.arange(10))
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_engine import FilterSelection
+from tests.conftest import STATIONS, selection_mask
+from windrose import SPEED_BANDS, SPEED_EDGES, WindRose
+
+SELECTION = FilterSelection((STATIONS[1],), (2014, 2015), ('Winter',),
+                            pd.Timestamp('2014-02-14 07:00'), pd.Timestamp('2015-01-09 12:00'))
+
+
+@pytest.mark.parametrize('selection', [None, SELECTION])
+def test_wind_rose_matches_groupby(frame, frame64, selection):
+    result = WindRose(frame).aggregate('PM2.5', selection)
+
+    window = frame64 if selection is None else frame64[selection_mask(frame, selection)]
+    band = pd.cut(window['WSPM'], SPEED_EDGES + [np.inf], right=False, labels=SPEED_BANDS)
+    window = window.assign(band=band).dropna(subset=['wd', 'band'])
+    grouped = window.groupby(['station', 'wd', 'band'], observed=True)['PM2.5']
+    expected = pd.DataFrame({'hours': grouped.size(), 'measured': grouped.count(), 'mean': grouped.mean()})
+
+    cells = result[result['hours'] > 0].set_index(['station', 'direction', 'band'])
+    expected.index = pd.MultiIndex.from_tuples(
+        [tuple(map(str, key)) for key in expected.index], names=cells.index.names)
+    assert len(cells) == len(expected)
+    expected = expected.reindex(cells.index)
+    np.testing.assert_array_equal(cells['hours'], expected['hours'])
+    np.testing.assert_array_equal(cells['measured'], expected['measured'])
+    np.testing.assert_allclose(cells['mean'], expected['mean'], rtol=1e-6)
+    assert result['hours'].sum() == len(window)